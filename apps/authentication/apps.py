@@ -0,0 +1,9 @@
+# apps/authentication/apps.py
+from django.apps import AppConfig
+
+
+class AuthenticationConfig(AppConfig):
+    name = 'apps.authentication'
+
+    def ready(self):
+        from . import signals  # noqa: F401
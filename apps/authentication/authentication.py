@@ -0,0 +1,17 @@
+# apps/authentication/authentication.py
+from rest_framework.authentication import SessionAuthentication
+from .services.oauth_service import resolve_access_token
+
+
+class GitHubSessionAuthentication(SessionAuthentication):
+    """
+    Session authentication that also resolves the user's GitHub access
+    token, exposed as `request.auth` (None when no account is connected).
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None:
+            return None
+        user, _ = result
+        return user, resolve_access_token(user, getattr(request._request, 'session', None))
@@ -0,0 +1,124 @@
+# apps/authentication/services/oauth_service.py
+# Resolves the GitHub access token of an authenticated user.
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from social_django.models import UserSocialAuth
+
+# Where a session keeps its user's token, with the grant version it was looked up at
+SESSION_TOKEN_KEY = '_github_access_token'
+
+# Signed-cookie sessions are readable by the client, so tokens stay out of them
+SIGNED_COOKIE_SESSIONS = 'django.contrib.sessions.backends.signed_cookies'
+
+
+class TokenCache:
+    """
+    Short-lived, thread-safe map of (user id, session key) to access token.
+    Keying by session means a new login, which cycles the session key, never
+    sees a token cached for an earlier one, in this process or any other.
+    Tokens are kept with the grant version they were looked up at and only
+    served while it is current.
+    """
+
+    def __init__(self, ttl: int, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[int, Optional[str]], Tuple[str, Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, session_key: Optional[str], version: Optional[str]) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((user_id, session_key))
+        if entry is None or entry[1] != version or entry[2] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, user_id: int, session_key: Optional[str], token: str, version: Optional[str]) -> None:
+        with self._lock:
+            self._entries[(user_id, session_key)] = (token, version, time.monotonic() + self.ttl)
+            if len(self._entries) > self.max_entries:
+                now = time.monotonic()
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[2] > now}
+                # Still full of live tokens: drop the oldest
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if key[0] != user_id}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_tokens = TokenCache(settings.GITHUB_TOKEN_CACHE_TTL)
+
+
+def _grant_version_key(user_id: int) -> str:
+    return f"github:grant:{user_id}"
+
+
+def _grant_version(user_id: int) -> Optional[str]:
+    """The version of a user's GitHub grant, shared by every worker; None until it first changes"""
+    return caches[settings.GITHUB_TOKEN_STORE].get(_grant_version_key(user_id))
+
+
+def resolve_access_token(user, session=None) -> Optional[str]:
+    """
+    The GitHub access token of an authenticated user, or None when no GitHub
+    account is connected. Served from the in-process cache, then the
+    session, and only then from UserSocialAuth; cached tokens are only
+    trusted while the grant version they were looked up at is current.
+    """
+    session_key = session.session_key if session is not None else None
+    version = _grant_version(user.id)
+    token = _tokens.get(user.id, session_key, version)
+    if token:
+        return token
+
+    use_session = session is not None and settings.SESSION_ENGINE != SIGNED_COOKIE_SESSIONS
+    if use_session:
+        stored = session.get(SESSION_TOKEN_KEY)
+        # Tokens stored before a reconnect or revocation are looked up again
+        if isinstance(stored, dict) and stored.get('version') == version:
+            token = stored.get('token')
+    if not token:
+        token = _stored_access_token(user)
+        if token and use_session:
+            session[SESSION_TOKEN_KEY] = {'token': token, 'version': version}
+    if token:
+        _tokens.set(user.id, session_key, token, version)
+    return token
+
+
+def invalidate_access_token(user_id: int, session=None) -> None:
+    """Forget a user's cached token in this process and session, e.g. after logout"""
+    _tokens.invalidate(user_id)
+    if session is not None:
+        session.pop(SESSION_TOKEN_KEY, None)
+
+
+def revoke_access_tokens(user_id: int) -> None:
+    """
+    Make every session and worker look a user's token up again, e.g. after
+    their GitHub account is reconnected, revoked or disconnected
+    """
+    caches[settings.GITHUB_TOKEN_STORE].set(_grant_version_key(user_id), uuid.uuid4().hex, timeout=None)
+    _tokens.invalidate(user_id)
+
+
+def clear_token_cache() -> None:
+    _tokens.clear()
+
+
+def _stored_access_token(user) -> Optional[str]:
+    try:
+        social_auth = UserSocialAuth.objects.get(user=user, provider='github')
+    except UserSocialAuth.DoesNotExist:
+        return None
+    return social_auth.extra_data.get('access_token')
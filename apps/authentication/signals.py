@@ -0,0 +1,26 @@
+# apps/authentication/signals.py
+# Cached GitHub tokens are dropped whenever the user's OAuth state changes.
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from social_django.models import UserSocialAuth
+from .services.oauth_service import invalidate_access_token, revoke_access_tokens
+
+
+@receiver(user_logged_in)
+def forget_token_on_login(sender, request, user, **kwargs):
+    # Logging in again keeps the session's data, including a token from the previous grant
+    invalidate_access_token(user.id, getattr(request, 'session', None))
+
+
+@receiver(user_logged_out)
+def forget_token_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_access_token(user.id, getattr(request, 'session', None))
+
+
+@receiver(post_save, sender=UserSocialAuth)
+@receiver(post_delete, sender=UserSocialAuth)
+def forget_token_on_change(sender, instance, **kwargs):
+    # Other sessions and workers hold the token too
+    revoke_access_tokens(instance.user_id)
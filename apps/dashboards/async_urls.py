@@ -0,0 +1,15 @@
+# apps/dashboards/async_urls.py
+from django.urls import path
+from .async_views import (
+    UserRepositoriesAsyncView,
+    RepositoryContributorsAsyncView,
+    ContributorDashboardAsyncView,
+)
+
+urlpatterns = [
+    path('repositories/', UserRepositoriesAsyncView.as_view(), name='user-repositories-async'),
+    path('repositories/<str:owner>/<str:repo>/contributors/',
+         RepositoryContributorsAsyncView.as_view(), name='repository-contributors-async'),
+    path('dashboard/<str:owner>/<str:repo>/<str:username>/',
+         ContributorDashboardAsyncView.as_view(), name='contributor-dashboard-async'),
+]
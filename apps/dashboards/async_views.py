@@ -0,0 +1,98 @@
+# apps/dashboards/async_views.py
+# Async counterparts of the dashboard views, for deployments served over ASGI.
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import status
+from apps.authentication.services.oauth_service import resolve_access_token
+from .serializers import DashboardSerializer, RepositorySerializer, ContributorSerializer
+from .services.async_dashboard_service import AsyncDashboardService
+
+
+class AsyncAPIView(View):
+    """
+    Base for async views: requires an authenticated session like the DRF
+    views, and resolves the user's GitHub token into `request.auth` the way
+    GitHubSessionAuthentication does.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        request.user = user
+        # A cache miss falls through to the ORM, which needs the thread-sensitive executor
+        request.auth = await sync_to_async(resolve_access_token)(user, getattr(request, 'session', None))
+        if not request.auth:
+            return JsonResponse(
+                {'error': 'GitHub account not connected'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class UserRepositoriesAsyncView(AsyncAPIView):
+    """
+    GET /api/async/repositories/
+    Get all repositories for the authenticated user
+    """
+
+    async def get(self, request):
+        try:
+            service = AsyncDashboardService(request.auth)
+            adapted_repos = await service.sync_user_repositories()
+
+            serializer = RepositorySerializer(adapted_repos, many=True)
+            return JsonResponse(serializer.data, safe=False, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return JsonResponse(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class RepositoryContributorsAsyncView(AsyncAPIView):
+    """
+    GET /api/async/repositories/{owner}/{repo}/contributors/
+    Get all contributors for a specific repository
+    """
+
+    async def get(self, request, owner, repo):
+        try:
+            service = AsyncDashboardService(request.auth)
+            await service.sync_repository_data(owner, repo)
+            contributors = await service.get_contributors(owner, repo)
+
+            serializer = ContributorSerializer(contributors, many=True)
+            return JsonResponse(serializer.data, safe=False, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return JsonResponse(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ContributorDashboardAsyncView(AsyncAPIView):
+    """
+    GET /api/async/dashboard/{owner}/{repo}/{username}/
+    Generate and retrieve dashboard for a specific contributor
+    """
+
+    async def get(self, request, owner, repo, username):
+        try:
+            service = AsyncDashboardService(request.auth)
+            dashboard = await service.get_contributor_dashboard(owner, repo, username)
+
+            serializer = DashboardSerializer(dashboard)
+            return JsonResponse(serializer.data, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return JsonResponse(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
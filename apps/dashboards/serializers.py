@@ -23,6 +23,32 @@ class DashboardSerializer(serializers.Serializer):
     charts = ChartsSerializer()
     recent_activity = serializers.ListField()
     summary = serializers.DictField()
+    # Only on dashboards limited with from, to or granularity
+    window = serializers.DictField(required=False)
+
+
+class RepositoryStatsSerializer(serializers.Serializer):
+    repository = serializers.CharField()
+    granularity = serializers.CharField()
+    source = serializers.CharField()
+    contributors = serializers.ListField()
+    commit_activity = serializers.ListField()
+    code_frequency = serializers.ListField()
+
+
+class MetricSeriesSerializer(serializers.Serializer):
+    repository = serializers.CharField()
+    username = serializers.CharField(allow_null=True)
+    metric = serializers.CharField()
+    granularity = serializers.CharField()
+    series = serializers.ListField()
+
+    def to_representation(self, instance):
+        # `from` is a keyword, so the range bounds cannot be declared as fields
+        data = super().to_representation(instance)
+        data['from'] = instance.get('from')
+        data['to'] = instance.get('to')
+        return data
 
 
 class RepositorySerializer(serializers.Serializer):
@@ -0,0 +1,130 @@
+# apps/dashboards/services/activity_store.py
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+from core.concurrency import offload
+from core.integrations.github_client import PER_PAGE
+from core.repositories import get_repository
+
+KINDS = ('commits', 'issues', 'pull_requests')
+
+
+def _utc(timestamp: Optional[str]) -> Optional[datetime]:
+    """An ISO-8601 timestamp as the naive UTC datetime MongoDB stores"""
+    if not timestamp:
+        return None
+    return datetime.fromisoformat(timestamp).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def author_key(login: Optional[str]) -> Optional[str]:
+    """How a login is stored and looked up: GitHub logins are case-insensitive"""
+    return login.lower() if login else None
+
+
+def commit_document(commit: Dict, full_name: str) -> Dict:
+    author = commit.get('author') or {}
+    return {
+        'repository': full_name,
+        'sha': commit.get('sha'),
+        'author': author_key(author.get('login')),
+        # Commits are counted on the day they were authored
+        'date': _utc(author.get('date')),
+        'additions': commit['stats']['additions'],
+        'deletions': commit['stats']['deletions'],
+        'record': commit,
+    }
+
+
+def issue_document(issue: Dict, full_name: str) -> Dict:
+    return {
+        'repository': full_name,
+        'id': issue.get('id'),
+        'author': author_key(issue.get('user')),
+        'date': _utc(issue.get('created_at')),
+        'state': issue.get('state'),
+        'record': issue,
+    }
+
+
+def pull_request_document(pr: Dict, full_name: str) -> Dict:
+    return {
+        'repository': full_name,
+        'id': pr.get('id'),
+        'author': author_key(pr.get('user')),
+        'date': _utc(pr.get('created_at')),
+        'state': pr.get('state'),
+        'merged': pr.get('merged', False),
+        'record': pr,
+    }
+
+
+DOCUMENTS: Dict[str, Callable[[Dict, str], Dict]] = {
+    'commits': commit_document,
+    'issues': issue_document,
+    'pull_requests': pull_request_document,
+}
+
+
+class ActivityStore:
+    """
+    Keeps every adapted commit, issue and pull request that streams past.
+
+    Records are upserted a page at a time by SHA or id into their raw
+    activity repository, next to the fields the activity indexes and
+    pipelines use; the adapted record itself is kept under `record`, so
+    any later metric, window or chart can be computed from storage rather
+    than GitHub.
+    """
+
+    def __init__(self):
+        self.repositories = {kind: get_repository(kind) for kind in KINDS}
+
+    def save(self, full_name: str, kind: str, records: List[Dict]) -> None:
+        if records:
+            self.repositories[kind].bulk_upsert([DOCUMENTS[kind](record, full_name) for record in records])
+
+    def save_commit_stats(self, full_name: str, stats: Dict[str, Dict]) -> None:
+        """Line changes of stored commits that were saved before they were known"""
+        if stats:
+            self.repositories['commits'].bulk_upsert([
+                {'repository': full_name, 'sha': sha, 'additions': s['additions'], 'deletions': s['deletions']}
+                for sha, s in stats.items()
+            ])
+
+    def saving(self, full_name: str, kind: str, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Pass a stream of adapted records through, storing them a page at a time"""
+        records = iter(records)
+        while True:
+            batch = list(islice(records, PER_PAGE))
+            if not batch:
+                return
+            self.save(full_name, kind, batch)
+            yield from batch
+
+    async def asaving(self, full_name: str, kind: str, records: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+        """`saving` for async streams; writes run on the offload pool"""
+        batch = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) == PER_PAGE:
+                await offload(self.save)(full_name, kind, batch)
+                for saved in batch:
+                    yield saved
+                batch = []
+        await offload(self.save)(full_name, kind, batch)
+        for saved in batch:
+            yield saved
+
+    def get(
+            self,
+            full_name: str,
+            kind: str,
+            username: str,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """A contributor's stored adapted records dated from `start` until before `end`, oldest first"""
+        return [
+            document['record']
+            for document in self.repositories[kind].get_by_author(full_name, author_key(username), start, end)
+        ]
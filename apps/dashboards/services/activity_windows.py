@@ -0,0 +1,81 @@
+# apps/dashboards/services/activity_windows.py
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Optional
+from django.conf import settings
+from .activity_store import author_key
+from .dashboard_cache import LocalLRU
+
+# Counters of MetricsAccumulator.state() a window sums
+FIELDS = (
+    'commits_total', 'additions', 'deletions',
+    'issues_total', 'issues_open', 'issues_closed',
+    'prs_total', 'prs_open', 'prs_merged', 'prs_closed_unmerged',
+)
+
+_windows = LocalLRU(settings.DASHBOARD_CACHE_LOCAL_SIZE)
+
+
+def clear_activity_windows() -> None:
+    _windows.clear()
+
+
+class ActivityWindow:
+    """
+    A contributor's stored activity as prefix sums over its active days.
+
+    Commits count on the day they were authored, issues and pull requests
+    on the day they were opened, with their current state. Totals of any
+    range of days are the difference of two prefix rows found by binary
+    search, so switching windows costs no query and no pass over history.
+    Items without a date only count toward unbounded windows.
+    """
+
+    def __init__(self, days: Dict[Optional[str], Dict[str, int]]):
+        rows = {day: [totals.get(field, 0) for field in FIELDS] for day, totals in days.items()}
+        self.undated = rows.pop(None, [0] * len(FIELDS))
+        self.days = sorted(rows)
+        self.commits = [rows[day][0] for day in self.days]
+        # prefix[i] sums the first i days
+        self.prefix = list(accumulate(
+            (rows[day] for day in self.days),
+            lambda total, row: [a + b for a, b in zip(total, row)],
+            initial=[0] * len(FIELDS),
+        ))
+
+    def totals(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        """
+        Totals of the days from `start` to `end` (YYYY-MM-DD, inclusive), in
+        the shape of MetricsAccumulator.state()
+        """
+        lo = bisect_left(self.days, start) if start else 0
+        hi = bisect_right(self.days, end) if end else len(self.days)
+        hi = max(lo, hi)
+        sums = [b - a for a, b in zip(self.prefix[lo], self.prefix[hi])]
+        if start is None and end is None:
+            sums = [total + undated for total, undated in zip(sums, self.undated)]
+        return {
+            **dict(zip(FIELDS, sums)),
+            'commits_per_day': {self.days[i]: self.commits[i] for i in range(lo, hi) if self.commits[i]},
+        }
+
+
+class ActivityWindows:
+    """
+    ActivityWindow of each contributor, built once per version of their
+    stored dashboard from per-day totals the activity repository aggregates
+    where the activity is stored, and kept in a per-process LRU.
+    """
+
+    def __init__(self, activity_repo):
+        self.activity_repo = activity_repo
+
+    def get(self, full_name: str, username: str, version: str) -> ActivityWindow:
+        author = author_key(username)
+        key = f"{full_name}:{author}"
+        cached = _windows.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        window = ActivityWindow(self.activity_repo.aggregate_daily_activity(full_name, author))
+        _windows.set(key, (version, window))
+        return window
@@ -0,0 +1,112 @@
+# apps/dashboards/services/async_dashboard_service.py
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, List
+from core.concurrency import offload
+from core.integrations.async_github_client import AsyncGitHubClient, AsyncGitHubGraphQLClient
+from core.integrations.github_client import GitHubAPIAdapter
+from core.integrations.rate_limiter import RequestPriority
+from .commit_stats import AsyncCommitStats
+from .dashboard_service import DashboardService
+
+
+class AsyncDashboardService:
+    """
+    asyncio counterpart of DashboardService for the async views.
+    GitHub is reached through AsyncGitHubClient, or AsyncGitHubGraphQLClient
+    in the `graphql` fetch mode, so a waiting request holds no thread;
+    repository and cache access stay blocking and run on the offload pool
+    through the wrapped sync service.
+    """
+
+    def __init__(self, access_token: str, priority: str = RequestPriority.INTERACTIVE):
+        self.github_client = AsyncGitHubClient(access_token, priority=priority)
+        self.adapter = GitHubAPIAdapter()
+        self.service = DashboardService(access_token, priority=priority)
+        self.graphql_client = AsyncGitHubGraphQLClient(access_token, priority=priority)
+        self.commit_stats = AsyncCommitStats(self.github_client)
+
+    async def sync_repository_data(self, owner: str, repo: str) -> Dict:
+        """Fetch and sync repository data from GitHub"""
+        full_name = f"{owner}/{repo}"
+
+        repo_data = await self.github_client.get_repository(owner, repo)
+        adapted_repo = self.adapter.adapt_repository(repo_data)
+        stored_repo, previous_repo = await offload(self.service._store_repository)(full_name, adapted_repo)
+
+        if not self.service._contributors_outdated(previous_repo, adapted_repo):
+            return stored_repo
+
+        adapted_contributors = [
+            self.adapter.adapt_contributor(c) async for c in self.github_client.get_contributors(owner, repo)
+        ]
+        await offload(self.service._store_contributors)(full_name, previous_repo, adapted_repo, adapted_contributors)
+
+        return stored_repo
+
+    async def sync_user_repositories(self) -> List[Dict]:
+        """Fetch the authenticated user's repositories and store them in one bulk write"""
+        if self.service.use_graphql:
+            adapted_repos = [
+                self.service.graphql_adapter.adapt_repository(repo)
+                async for repo in self.graphql_client.get_user_repositories()
+            ]
+        else:
+            adapted_repos = [
+                self.adapter.adapt_repository(repo) async for repo in self.github_client.get_user_repositories()
+            ]
+        await offload(self.service._store_repositories)(adapted_repos)
+        return adapted_repos
+
+    async def get_contributors(self, owner: str, repo: str) -> List[Dict]:
+        """Stored contributor summaries of a repository"""
+        return await offload(self.service.contributor_repo.get_by_repository)(f"{owner}/{repo}")
+
+    async def get_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
+        """Serve a contributor dashboard through the read-through cache"""
+        return await self.service.dashboard_cache.aget_contributor_dashboard(
+            owner, repo, username, lambda: self.generate_contributor_dashboard(owner, repo, username)
+        )
+
+    async def generate_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
+        """See DashboardService.generate_contributor_dashboard"""
+        full_name = f"{owner}/{repo}"
+        store = self.service.activity_store
+        accumulator = await offload(self.service._resume_accumulator)(owner, repo, username)
+        since = accumulator.synced
+
+        if self.service.use_graphql:
+            graphql_activity, activity = await asyncio.gather(
+                self.graphql_client.get_contributor_activity(
+                    owner, repo, username,
+                    commits_since=since.commits_since(), issues_since=since.issues, pulls_since=since.pull_requests,
+                ),
+                self.github_client.get_user_activity(username),
+            )
+            await offload(self.service._store_graphql_activity)(full_name, graphql_activity, accumulator)
+            return await offload(self.service._build_dashboard)(owner, repo, username, accumulator, activity)
+
+        # All four endpoints are awaited concurrently on the event loop
+        *_, activity = await asyncio.gather(
+            self._consume(store.asaving(full_name, 'commits', self.commit_stats.afill(owner, repo, self._adapted(
+                self.github_client.get_commits(owner, repo, author=username, since=since.commits_since()),
+                self.adapter.adapt_commit))), accumulator.add_commit),
+            self._consume(store.asaving(full_name, 'issues', self._adapted(
+                self.github_client.get_issues(owner, repo, creator=username, since=since.issues),
+                self.adapter.adapt_issue)), accumulator.add_issue),
+            self._consume(store.asaving(full_name, 'pull_requests', self._adapted(
+                self.github_client.get_pull_requests(owner, repo, creator=username, since=since.pull_requests),
+                self.adapter.adapt_pull_request)), accumulator.add_pull_request),
+            self.github_client.get_user_activity(username),
+        )
+
+        return await offload(self.service._build_dashboard)(owner, repo, username, accumulator, activity)
+
+    @staticmethod
+    async def _adapted(records: AsyncIterable[Dict], adapt: Callable[[Dict], Dict]) -> AsyncIterator[Dict]:
+        async for record in records:
+            yield adapt(record)
+
+    @staticmethod
+    async def _consume(records: AsyncIterable[Dict], add: Callable[[Dict], None]):
+        async for record in records:
+            add(record)
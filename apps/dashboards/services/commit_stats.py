@@ -0,0 +1,133 @@
+# apps/dashboards/services/commit_stats.py
+import asyncio
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+from django.conf import settings
+from core.concurrency import get_executor, offload
+from core.exceptions import GitHubRateLimitException
+from core.integrations.github_client import PER_PAGE, GitHubAPIAdapter
+from core.repositories import get_repository
+
+
+class CommitStats:
+    """
+    Fills in the line changes the commits list endpoint leaves out.
+    Stats are looked up in the SHA-keyed commit stats store; only commits
+    missing from it cost a single-commit request, at most
+    COMMIT_STATS_WORKERS at a time, and are stored for every later build.
+    No more requests are made than the rate-limit budget has left: commits
+    beyond it are marked `stats_pending` and resolved by later builds.
+    """
+
+    def __init__(self, github_client):
+        self.github_client = github_client
+        self.adapter = GitHubAPIAdapter()
+        self.repository = get_repository('commit_stats')
+
+    def fill(self, owner: str, repo: str, commits: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield adapted commits with their stats, resolved a page at a time"""
+        commits = iter(commits)
+        while True:
+            batch = list(islice(commits, PER_PAGE))
+            if not batch:
+                return
+            stats = self.repository.get_by_shas(self.shas(batch))
+            missing = self.missing(batch, stats)
+            if missing:
+                stats.update(self.remember(self.fetch(owner, repo, missing)))
+            yield from self.apply(batch, stats)
+
+    def resolve(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Dict]:
+        """Stats of as many of `shas` as are stored or fit in the budget, by SHA"""
+        stats = self.repository.get_by_shas(shas)
+        missing = [sha for sha in shas if sha not in stats]
+        if missing:
+            stats.update(self.remember(self.fetch(owner, repo, missing)))
+        return stats
+
+    def fetch(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Dict]:
+        """Stats of the commits among `shas` the rate-limit budget allows fetching"""
+        shas = self._affordable(shas, self.budget())
+        executor = get_executor('commit-stats', settings.COMMIT_STATS_WORKERS)
+        details = executor.map(lambda sha: self._get_commit(owner, repo, sha), shas)
+        return self._stats(shas, details)
+
+    def budget(self) -> Optional[int]:
+        return self.github_client.rate_limiter.available(self.github_client.priority)
+
+    def _get_commit(self, owner: str, repo: str, sha: str) -> Optional[Dict]:
+        try:
+            return self.github_client.get_commit(owner, repo, sha)
+        except GitHubRateLimitException:
+            # Other requests spent the budget first; the commit stays pending
+            return None
+
+    @staticmethod
+    def _affordable(shas: List[str], budget: Optional[int]) -> List[str]:
+        return shas if budget is None else shas[:budget]
+
+    def _stats(self, shas: List[str], details: Iterable[Optional[Dict]]) -> Dict[str, Dict]:
+        return {
+            sha: self.adapter.adapt_commit(detail)['stats']
+            for sha, detail in zip(shas, details) if detail is not None
+        }
+
+    def remember(self, stats: Dict[str, Dict]) -> Dict[str, Dict]:
+        self.repository.bulk_insert(stats)
+        return stats
+
+    @staticmethod
+    def shas(commits: List[Dict]) -> List[str]:
+        return [commit['sha'] for commit in commits if commit.get('sha')]
+
+    @staticmethod
+    def missing(commits: List[Dict], stats: Dict[str, Dict]) -> List[str]:
+        return list(dict.fromkeys(sha for sha in CommitStats.shas(commits) if sha not in stats))
+
+    @staticmethod
+    def apply(commits: List[Dict], stats: Dict[str, Dict]) -> List[Dict]:
+        """Set the stats of commits; those still unknown are marked `stats_pending`"""
+        for commit in commits:
+            if commit.get('sha') in stats:
+                commit['stats'] = stats[commit['sha']]
+            elif commit.get('sha'):
+                commit['stats_pending'] = True
+        return commits
+
+
+class AsyncCommitStats(CommitStats):
+    """CommitStats for AsyncGitHubClient; store access runs on the offload pool"""
+
+    async def afill(self, owner: str, repo: str, commits: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+        batch = []
+        async for commit in commits:
+            batch.append(commit)
+            if len(batch) == PER_PAGE:
+                for filled in await self._resolve(owner, repo, batch):
+                    yield filled
+                batch = []
+        for filled in await self._resolve(owner, repo, batch):
+            yield filled
+
+    async def _resolve(self, owner: str, repo: str, batch: List[Dict]) -> List[Dict]:
+        if not batch:
+            return batch
+        stats = await offload(self.repository.get_by_shas)(self.shas(batch))
+        missing = self.missing(batch, stats)
+        if missing:
+            stats.update(await offload(self.remember)(await self.afetch(owner, repo, missing)))
+        return self.apply(batch, stats)
+
+    async def afetch(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Dict]:
+        shas = self._affordable(shas, await offload(self.budget)())
+        semaphore = asyncio.Semaphore(settings.COMMIT_STATS_WORKERS)
+
+        async def get_commit(sha: str) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self.github_client.get_commit(owner, repo, sha)
+                except GitHubRateLimitException:
+                    return None
+
+        details = await asyncio.gather(*(get_commit(sha) for sha in shas))
+        return self._stats(shas, details)
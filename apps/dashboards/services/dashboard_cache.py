@@ -0,0 +1,278 @@
+# apps/dashboards/services/dashboard_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from core.concurrency import get_executor, offload
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Fields of a stored contributor document that make up its dashboard
+DASHBOARD_FIELDS = ('username', 'repository', 'generated_at', 'metrics', 'charts', 'recent_activity', 'summary')
+
+
+class LocalLRU:
+    """Bounded, thread-safe least-recently-used map"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheStats:
+    """Process-wide counters of where dashboards were served from"""
+
+    SOURCES = ('local', 'shared', 'stored', 'stale', 'miss')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, source: str) -> None:
+        with self._lock:
+            self.counts[source] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        hits = total - counts['miss']
+        return {**counts, 'total': total, 'hit_ratio': (hits / total) if total else 0}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = {source: 0 for source in self.SOURCES}
+
+
+_local = LocalLRU(settings.DASHBOARD_CACHE_LOCAL_SIZE)
+_stats = CacheStats()
+_refreshing: Dict[str, Future] = {}
+_refreshing_lock = threading.Lock()
+# Concurrent builds of the same dashboard share one generation
+_builds = SingleFlight(
+    store_alias=settings.DASHBOARD_CACHE_STORE if settings.DASHBOARD_SINGLE_FLIGHT_SHARED else None,
+    lock_timeout=settings.DASHBOARD_BUILD_LOCK_TIMEOUT,
+)
+
+
+def _store():
+    return caches[settings.DASHBOARD_CACHE_STORE]
+
+
+def _cache_key(full_name: str, username: str) -> str:
+    return f"dashboard:{full_name}:{username}"
+
+
+def _invalidation_key(full_name: str, username: Optional[str] = None) -> str:
+    return f"dashboard:invalidated:{full_name}:{username or '*'}"
+
+
+def _webhook_key(full_name: str) -> str:
+    return f"dashboard:webhook:{full_name}"
+
+
+def invalidate_dashboards(full_name: str, username: Optional[str] = None) -> None:
+    """
+    Mark dashboards of a repository (or one contributor) as outdated.
+    Anything generated before now is treated as stale by every worker.
+    """
+    timeout = settings.DASHBOARD_CACHE_TTL + settings.DASHBOARD_CACHE_STALE_TTL
+    _store().set(_invalidation_key(full_name, username), time.time(), timeout=timeout)
+
+
+def mark_webhook_delivery(full_name: str) -> None:
+    """
+    Record that a repository delivers webhooks. Its stored dashboards are
+    kept current by the deliveries, so they stay fresh for
+    DASHBOARD_WEBHOOK_TTL instead of DASHBOARD_CACHE_TTL until deliveries stop.
+    """
+    _store().set(_webhook_key(full_name), time.time(), timeout=settings.DASHBOARD_WEBHOOK_TTL)
+
+
+def dashboard_cache_stats() -> Dict:
+    return _stats.snapshot()
+
+
+def clear_local_dashboard_cache() -> None:
+    _local.clear()
+    _stats.reset()
+
+
+class DashboardCache:
+    """
+    Read-through cache in front of DashboardService.generate_contributor_dashboard.
+
+    Lookups go through a per-process LRU, the shared cache and the dashboard
+    persisted in the contributor repository before regenerating. Dashboards
+    younger than DASHBOARD_CACHE_TTL are served as-is; older ones are served
+    for up to DASHBOARD_CACHE_STALE_TTL more while a background refresh runs.
+    Repositories delivering webhooks use DASHBOARD_WEBHOOK_TTL instead.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.ttl = settings.DASHBOARD_CACHE_TTL
+        self.stale_ttl = settings.DASHBOARD_CACHE_STALE_TTL
+
+    def get_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
+        dashboard = self.lookup(owner, repo, username)
+        if dashboard is None:
+            dashboard = self._generate(owner, repo, username)
+        return dashboard
+
+    async def aget_contributor_dashboard(
+            self, owner: str, repo: str, username: str, generate: Callable[[], Awaitable[Dict]]
+    ) -> Dict:
+        """
+        Async variant of get_contributor_dashboard: blocking lookups run in
+        threads and a miss awaits `generate()`, coalesced with sync builds.
+        """
+        dashboard = await offload(self.lookup)(owner, repo, username)
+        if dashboard is not None:
+            return dashboard
+
+        key = _cache_key(f"{owner}/{repo}", username)
+
+        async def build() -> Dict:
+            dashboard = await generate()
+            await offload(self._remember)(key, dashboard, 'miss')
+            return dashboard
+
+        return await _builds.do_async(key, build, recheck=offload(partial(self._published, owner, repo, username)))
+
+    def lookup(self, owner: str, repo: str, username: str) -> Optional[Dict]:
+        """
+        A fresh dashboard, or a stale one while it is refreshed in the
+        background; None when it has to be generated.
+        """
+        full_name = f"{owner}/{repo}"
+        key = _cache_key(full_name, username)
+        invalidated_at, ttl = self._freshness(full_name, username)
+
+        stale = None
+        for source, lookup in (
+                ('local', lambda: _local.get(key)),
+                ('shared', lambda: _store().get(key)),
+                ('stored', lambda: self._stored_dashboard(full_name, username)),
+        ):
+            dashboard = lookup()
+            if not dashboard:
+                continue
+            expires_at = self._expires_at(dashboard, invalidated_at, ttl)
+            now = time.time()
+            if now < expires_at:
+                _stats.record(source)
+                self._remember(key, dashboard, source, ttl)
+                return dashboard
+            if stale is None and now < expires_at + self.stale_ttl:
+                stale = dashboard
+
+        if stale is not None:
+            _stats.record('stale')
+            self.refresh(owner, repo, username)
+            return stale
+
+        _stats.record('miss')
+        return None
+
+    def refresh(self, owner: str, repo: str, username: str) -> Future:
+        """Regenerate a dashboard in the background, once per key per process"""
+        key = _cache_key(f"{owner}/{repo}", username)
+        with _refreshing_lock:
+            future = _refreshing.get(key)
+            if future is None:
+                executor = get_executor('dashboard-refresh', settings.DASHBOARD_REFRESH_WORKERS)
+                future = executor.submit(self._background_refresh, key, owner, repo, username)
+                _refreshing[key] = future
+            return future
+
+    @staticmethod
+    def pending_refreshes() -> List[Future]:
+        with _refreshing_lock:
+            return list(_refreshing.values())
+
+    def _background_refresh(self, key: str, owner: str, repo: str, username: str) -> None:
+        try:
+            self._generate(owner, repo, username)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            with _refreshing_lock:
+                _refreshing.pop(key, None)
+
+    def _generate(self, owner: str, repo: str, username: str) -> Dict:
+        """Build a dashboard, joining any identical build already in flight"""
+        key = _cache_key(f"{owner}/{repo}", username)
+
+        def build() -> Dict:
+            dashboard = self.service.generate_contributor_dashboard(owner, repo, username)
+            self._remember(key, dashboard, 'miss')
+            return dashboard
+
+        return _builds.do(key, build, recheck=partial(self._published, owner, repo, username))
+
+    def _published(self, owner: str, repo: str, username: str) -> Optional[Dict]:
+        """A fresh dashboard another worker built into the shared cache"""
+        full_name = f"{owner}/{repo}"
+        dashboard = _store().get(_cache_key(full_name, username))
+        if dashboard and time.time() < self._expires_at(dashboard, *self._freshness(full_name, username)):
+            return dashboard
+        return None
+
+    def _remember(self, key: str, dashboard: Dict, source: str, ttl: Optional[int] = None) -> None:
+        """Copy a dashboard into the layers above the one it came from"""
+        _local.set(key, dashboard)
+        if source in ('stored', 'miss'):
+            _store().set(key, dashboard, timeout=(ttl or self.ttl) + self.stale_ttl)
+
+    def _stored_dashboard(self, full_name: str, username: str) -> Optional[Dict]:
+        document = self.service.contributor_repo.get_by_username_and_repo(username, full_name)
+        if not document or not document.get('generated_at'):
+            return None
+        return {field: document.get(field) for field in DASHBOARD_FIELDS}
+
+    def _freshness(self, full_name: str, username: str) -> Tuple[float, int]:
+        """The latest invalidation of a dashboard, and how long it stays fresh"""
+        webhook_key = _webhook_key(full_name)
+        marks = _store().get_many([
+            _invalidation_key(full_name), _invalidation_key(full_name, username), webhook_key
+        ])
+        ttl = settings.DASHBOARD_WEBHOOK_TTL if marks.pop(webhook_key, None) else self.ttl
+        return max(marks.values(), default=0), ttl
+
+    def _expires_at(self, dashboard: Dict, invalidated_at: float, ttl: Optional[int] = None) -> float:
+        """When a dashboard stops being fresh: after the TTL, or at an invalidation that followed it"""
+        ttl = ttl or self.ttl
+        generated = datetime.fromisoformat(dashboard['generated_at'])
+        if generated.tzinfo is None:
+            generated = generated.replace(tzinfo=timezone.utc)
+        generated_at = generated.timestamp()
+        if generated_at <= invalidated_at:
+            return min(generated_at + ttl, invalidated_at)
+        return generated_at + ttl
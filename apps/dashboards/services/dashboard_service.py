@@ -1,10 +1,26 @@
 # apps/dashboards/services/dashboard_service.py
-from typing import Dict, List
-from datetime import datetime, timedelta
+import logging
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from core.concurrency import get_executor
 from core.integrations.github_client import GitHubClient, GitHubAPIAdapter
-from core.repositories.contributor_repository import ContributorRepository
-from core.repositories.repo_repository import RepositoryRepository
+from core.integrations.graphql_client import GitHubGraphQLAdapter, GitHubGraphQLClient
+from core.integrations.rate_limiter import RequestPriority
+from core.jobs import Progress
+from core.repositories import get_repository
+from .activity_store import ActivityStore
+from .activity_windows import ActivityWindow, ActivityWindows
+from .commit_stats import CommitStats
+from .dashboard_cache import DashboardCache, invalidate_dashboards
 from .dashboard_factory import DashboardFactory
+from .metric_snapshots import MetricSnapshots
+from .metrics_aggregator import MetricsAccumulator, SyncCursor
+from .repository_stats import RepositoryStats
+
+logger = logging.getLogger(__name__)
 
 
 class DashboardService:
@@ -13,169 +29,408 @@ class DashboardService:
     Orchestrates data fetching, processing, and dashboard generation
     """
 
-    def __init__(self, access_token: str):
-        self.github_client = GitHubClient(access_token)
+    def __init__(self, access_token: str, priority: str = RequestPriority.INTERACTIVE):
+        self.github_client = GitHubClient(access_token, priority=priority)
         self.adapter = GitHubAPIAdapter()
-        self.contributor_repo = ContributorRepository()
-        self.repo_repository = RepositoryRepository()
+        # Batched GraphQL queries replace the REST paginations of a single contributor and of user repositories
+        self.use_graphql = settings.GITHUB_FETCH_MODE == 'graphql'
+        self.graphql_client = GitHubGraphQLClient(access_token, priority=priority)
+        self.graphql_adapter = GitHubGraphQLAdapter()
+        self.contributor_repo = get_repository('contributors')
+        self.repo_repository = get_repository('repositories')
+        self.activity_repo = get_repository('activity')
+        self.activity_store = ActivityStore()
+        self.activity_windows = ActivityWindows(self.activity_repo)
+        self.dashboard_cache = DashboardCache(self)
+        self.commit_stats = CommitStats(self.github_client)
+        self.repository_stats = RepositoryStats(self.github_client, self.commit_stats)
+        self.snapshots = MetricSnapshots()
 
     def sync_repository_data(self, owner: str, repo: str) -> Dict:
         """Fetch and sync repository data from GitHub"""
+        full_name = f"{owner}/{repo}"
+
         # Get repository info
         repo_data = self.github_client.get_repository(owner, repo)
         adapted_repo = self.adapter.adapt_repository(repo_data)
+        stored_repo, previous_repo = self._store_repository(full_name, adapted_repo)
 
-        # Store in MongoDB
-        full_name = f"{owner}/{repo}"
-        stored_repo = self.repo_repository.upsert_repository(full_name, adapted_repo)
+        # `pushed_at` is the repository's high-water mark: contributions only
+        # change with pushes, so the contributor list is refetched only then
+        if not self._contributors_outdated(previous_repo, adapted_repo):
+            return stored_repo
 
         # Get and store contributors
         contributors = self.github_client.get_contributors(owner, repo)
         adapted_contributors = [self.adapter.adapt_contributor(c) for c in contributors]
-
-        for contributor in adapted_contributors:
-            contributor['repository'] = full_name
-
-        self.contributor_repo.bulk_upsert(adapted_contributors)
+        self._store_contributors(full_name, previous_repo, adapted_repo, adapted_contributors)
 
         return stored_repo
 
-    def generate_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
-        """Generate comprehensive dashboard for a specific contributor"""
-        # Fetch data from GitHub API
-        commits = self.github_client.get_commits(owner, repo, author=username)
-        issues = self.github_client.get_issues(owner, repo, creator=username)
-        pull_requests = self.github_client.get_pull_requests(owner, repo, creator=username)
-        recent_activity = self.github_client.get_user_activity(username)
+    def _store_repository(self, full_name: str, adapted_repo: Dict) -> Tuple[Dict, Optional[Dict]]:
+        """Upsert a repository; returns the stored document and the one it replaced"""
+        previous_repo = self.repo_repository.get_by_full_name(full_name)
+        # Store in MongoDB
+        stored_repo = self.repo_repository.upsert_repository(full_name, adapted_repo)
+        self.snapshots.record_repositories([{**adapted_repo, 'full_name': full_name}])
+        return stored_repo, previous_repo
 
-        # Adapt data
-        adapted_commits = [self.adapter.adapt_commit(c) for c in commits]
-        adapted_issues = [self.adapter.adapt_issue(i) for i in issues]
-        adapted_prs = [self.adapter.adapt_pull_request(pr) for pr in pull_requests]
+    @staticmethod
+    def _contributors_outdated(previous_repo: Optional[Dict], adapted_repo: Dict) -> bool:
+        return not (
+            previous_repo and adapted_repo.get('pushed_at') and
+            previous_repo.get('pushed_at') == adapted_repo.get('pushed_at')
+        )
 
-        # Calculate metrics
-        metrics = self._calculate_metrics(adapted_commits, adapted_issues, adapted_prs)
+    def _store_contributors(
+            self,
+            full_name: str,
+            previous_repo: Optional[Dict],
+            adapted_repo: Dict,
+            adapted_contributors: List[Dict],
+    ) -> None:
+        """Upsert a repository's contributors and invalidate the dashboards they outdate"""
+        for contributor in adapted_contributors:
+            contributor['repository'] = full_name
 
-        # Generate charts data
-        charts_data = self._generate_charts_data(adapted_commits, adapted_issues, adapted_prs)
+        previous_contributions = {
+            c.get('username'): c.get('contributions') for c in self.contributor_repo.get_by_repository(full_name)
+        }
+        self.contributor_repo.bulk_upsert(adapted_contributors)
 
-        # Use Factory to create dashboard object
-        dashboard = DashboardFactory.create_contributor_dashboard(
+        # New pushes or contributions make cached dashboards outdated
+        if previous_repo and previous_repo.get('pushed_at') != adapted_repo.get('pushed_at'):
+            invalidate_dashboards(full_name)
+        else:
+            for contributor in adapted_contributors:
+                previous = previous_contributions.get(contributor['login'])
+                if previous is not None and previous != contributor['contributions']:
+                    invalidate_dashboards(full_name, contributor['login'])
+
+    def sync_user_repositories(self) -> List[Dict]:
+        """Fetch the authenticated user's repositories and store them in one bulk write"""
+        if self.use_graphql:
+            adapted_repos = [
+                self.graphql_adapter.adapt_repository(repo) for repo in self.graphql_client.get_user_repositories()
+            ]
+        else:
+            adapted_repos = [
+                self.adapter.adapt_repository(repo) for repo in self.github_client.get_user_repositories()
+            ]
+        self._store_repositories(adapted_repos)
+        return adapted_repos
+
+    def _store_repositories(self, adapted_repos: List[Dict]) -> None:
+        self.repo_repository.bulk_upsert(adapted_repos)
+        self.snapshots.record_repositories(adapted_repos)
+
+    def get_repository_stats(self, owner: str, repo: str, granularity: str = 'week') -> Dict:
+        """Commit numbers of a whole repository, by week or by day"""
+        return self.repository_stats.get(owner, repo, granularity)
+
+    def get_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
+        """Serve a contributor dashboard through the read-through cache"""
+        return self.dashboard_cache.get_contributor_dashboard(owner, repo, username)
+
+    def get_contributor_dashboard_window(
+            self,
+            owner: str,
+            repo: str,
+            username: str,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            granularity: str = 'day',
+    ) -> Dict:
+        """
+        A contributor dashboard limited to the days from `start` to `end`
+        (YYYY-MM-DD, inclusive), with commits bucketed by day, week or month.
+        Computed from stored activity, so switching windows asks GitHub nothing.
+        """
+        full_name = f"{owner}/{repo}"
+        dashboard = self.get_contributor_dashboard(owner, repo, username)
+        window = self.activity_windows.get(full_name, username, dashboard['generated_at'])
+        if not self._window_complete(window, dashboard) and not self._activity_backfilled(full_name, username):
+            dashboard = self._backfill_activity(owner, repo, username)
+            window = self.activity_windows.get(full_name, username, dashboard['generated_at'])
+
+        accumulator = MetricsAccumulator.from_state(window.totals(start, end))
+        windowed = DashboardFactory.create_contributor_dashboard(
             username=username,
-            repository=f"{owner}/{repo}",
-            metrics=metrics,
-            charts=charts_data,
-            recent_activity=recent_activity[:10]
+            repository=full_name,
+            metrics=accumulator.metrics(),
+            charts=accumulator.charts(granularity),
+            recent_activity=dashboard.get('recent_activity') or [],
         )
+        return {
+            **windowed,
+            'generated_at': dashboard['generated_at'],
+            'window': {'from': start, 'to': end, 'granularity': granularity},
+        }
 
-        # Store in MongoDB
-        self.contributor_repo.upsert_contributor(username, f"{owner}/{repo}", dashboard)
+    @staticmethod
+    def _window_complete(window: ActivityWindow, dashboard: Dict) -> bool:
+        """Whether stored activity holds everything the dashboard counted"""
+        totals = window.totals()
+        metrics = dashboard['metrics']
+        return (
+            totals['commits_total'] >= metrics['commits']['total']
+            and totals['issues_total'] >= metrics['issues']['total']
+            and totals['prs_total'] >= metrics['pull_requests']['total']
+        )
 
+    def _activity_backfilled(self, full_name: str, username: str) -> bool:
+        """
+        Whether stored activity was already backfilled: anything it still
+        lacks, such as items GitHub reports without an id, will never be stored
+        """
+        stored = self.contributor_repo.get_by_username_and_repo(username, full_name)
+        return bool((stored or {}).get('activity_backfilled_at'))
+
+    def _backfill_activity(self, owner: str, repo: str, username: str) -> Dict:
+        """
+        Regenerate a dashboard from scratch, so activity synced before it was
+        kept gets stored too; done once per contributor
+        """
+        full_name = f"{owner}/{repo}"
+        # Invalidated first, so the dashboard generated next is the only fresh one
+        invalidate_dashboards(full_name, username)
+        self.contributor_repo.upsert_contributor(username, full_name, {'sync_state': None})
+        dashboard = self.generate_contributor_dashboard(owner, repo, username)
+        # Later syncs store everything they fetch, so the stored activity stays as complete as now
+        self.contributor_repo.upsert_contributor(username, full_name, {'activity_backfilled_at': dashboard['generated_at']})
         return dashboard
 
-    def generate_all_contributors_dashboards(self, owner: str, repo: str) -> List[Dict]:
+    def generate_contributor_dashboard(self, owner: str, repo: str, username: str) -> Dict:
+        """
+        Generate comprehensive dashboard for a specific contributor.
+        Resumes from the metrics stored by the previous generation and only
+        fetches activity newer than their high-water marks.
+        """
+        full_name = f"{owner}/{repo}"
+        accumulator = self._resume_accumulator(owner, repo, username)
+        since = accumulator.synced
+        executor = get_executor('dashboard-fetch', settings.DASHBOARD_FETCH_WORKERS)
+
+        if self.use_graphql:
+            activity = executor.submit(self.github_client.get_user_activity, username)
+            self._consume_graphql_activity(owner, repo, username, accumulator)
+            return self._build_dashboard(owner, repo, username, accumulator, activity.result())
+
+        # Stream all four endpoints concurrently; each feeds its own counters and is stored as it goes
+        streams = [
+            executor.submit(accumulator.consume_commits, self.activity_store.saving(
+                full_name, 'commits', self.commit_stats.fill(owner, repo, self._adapted(
+                    self.github_client.get_commits(owner, repo, author=username, since=since.commits_since()),
+                    self.adapter.adapt_commit)))),
+            executor.submit(accumulator.consume_issues, self.activity_store.saving(
+                full_name, 'issues', self._adapted(
+                    self.github_client.get_issues(owner, repo, creator=username, since=since.issues),
+                    self.adapter.adapt_issue))),
+            executor.submit(accumulator.consume_pull_requests, self.activity_store.saving(
+                full_name, 'pull_requests', self._adapted(
+                    self.github_client.get_pull_requests(owner, repo, creator=username, since=since.pull_requests),
+                    self.adapter.adapt_pull_request))),
+        ]
+        activity = executor.submit(self.github_client.get_user_activity, username)
+        for stream in streams:
+            stream.result()
+
+        return self._build_dashboard(owner, repo, username, accumulator, activity.result())
+
+    def _consume_graphql_activity(
+            self, owner: str, repo: str, username: str, accumulator: MetricsAccumulator
+    ) -> None:
+        """Feed a contributor's activity, fetched in batched GraphQL queries, to their accumulator"""
+        since = accumulator.synced
+        activity = self.graphql_client.get_contributor_activity(
+            owner, repo, username,
+            commits_since=since.commits_since(), issues_since=since.issues, pulls_since=since.pull_requests,
+        )
+        self._store_graphql_activity(f"{owner}/{repo}", activity, accumulator)
+
+    def _store_graphql_activity(self, full_name: str, activity: Dict, accumulator: MetricsAccumulator) -> None:
+        """Adapt, store and count the GraphQL nodes of a contributor's activity"""
+        commits = [self.graphql_adapter.adapt_commit(commit) for commit in activity['commits']]
+        issues = [self.graphql_adapter.adapt_issue(issue) for issue in activity['issues']]
+        pull_requests = [self.graphql_adapter.adapt_pull_request(pr) for pr in activity['pull_requests']]
+        # Line changes come with GraphQL commits; keep them for REST fetches too
+        self.commit_stats.remember({commit['sha']: commit['stats'] for commit in commits if commit.get('sha')})
+        self.activity_store.save(full_name, 'commits', commits)
+        self.activity_store.save(full_name, 'issues', issues)
+        self.activity_store.save(full_name, 'pull_requests', pull_requests)
+        accumulator.consume_commits(commits)
+        accumulator.consume_issues(issues)
+        accumulator.consume_pull_requests(pull_requests)
+
+    def _resume_accumulator(self, owner: str, repo: str, username: str) -> MetricsAccumulator:
+        """A contributor's stored metrics, ready to take activity fetched from now on"""
+        full_name = f"{owner}/{repo}"
+        stored = self.contributor_repo.get_by_username_and_repo(username, full_name)
+        accumulator = MetricsAccumulator.from_state((stored or {}).get('sync_state'))
+        # The coming fetch is complete up to now, so also past the repository's marks
+        stored_repo = self.repo_repository.get_by_full_name(full_name)
+        accumulator.advance(SyncCursor.from_state((stored_repo or {}).get('sync_cursor')))
+        return accumulator
+
+    def generate_all_contributors_dashboards(
+            self, owner: str, repo: str, progress: Optional[Progress] = None
+    ) -> List[Dict]:
         """Generate dashboards for all contributors in a repository"""
-        contributors = self.github_client.get_contributors(owner, repo)
-        dashboards = []
-
-        for contributor in contributors:
-            username = contributor.get('login')
-            try:
-                dashboard = self.generate_contributor_dashboard(owner, repo, username)
-                dashboards.append(dashboard)
-            except Exception as e:
-                continue
-
-        return dashboards
-
-    def _calculate_metrics(self, commits: List[Dict], issues: List[Dict], prs: List[Dict]) -> Dict:
-        """Calculate contributor metrics"""
-        total_commits = len(commits)
-        total_additions = sum(c['stats']['additions'] for c in commits)
-        total_deletions = sum(c['stats']['deletions'] for c in commits)
-
-        issues_opened = len([i for i in issues if i['state'] == 'open'])
-        issues_closed = len([i for i in issues if i['state'] == 'closed'])
-
-        prs_submitted = len(prs)
-        prs_merged = len([pr for pr in prs if pr.get('merged', False)])
-        prs_open = len([pr for pr in prs if pr['state'] == 'open'])
-
-        return {
-            'commits': {
-                'total': total_commits,
-                'additions': total_additions,
-                'deletions': total_deletions,
-                'net_change': total_additions - total_deletions,
-            },
-            'issues': {
-                'total': len(issues),
-                'opened': issues_opened,
-                'closed': issues_closed,
-                'close_rate': (issues_closed / len(issues) * 100) if issues else 0,
-            },
-            'pull_requests': {
-                'total': prs_submitted,
-                'merged': prs_merged,
-                'open': prs_open,
-                'merge_rate': (prs_merged / prs_submitted * 100) if prs_submitted else 0,
-            },
+        return list(self.iter_contributors_dashboards(owner, repo, progress))
+
+    def iter_contributors_dashboards(
+            self, owner: str, repo: str, progress: Optional[Progress] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield each contributor's dashboard as soon as it is built.
+        The repository history is streamed once and routed to per-login
+        accumulators, instead of being re-downloaded for every contributor.
+        Only activity after the repository's high-water marks is fetched;
+        contributors whose stored metrics stop before those marks catch up
+        on their own. Failures are reported per contributor to `progress`.
+        Recent activity is prefetched a bounded window ahead, so memory does
+        not grow with the number of dashboards consumed.
+        """
+        progress = progress or Progress()
+        full_name = f"{owner}/{repo}"
+        stored_repo = self.repo_repository.get_by_full_name(full_name)
+        since = SyncCursor.from_state((stored_repo or {}).get('sync_cursor'))
+        states = {
+            c['username']: c.get('sync_state')
+            for c in self.contributor_repo.get_by_repository(full_name, projection=['username', 'sync_state'])
         }
 
-    def _generate_charts_data(self, commits: List[Dict], issues: List[Dict], prs: List[Dict]) -> Dict:
-        """Generate data formatted for charts"""
-        # Commits over time
-        commits_timeline = self._group_by_date(commits, 'author.date')
-
-        # Code changes distribution
-        code_changes = [
-            {
-                'name': 'Additions',
-                'value': sum(c['stats']['additions'] for c in commits)
-            },
-            {
-                'name': 'Deletions',
-                'value': sum(c['stats']['deletions'] for c in commits)
-            }
-        ]
-
-        # Issues status
-        issues_status = [
-            {'name': 'Open', 'value': len([i for i in issues if i['state'] == 'open'])},
-            {'name': 'Closed', 'value': len([i for i in issues if i['state'] == 'closed'])},
-        ]
-
-        # PRs status
-        prs_status = [
-            {'name': 'Merged', 'value': len([pr for pr in prs if pr.get('merged', False)])},
-            {'name': 'Open', 'value': len([pr for pr in prs if pr['state'] == 'open'])},
-            {'name': 'Closed',
-             'value': len([pr for pr in prs if pr['state'] == 'closed' and not pr.get('merged', False)])},
+        usernames = [c.get('login') for c in self.github_client.get_contributors(owner, repo) if c.get('login')]
+        # Built up front so the stream threads never insert concurrently
+        accumulators = {}
+        for username in usernames:
+            accumulator = MetricsAccumulator.from_state(states.get(username))
+            if not accumulator.cursor().is_behind(since):
+                accumulators[username] = accumulator
+        progress.start(len(usernames))
+
+        # Marks of everything streamed, whoever it belongs to
+        latest = SyncCursor()
+        executor = get_executor('dashboard-fetch', settings.DASHBOARD_FETCH_WORKERS)
+        streams = [
+            executor.submit(
+                self._route,
+                self.activity_store.saving(full_name, 'commits', self.commit_stats.fill(owner, repo, self._adapted(
+                    self.github_client.get_commits(owner, repo, since=since.commits_since()),
+                    self.adapter.adapt_commit))),
+                accumulators, lambda c: c['author'].get('login'), MetricsAccumulator.add_commit,
+                latest.observe_commit
+            ),
+            executor.submit(
+                self._route,
+                self.activity_store.saving(full_name, 'issues', self._adapted(
+                    self.github_client.get_issues(owner, repo, since=since.issues), self.adapter.adapt_issue)),
+                accumulators, lambda i: i.get('user'), MetricsAccumulator.add_issue, latest.observe_issue
+            ),
+            executor.submit(
+                self._route,
+                self.activity_store.saving(full_name, 'pull_requests', self._adapted(
+                    self.github_client.get_pull_requests(owner, repo, since=since.pull_requests),
+                    self.adapter.adapt_pull_request)),
+                accumulators, lambda pr: pr.get('user'), MetricsAccumulator.add_pull_request,
+                latest.observe_pull_request
+            ),
         ]
+        # Each contributor's recent activity, fetched a bounded window ahead
+        pending = iter(usernames)
+        activities = deque(
+            (username, self._prefetch_activity(executor, username, accumulators))
+            for username in islice(pending, settings.DASHBOARD_FETCH_WORKERS)
+        )
+        with progress.timed('fetch'):
+            for stream in streams:
+                stream.result()
+
+        synced = since.merge(latest)
+        self.repo_repository.upsert_repository(full_name, {'sync_cursor': synced.state()})
+
+        with progress.timed('build'):
+            while activities:
+                username, activity = activities.popleft()
+                next_username = next(pending, None)
+                if next_username:
+                    activities.append((next_username, self._prefetch_activity(executor, next_username, accumulators)))
+                try:
+                    if username in accumulators:
+                        accumulators[username].advance(synced)
+                        dashboard = self._build_dashboard(
+                            owner, repo, username, accumulators.pop(username), activity.result()
+                        )
+                    else:
+                        dashboard = self.generate_contributor_dashboard(owner, repo, username)
+                except Exception as e:
+                    logger.warning("Dashboard of %s in %s failed: %s", username, full_name, e)
+                    progress.failed(username, e)
+                    continue
+                progress.succeeded(username)
+                yield dashboard
+
+    def _prefetch_activity(self, executor, username: str, accumulators: Dict) -> Optional[Future]:
+        # Contributors without an accumulator fetch their own activity
+        if username not in accumulators:
+            return None
+        return executor.submit(self.github_client.get_user_activity, username)
+
+    def _build_dashboard(
+            self,
+            owner: str,
+            repo: str,
+            username: str,
+            accumulator: MetricsAccumulator,
+            recent_activity: List[Dict],
+    ) -> Dict:
+        """Assemble and store a dashboard from accumulated metrics"""
+        self._resolve_pending_stats(owner, repo, accumulator)
+        dashboard = DashboardFactory.create_contributor_dashboard(
+            username=username,
+            repository=f"{owner}/{repo}",
+            metrics=accumulator.metrics(),
+            charts=accumulator.charts(),
+            recent_activity=recent_activity[:10]
+        )
 
-        return {
-            'commits_timeline': commits_timeline,
-            'code_changes': code_changes,
-            'issues_status': issues_status,
-            'prs_status': prs_status,
-        }
+        # Store in MongoDB, with what the next generation resumes from
+        if not self.contributor_repo.upsert_if_unchanged(
+                username, f"{owner}/{repo}", {**dashboard, 'sync_state': accumulator.state()}, accumulator.version
+        ):
+            # A webhook delivery was applied during the fetch; resume from it rather than overwrite it
+            return self.generate_contributor_dashboard(owner, repo, username)
+        self.snapshots.record_contributor(dashboard)
 
-    def _group_by_date(self, items: List[Dict], date_field: str) -> List[Dict]:
-        """Group items by date for timeline charts"""
-        from collections import defaultdict
-        grouped = defaultdict(int)
+        return dashboard
 
-        for item in items:
-            # Navigate nested fields
-            date_value = item
-            for field in date_field.split('.'):
-                date_value = date_value.get(field, '')
+    def _resolve_pending_stats(self, owner: str, repo: str, accumulator: MetricsAccumulator) -> None:
+        """Line changes of commits counted without them, as far as the budget allows"""
+        if not accumulator.pending_stats:
+            return
+        stats = self.commit_stats.resolve(owner, repo, sorted(accumulator.pending_stats))
+        accumulator.add_commit_stats(stats)
+        self.activity_store.save_commit_stats(f"{owner}/{repo}", stats)
 
-            if date_value:
-                date = datetime.fromisoformat(date_value.replace('Z', '+00:00')).date()
-                grouped[str(date)] += 1
+    @staticmethod
+    def _adapted(items: Iterable[Dict], adapt: Callable[[Dict], Dict]) -> Iterator[Dict]:
+        """Lazily adapt a paginated stream"""
+        return (adapt(item) for item in items)
 
-        return [{'date': date, 'count': count} for date, count in sorted(grouped.items())]
+    @staticmethod
+    def _route(
+            records: Iterable[Dict],
+            accumulators: Dict[str, MetricsAccumulator],
+            login_of: Callable[[Dict], Optional[str]],
+            add: Callable[[MetricsAccumulator, Dict], None],
+            observe: Callable[[Dict], None],
+    ) -> None:
+        """Feed each record to the accumulator of its author"""
+        for record in records:
+            observe(record)
+            accumulator = accumulators.get(login_of(record))
+            if accumulator is not None:
+                add(accumulator, record)
 
 
 # apps/dashboards/services/dashboard_factory.py
@@ -0,0 +1,123 @@
+# apps/dashboards/services/metric_snapshots.py
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional
+from django.conf import settings
+from core.repositories import get_repository
+from .metrics_aggregator import PERIOD_STARTS, commit_day
+
+# Finest first
+SNAPSHOT_GRANULARITIES = ('day', 'week', 'month')
+
+CONTRIBUTOR_METRICS = (
+    'commits_total', 'commits_additions', 'commits_deletions', 'commits_net_change',
+    'issues_total', 'issues_opened', 'issues_closed', 'issues_close_rate',
+    'pull_requests_total', 'pull_requests_merged', 'pull_requests_open', 'pull_requests_merge_rate',
+)
+REPOSITORY_METRICS = ('stars', 'forks', 'open_issues')
+
+# Longest a period of each granularity lasts, in days
+PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 31}
+
+
+def flatten_metrics(metrics: Dict) -> Dict:
+    """Dashboard metrics as one level: {'commits': {'total': 3}} becomes {'commits_total': 3}"""
+    return {f"{group}_{name}": value for group, values in metrics.items() for name, value in values.items()}
+
+
+def retention(granularity: str) -> int:
+    """Days periods of a granularity are kept for; 0 keeps them indefinitely"""
+    return {
+        'day': settings.METRIC_SNAPSHOT_DAY_RETENTION,
+        'week': settings.METRIC_SNAPSHOT_WEEK_RETENTION,
+        'month': settings.METRIC_SNAPSHOT_MONTH_RETENTION,
+    }[granularity]
+
+
+class MetricSnapshots:
+    """
+    Daily snapshots of contributor and repository metrics, rolled up by week
+    and month as they are written.
+
+    A snapshot is written to the day, week and month it falls in at once;
+    each period keeps the metrics as of its latest snapshot, so a series at
+    any granularity is read back in one range query without aggregating.
+    Finer periods are downsampled away after their retention
+    (METRIC_SNAPSHOT_*_RETENTION days), leaving the coarser rollups.
+    """
+
+    def __init__(self):
+        self.repository = get_repository('metric_snapshots')
+
+    def record_contributor(self, dashboard: Dict) -> None:
+        """Snapshot the metrics of a dashboard on the day it was generated"""
+        self.repository.record(list(self._snapshots(
+            dashboard['repository'], dashboard['username'], flatten_metrics(dashboard['metrics']),
+            commit_day(dashboard['generated_at']),
+        )))
+
+    def record_repositories(self, repositories: List[Dict]) -> None:
+        """Snapshot the metrics of adapted repositories as of today"""
+        day = datetime.utcnow().date().isoformat()
+        self.repository.record([
+            snapshot
+            for repository in repositories if repository.get('full_name')
+            for snapshot in self._snapshots(
+                repository['full_name'], None, {metric: repository.get(metric, 0) for metric in REPOSITORY_METRICS}, day
+            )
+        ])
+
+    def series(
+            self,
+            full_name: str,
+            username: Optional[str],
+            metric: str,
+            granularity: Optional[str] = None,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+    ) -> Dict:
+        """
+        A metric over the periods from `start` to `end` (YYYY-MM-DD days).
+        Without a granularity, the finest one still retained at `start` is used.
+        """
+        granularity = granularity or self.finest_granularity(start)
+        # The period `start` falls in is part of the range
+        first = PERIOD_STARTS[granularity](start) if start else None
+        points = self.repository.get_series(full_name, username, granularity, metric, first, end)
+        return {
+            'repository': full_name,
+            'username': username,
+            'metric': metric,
+            'granularity': granularity,
+            'from': start,
+            'to': end,
+            'series': [{'date': point['period'], 'value': point['value']} for point in points],
+        }
+
+    @staticmethod
+    def finest_granularity(start: Optional[str]) -> str:
+        if start:
+            age = (datetime.utcnow().date() - date.fromisoformat(start)).days
+            for granularity in SNAPSHOT_GRANULARITIES:
+                days = retention(granularity)
+                if not days or age < days:
+                    return granularity
+        return SNAPSHOT_GRANULARITIES[-1]
+
+    def _snapshots(self, full_name: str, username: Optional[str], metrics: Dict, day: str) -> Iterator[Dict]:
+        for granularity in SNAPSHOT_GRANULARITIES:
+            period = PERIOD_STARTS[granularity](day)
+            yield {
+                'repository': full_name,
+                'username': username,
+                'granularity': granularity,
+                'period': period,
+                'metrics': metrics,
+                'expire_at': self._expire_at(granularity, period),
+            }
+
+    @staticmethod
+    def _expire_at(granularity: str, period: str) -> Optional[datetime]:
+        days = retention(granularity)
+        if not days:
+            return None
+        return datetime.combine(date.fromisoformat(period), time()) + timedelta(days=PERIOD_DAYS[granularity] + days)
@@ -0,0 +1,369 @@
+# apps/dashboards/services/metrics_aggregator.py
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from django.conf import settings
+
+
+def commit_day(date_value: Optional[str]) -> Optional[str]:
+    """
+    Calendar day of an ISO-8601 timestamp.
+    The date part is written first in the string, so slicing gives the same
+    day `datetime.fromisoformat(...).date()` would without parsing.
+    """
+    return date_value[:10] if date_value else None
+
+
+def week_start(day: str) -> str:
+    """Sunday starting the week of a YYYY-MM-DD day, as in GitHub's statistics"""
+    moment = date.fromisoformat(day)
+    return (moment - timedelta(days=(moment.weekday() + 1) % 7)).isoformat()
+
+
+def month_start(day: str) -> str:
+    """First day of the month of a YYYY-MM-DD day"""
+    return f"{day[:7]}-01"
+
+
+# Start day of the period a YYYY-MM-DD day falls in, by granularity
+PERIOD_STARTS = {
+    'day': lambda day: day,
+    'week': week_start,
+    'month': month_start,
+}
+
+
+def _later(mark: Optional[str], value: Optional[str]) -> Optional[str]:
+    if mark is None or (value is not None and value > mark):
+        return value
+    return mark
+
+
+def _seconds_before(timestamp: str, seconds: int) -> str:
+    moment = datetime.fromisoformat(timestamp).astimezone(timezone.utc) - timedelta(seconds=seconds)
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _open_states(state: Dict, field: str, legacy_field: str) -> Dict[str, str]:
+    """States by id of the open items of a saved state, including older states that kept every item"""
+    if field in state:
+        return {key: 'open' for key in state[field]}
+    return {key: value for key, value in (state.get(legacy_field) or {}).items() if value == 'open'}
+
+
+def _counted_before(item: Dict, mark: Optional[str]) -> bool:
+    """Whether an issue or pull request existed when its stream was last synced up to `mark`"""
+    return mark is not None and (item.get('created_at') or '') <= mark
+
+
+class SyncCursor:
+    """
+    High-water marks of an incremental sync.
+
+    Each stream is complete up to its mark, so the next sync only asks GitHub
+    for newer items. Issues and pull requests are marked by `updated_at`.
+    Commits are marked by committer date, which is what the commits `since`
+    filter compares; as a commit can be pushed well after it was committed,
+    commits are refetched from DASHBOARD_SYNC_COMMIT_OVERLAP seconds before
+    the mark and the SHAs seen in that window are remembered to skip them.
+    """
+
+    def __init__(
+            self,
+            commits: Optional[str] = None,
+            commit_shas: Optional[Dict[str, str]] = None,
+            issues: Optional[str] = None,
+            pull_requests: Optional[str] = None,
+    ):
+        self.commits = commits
+        self.commit_shas: Dict[str, str] = dict(commit_shas or {})
+        self.issues = issues
+        self.pull_requests = pull_requests
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict]) -> 'SyncCursor':
+        return cls(**(state or {}))
+
+    def state(self) -> Dict:
+        since = self.commits_since()
+        return {
+            'commits': self.commits,
+            'commit_shas': {sha: date for sha, date in self.commit_shas.items() if date >= since},
+            'issues': self.issues,
+            'pull_requests': self.pull_requests,
+        }
+
+    def commits_since(self) -> Optional[str]:
+        """Where the next commits fetch starts"""
+        if self.commits is None:
+            return None
+        return _seconds_before(self.commits, settings.DASHBOARD_SYNC_COMMIT_OVERLAP)
+
+    def observe_commit(self, commit: Dict) -> None:
+        date = commit.get('committed_at')
+        if date:
+            self.commits = _later(self.commits, date)
+            self.commit_shas[commit.get('sha')] = date
+
+    def observe_issue(self, issue: Dict) -> None:
+        self.issues = _later(self.issues, issue.get('updated_at'))
+
+    def observe_pull_request(self, pr: Dict) -> None:
+        self.pull_requests = _later(self.pull_requests, pr.get('updated_at'))
+
+    def covers_commit(self, commit: Dict) -> bool:
+        """Whether a commit was already seen by the sync this cursor marks"""
+        if commit.get('sha') in self.commit_shas:
+            return True
+        date = commit.get('committed_at')
+        since = self.commits_since()
+        return bool(date and since and date < since)
+
+    def is_behind(self, other: 'SyncCursor') -> bool:
+        """Whether any stream of this cursor stops before the same stream of `other`"""
+        return any(
+            theirs is not None and (ours is None or ours < theirs)
+            for ours, theirs in (
+                (self.commits, other.commits),
+                (self.issues, other.issues),
+                (self.pull_requests, other.pull_requests),
+            )
+        )
+
+    def merge(self, other: 'SyncCursor') -> 'SyncCursor':
+        """The later mark of each stream"""
+        return SyncCursor(
+            commits=_later(self.commits, other.commits),
+            commit_shas={**self.commit_shas, **other.commit_shas},
+            issues=_later(self.issues, other.issues),
+            pull_requests=_later(self.pull_requests, other.pull_requests),
+        )
+
+
+class MetricsAccumulator:
+    """
+    Single-pass aggregator for a contributor's adapted records.
+
+    Commits, issues and pull requests update disjoint counters, so the three
+    streams may be consumed from different threads. Only the per-day commit
+    counts grow with history, which keeps memory bounded regardless of how
+    many records are streamed through.
+
+    The accumulator can be saved with `state()` and resumed with
+    `from_state()`, so a later sync only feeds it what changed: commits
+    already covered by its cursor are skipped, and issues and pull requests
+    seen again replace their previous contribution instead of adding to it.
+    Only the ids of items still open are saved: a closed issue or pull
+    request can only change again by being reopened, so one not saved open
+    but created before the stream's mark was counted closed (or merged).
+    Saved states are numbered, so a state resumed from can be written back
+    only if nothing else was saved after it.
+    """
+
+    def __init__(self):
+        self.commits_total = 0
+        self.additions = 0
+        self.deletions = 0
+        self.commits_per_day: Counter = Counter()
+        # Counted commits whose line changes are not known yet, by SHA
+        self.pending_stats = set()
+
+        self.issues_total = 0
+        self.issues_open = 0
+        self.issues_closed = 0
+
+        self.prs_total = 0
+        self.prs_open = 0
+        self.prs_merged = 0
+        self.prs_closed_unmerged = 0
+
+        # Last counted state of each issue and pull request, by id; only open ones are saved
+        self.issue_states: Dict[str, str] = {}
+        self.pr_states: Dict[str, str] = {}
+
+        # What the counters already include, and the marks seen since
+        self.synced = SyncCursor()
+        self.latest = SyncCursor()
+        # Number of the state resumed from; 0 when starting from scratch
+        self.version = 0
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict]) -> 'MetricsAccumulator':
+        """Resume from a saved `state()`; None starts from scratch"""
+        accumulator = cls()
+        if not state:
+            return accumulator
+        for field in ('commits_total', 'additions', 'deletions', 'issues_total', 'issues_open', 'issues_closed',
+                      'prs_total', 'prs_open', 'prs_merged', 'prs_closed_unmerged'):
+            setattr(accumulator, field, state.get(field, 0))
+        accumulator.commits_per_day = Counter(state.get('commits_per_day') or {})
+        accumulator.pending_stats = set(state.get('pending_stats') or [])
+        accumulator.issue_states = _open_states(state, 'open_issues', 'issue_states')
+        accumulator.pr_states = _open_states(state, 'open_pull_requests', 'pr_states')
+        accumulator.synced = SyncCursor.from_state(state.get('cursor'))
+        accumulator.version = state.get('version', 0)
+        return accumulator
+
+    def state(self) -> Dict:
+        """Everything needed to resume accumulating later"""
+        return {
+            'commits_total': self.commits_total,
+            'additions': self.additions,
+            'deletions': self.deletions,
+            'commits_per_day': dict(self.commits_per_day),
+            'pending_stats': sorted(self.pending_stats),
+            'issues_total': self.issues_total,
+            'issues_open': self.issues_open,
+            'issues_closed': self.issues_closed,
+            'prs_total': self.prs_total,
+            'prs_open': self.prs_open,
+            'prs_merged': self.prs_merged,
+            'prs_closed_unmerged': self.prs_closed_unmerged,
+            'open_issues': sorted(key for key, state in self.issue_states.items() if state == 'open'),
+            'open_pull_requests': sorted(key for key, status in self.pr_states.items() if status == 'open'),
+            'cursor': self.cursor().state(),
+            'version': self.version + 1,
+        }
+
+    def cursor(self) -> SyncCursor:
+        """How far every stream has been accumulated"""
+        return self.synced.merge(self.latest)
+
+    def advance(self, cursor: SyncCursor) -> None:
+        """Record that every stream was synced up to `cursor`, e.g. by a repository-wide pass"""
+        self.latest = self.latest.merge(cursor)
+
+    def add_commit(self, commit: Dict) -> None:
+        if self.synced.covers_commit(commit):
+            return
+        self.commits_total += 1
+        if commit.get('stats_pending'):
+            self.pending_stats.add(commit['sha'])
+        else:
+            self.additions += commit['stats']['additions']
+            self.deletions += commit['stats']['deletions']
+        day = commit_day(commit['author'].get('date'))
+        if day:
+            self.commits_per_day[day] += 1
+        self.latest.observe_commit(commit)
+
+    def add_commit_stats(self, stats: Dict[str, Dict]) -> None:
+        """Add the line changes of pending commits, once known"""
+        for sha in self.pending_stats & stats.keys():
+            self.additions += stats[sha]['additions']
+            self.deletions += stats[sha]['deletions']
+            self.pending_stats.discard(sha)
+
+    def add_issue(self, issue: Dict) -> None:
+        key = issue.get('id')
+        if key is not None:
+            key = str(key)
+            previous = self.issue_states.get(key)
+            if previous is None and _counted_before(issue, self.synced.issues):
+                previous = 'closed'
+            if previous is not None:
+                self._count_issue(previous, -1)
+            self.issue_states[key] = issue['state']
+        self._count_issue(issue['state'], 1)
+        self.latest.observe_issue(issue)
+
+    def add_pull_request(self, pr: Dict) -> None:
+        status = 'merged' if pr.get('merged', False) else pr['state']
+        key = pr.get('id')
+        if key is not None:
+            key = str(key)
+            previous = self.pr_states.get(key)
+            if previous is None and _counted_before(pr, self.synced.pull_requests):
+                # Merged pull requests cannot be reopened, nor closed ones merged
+                previous = 'closed' if status == 'open' else status
+            if previous is not None:
+                self._count_pull_request(previous, -1)
+            self.pr_states[key] = status
+        self._count_pull_request(status, 1)
+        self.latest.observe_pull_request(pr)
+
+    def _count_issue(self, state: str, delta: int) -> None:
+        self.issues_total += delta
+        if state == 'open':
+            self.issues_open += delta
+        elif state == 'closed':
+            self.issues_closed += delta
+
+    def _count_pull_request(self, status: str, delta: int) -> None:
+        self.prs_total += delta
+        if status == 'merged':
+            self.prs_merged += delta
+        elif status == 'open':
+            self.prs_open += delta
+        elif status == 'closed':
+            self.prs_closed_unmerged += delta
+
+    def consume_commits(self, commits: Iterable[Dict]) -> 'MetricsAccumulator':
+        for commit in commits:
+            self.add_commit(commit)
+        return self
+
+    def consume_issues(self, issues: Iterable[Dict]) -> 'MetricsAccumulator':
+        for issue in issues:
+            self.add_issue(issue)
+        return self
+
+    def consume_pull_requests(self, prs: Iterable[Dict]) -> 'MetricsAccumulator':
+        for pr in prs:
+            self.add_pull_request(pr)
+        return self
+
+    def metrics(self) -> Dict:
+        """Contributor metrics"""
+        return {
+            'commits': {
+                'total': self.commits_total,
+                'additions': self.additions,
+                'deletions': self.deletions,
+                'net_change': self.additions - self.deletions,
+                # Commits whose line changes the budget left for a later build
+                'pending_line_stats': len(self.pending_stats),
+            },
+            'issues': {
+                'total': self.issues_total,
+                'opened': self.issues_open,
+                'closed': self.issues_closed,
+                'close_rate': (self.issues_closed / self.issues_total * 100) if self.issues_total else 0,
+            },
+            'pull_requests': {
+                'total': self.prs_total,
+                'merged': self.prs_merged,
+                'open': self.prs_open,
+                'merge_rate': (self.prs_merged / self.prs_total * 100) if self.prs_total else 0,
+            },
+        }
+
+    def charts(self, granularity: str = 'day') -> Dict:
+        """Data formatted for charts, with commits per day, week or month"""
+        return {
+            'commits_timeline': self.commits_timeline(granularity),
+            'code_changes': [
+                {'name': 'Additions', 'value': self.additions},
+                {'name': 'Deletions', 'value': self.deletions},
+            ],
+            'issues_status': [
+                {'name': 'Open', 'value': self.issues_open},
+                {'name': 'Closed', 'value': self.issues_closed},
+            ],
+            'prs_status': [
+                {'name': 'Merged', 'value': self.prs_merged},
+                {'name': 'Open', 'value': self.prs_open},
+                {'name': 'Closed', 'value': self.prs_closed_unmerged},
+            ],
+        }
+
+    def commits_timeline(self, granularity: str = 'day') -> List[Dict]:
+        """Commits per day, week or month, oldest first; periods are dated by their first day"""
+        if granularity == 'day':
+            buckets = self.commits_per_day
+        else:
+            period_of = PERIOD_STARTS[granularity]
+            buckets = Counter()
+            for day, count in self.commits_per_day.items():
+                buckets[period_of(day)] += count
+        return [{'date': period, 'count': count} for period, count in sorted(buckets.items())]
@@ -0,0 +1,143 @@
+# apps/dashboards/services/repository_stats.py
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from core.concurrency import get_executor
+from core.exceptions import GitHubStatsPendingException
+from core.integrations.github_client import GitHubAPIAdapter
+from .commit_stats import CommitStats
+from .metrics_aggregator import PERIOD_STARTS, commit_day
+
+GRANULARITIES = ('week', 'day')
+
+# GitHubClient methods of the statistics weekly numbers are built from
+STATISTICS = ('get_contributor_stats', 'get_commit_activity', 'get_code_frequency')
+
+
+class RepositoryStats:
+    """
+    Repository-wide commit numbers: commits and line changes per
+    contributor, commit activity and code frequency.
+
+    Weekly numbers come from GitHub's precomputed statistics endpoints, a
+    handful of requests however long the history, sent together and once.
+    While GitHub is still computing any of them, GitHubStatsPendingException
+    is raised for the caller to retry later. Per-day numbers are counted
+    from the raw commit history.
+    GitHub only reports the top 100 contributors.
+    """
+
+    def __init__(self, github_client, commit_stats: CommitStats):
+        self.github_client = github_client
+        self.commit_stats = commit_stats
+        self.adapter = GitHubAPIAdapter()
+
+    def get(self, owner: str, repo: str, granularity: str = 'week') -> Dict:
+        if granularity == 'week':
+            # Never counted from history instead: that can cost a request per commit
+            return self._from_statistics(owner, repo)
+        return self._from_history(owner, repo, granularity)
+
+    def _from_statistics(self, owner: str, repo: str) -> Dict:
+        contributor_stats, weekly_activity, weekly_changes = self._statistics(owner, repo)
+        contributors = [self.adapter.adapt_contributor_stats(entry) for entry in contributor_stats]
+        commit_activity = [self.adapter.adapt_commit_activity(week) for week in weekly_activity]
+        code_frequency = [self.adapter.adapt_code_frequency(week) for week in weekly_changes]
+        return self._result(
+            owner, repo, 'week', 'statistics',
+            contributors=[
+                {
+                    'login': c['login'],
+                    'commits': c['commits'],
+                    'additions': c['additions'],
+                    'deletions': c['deletions'],
+                    # GitHub lists every week since the first commit; quiet ones are left out
+                    'timeline': [
+                        {'date': w['week'], 'commits': w['commits'], 'additions': w['additions'],
+                         'deletions': w['deletions']}
+                        for w in c['weeks'] if w['commits'] or w['additions'] or w['deletions']
+                    ],
+                }
+                for c in contributors
+            ],
+            commit_activity=[{'date': w['week'], 'commits': w['commits']} for w in commit_activity],
+            code_frequency=[
+                {'date': w['week'], 'additions': w['additions'], 'deletions': w['deletions']}
+                for w in code_frequency
+            ],
+        )
+
+    def _statistics(self, owner: str, repo: str) -> List[List]:
+        """The three statistics endpoints, each asked once and all at the same time"""
+        executor = get_executor('github-stats', len(STATISTICS))
+        requests = [executor.submit(getattr(self.github_client, name), owner, repo) for name in STATISTICS]
+        results, pending = [], None
+        # Every request is awaited: each one also has GitHub start computing its statistic
+        for request in requests:
+            try:
+                results.append(request.result())
+            except GitHubStatsPendingException as e:
+                pending = e
+        if pending:
+            raise pending
+        return results
+
+    def _from_history(self, owner: str, repo: str, granularity: str) -> Dict:
+        period_of = PERIOD_STARTS[granularity]
+        # [commits, additions, deletions] per period, for the repository and per login
+        repository: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        by_login: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+
+        commits = self.commit_stats.fill(owner, repo, (
+            self.adapter.adapt_commit(commit) for commit in self.github_client.get_commits(owner, repo)
+        ))
+        for commit in commits:
+            day = commit_day(commit['author'].get('date'))
+            if not day:
+                continue
+            period = period_of(day)
+            login = commit['author'].get('login')
+            totals = [repository[period]] + ([by_login[login][period]] if login else [])
+            for total in totals:
+                total[0] += 1
+                total[1] += commit['stats']['additions']
+                total[2] += commit['stats']['deletions']
+
+        contributors = [
+            {
+                'login': login,
+                'commits': sum(t[0] for t in periods.values()),
+                'additions': sum(t[1] for t in periods.values()),
+                'deletions': sum(t[2] for t in periods.values()),
+                'timeline': self._timeline(periods.items()),
+            }
+            for login, periods in by_login.items()
+        ]
+        timeline = self._timeline(repository.items())
+        return self._result(
+            owner, repo, granularity, 'history',
+            contributors=contributors,
+            commit_activity=[{'date': t['date'], 'commits': t['commits']} for t in timeline],
+            code_frequency=[
+                {'date': t['date'], 'additions': t['additions'], 'deletions': t['deletions']} for t in timeline
+            ],
+        )
+
+    @staticmethod
+    def _timeline(periods: Iterable) -> List[Dict]:
+        return [
+            {'date': period, 'commits': commits, 'additions': additions, 'deletions': deletions}
+            for period, (commits, additions, deletions) in sorted(periods)
+        ]
+
+    @staticmethod
+    def _result(owner: str, repo: str, granularity: str, source: str, contributors: List[Dict],
+                commit_activity: List[Dict], code_frequency: List[Dict]) -> Dict:
+        return {
+            'repository': f"{owner}/{repo}",
+            'granularity': granularity,
+            # `statistics` when precomputed by GitHub, `history` when counted from commits
+            'source': source,
+            'contributors': sorted(contributors, key=lambda c: c['commits'], reverse=True),
+            'commit_activity': commit_activity,
+            'code_frequency': code_frequency,
+        }
@@ -0,0 +1,171 @@
+# apps/dashboards/services/webhook_service.py
+import hashlib
+import hmac
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from core.exceptions import ConcurrentUpdateException
+from core.integrations.github_client import GitHubAPIAdapter
+from core.repositories import get_repository
+from .activity_store import ActivityStore, author_key
+from .commit_stats import CommitStats
+from .dashboard_cache import invalidate_dashboards, mark_webhook_delivery
+from .dashboard_service import DashboardFactory
+from .metric_snapshots import MetricSnapshots
+from .metrics_aggregator import MetricsAccumulator
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ('push', 'issues', 'pull_request')
+
+# Reads and conditional writes of a contributor before a delivery is left to redelivery
+APPLY_ATTEMPTS = 5
+
+
+def verify_signature(body: bytes, signature: Optional[str]) -> bool:
+    """Whether `X-Hub-Signature-256` is the HMAC of the raw body under GITHUB_WEBHOOK_SECRET"""
+    secret = settings.GITHUB_WEBHOOK_SECRET
+    if not secret or not signature:
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class GitHubWebhookService:
+    """
+    Applies webhook deliveries to stored dashboards as deltas.
+
+    Pushes, issues and pull requests are fed to the stored metrics of the
+    contributor they belong to, whatever the casing of the login their
+    dashboard was requested with, exactly as an incremental sync would, so
+    the next sync skips what a delivery already counted. Nothing is asked
+    of GitHub: a delivery carries no token, so a push is only counted when
+    the commit stats store already has the line changes of its commits, and
+    is otherwise left to the next sync, its authors' dashboards outdated so
+    that sync comes with the next read. Deltas are written only if the
+    stored state did not change meanwhile, and reapplied if it did.
+    Deliveries are recorded by id, and a redelivery is acknowledged
+    without being applied twice.
+    """
+
+    def __init__(self):
+        self.adapter = GitHubAPIAdapter()
+        self.contributor_repo = get_repository('contributors')
+        self.commit_stats = get_repository('commit_stats')
+        self.snapshots = MetricSnapshots()
+        self.activity_store = ActivityStore()
+
+    def handle(self, event: str, delivery_id: Optional[str], payload: Dict) -> Dict:
+        """Apply a delivery once; returns what was done with it"""
+        if event not in EVENTS:
+            return {'status': 'ignored', 'event': event}
+
+        store = caches[settings.GITHUB_WEBHOOK_STORE]
+        key = f"webhook:delivery:{delivery_id}"
+        if delivery_id and not store.add(key, True, timeout=settings.GITHUB_WEBHOOK_DELIVERY_TTL):
+            return {'status': 'duplicate', 'event': event}
+        try:
+            updated = self.apply(event, payload)
+        except Exception:
+            # Let GitHub's redelivery try again
+            if delivery_id:
+                store.delete(key)
+            raise
+        return {'status': 'processed', 'event': event, 'updated': updated}
+
+    def apply(self, event: str, payload: Dict) -> List[str]:
+        """Apply an event to the stored dashboards it concerns; returns the contributors updated"""
+        full_name = (payload.get('repository') or {}).get('full_name')
+        if not full_name:
+            return []
+        mark_webhook_delivery(full_name)
+
+        # Adapted records of the event, by contributor login as `author_key` stores it
+        activity: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+        if event == 'push':
+            commits, deferred = self._pushed_commits(payload)
+            for commit in commits:
+                if commit['author'].get('login'):
+                    activity[author_key(commit['author']['login'])]['commits'].append(commit)
+            # Deferred commits are counted by the next sync, which outdated dashboards bring forward
+            for login in {author_key(commit['author'].get('login')) for commit in deferred} - {None}:
+                for username in self._stored_usernames(full_name, login):
+                    invalidate_dashboards(full_name, username)
+        elif event == 'issues':
+            issue = payload.get('issue') or {}
+            # Comments and labels on pull requests also arrive as issue events
+            if issue and 'pull_request' not in issue:
+                adapted = self.adapter.adapt_issue(issue)
+                activity[author_key(adapted['user'])]['issues'].append(adapted)
+        elif event == 'pull_request':
+            if payload.get('pull_request'):
+                adapted = self.adapter.adapt_pull_request(payload['pull_request'])
+                activity[author_key(adapted['user'])]['pull_requests'].append(adapted)
+
+        for kind in ('commits', 'issues', 'pull_requests'):
+            self.activity_store.save(full_name, kind, [
+                record for records in activity.values() for record in records[kind]
+            ])
+        return [
+            username
+            for login, records in activity.items() if login
+            for username in self._stored_usernames(full_name, login)
+            if self._apply_delta(full_name, username, records)
+        ]
+
+    def _stored_usernames(self, full_name: str, login: str) -> List[str]:
+        """Usernames a login's dashboards are stored under, whatever casing they were requested with"""
+        contributors = self.contributor_repo.get_by_login_and_repo(login, full_name, projection=['username'])
+        return [contributor['username'] for contributor in contributors]
+
+    def _pushed_commits(self, payload: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Commits new to the default branch, with the line changes already
+        known, and the commits deferred to the next sync
+        """
+        default_branch = (payload.get('repository') or {}).get('default_branch')
+        # Dashboards count the default branch, as the commits endpoint lists it
+        if not default_branch or payload.get('ref') != f"refs/heads/{default_branch}":
+            return [], []
+        commits = [
+            self.adapter.adapt_push_commit(commit)
+            for commit in payload.get('commits') or []
+            if commit.get('distinct', True)
+        ]
+        stats = self.commit_stats.get_by_shas(CommitStats.shas(commits))
+        if CommitStats.missing(commits, stats):
+            # Counted now, they would be marked synced without line changes; the
+            # whole push waits, so the cursor does not move past any of them
+            return [], commits
+        return CommitStats.apply(commits, stats), []
+
+    def _apply_delta(self, full_name: str, username: str, records: Dict[str, List[Dict]]) -> bool:
+        """Add records to a contributor's stored metrics; contributors without a dashboard are left alone"""
+        for _ in range(APPLY_ATTEMPTS):
+            stored = self.contributor_repo.get_by_username_and_repo(username, full_name)
+            if not stored or not stored.get('sync_state'):
+                return False
+
+            accumulator = MetricsAccumulator.from_state(stored['sync_state'])
+            accumulator.consume_commits(records['commits'])
+            accumulator.consume_issues(records['issues'])
+            accumulator.consume_pull_requests(records['pull_requests'])
+
+            # Invalidated first, so the dashboard written next is the only fresh one
+            invalidate_dashboards(full_name, username)
+            dashboard = DashboardFactory.create_contributor_dashboard(
+                username=username,
+                repository=full_name,
+                metrics=accumulator.metrics(),
+                charts=accumulator.charts(),
+                recent_activity=stored.get('recent_activity') or [],
+            )
+            # A sync or another delivery may have written since the read; apply to theirs then
+            if self.contributor_repo.upsert_if_unchanged(
+                    username, full_name, {**dashboard, 'sync_state': accumulator.state()}, accumulator.version
+            ):
+                self.snapshots.record_contributor(dashboard)
+                return True
+        raise ConcurrentUpdateException(f"{full_name} {username} kept changing while a delivery was applied")
@@ -3,16 +3,34 @@ from django.urls import path
 from .views import (
     UserRepositoriesView,
     RepositoryContributorsView,
+    RepositoryStatsView,
+    MetricHistoryView,
     ContributorDashboardView,
-    AllContributorsDashboardView
+    AllContributorsDashboardView,
+    AllContributorsDashboardStreamView,
+    CacheMetricsView,
+    JobStatusView,
+    GitHubWebhookView,
 )
 
 urlpatterns = [
     path('repositories/', UserRepositoriesView.as_view(), name='user-repositories'),
     path('repositories/<str:owner>/<str:repo>/contributors/',
          RepositoryContributorsView.as_view(), name='repository-contributors'),
-    path('dashboard/<str:owner>/<str:repo>/<str:username>/',
-         ContributorDashboardView.as_view(), name='contributor-dashboard'),
+    path('repositories/<str:owner>/<str:repo>/stats/',
+         RepositoryStatsView.as_view(), name='repository-stats'),
+    path('repositories/<str:owner>/<str:repo>/history/',
+         MetricHistoryView.as_view(), name='repository-history'),
+    # Listed before the contributor route, which would otherwise match "generate-all" as a username
     path('dashboard/<str:owner>/<str:repo>/generate-all/',
          AllContributorsDashboardView.as_view(), name='generate-all-dashboards'),
+    path('dashboard/<str:owner>/<str:repo>/generate-all/stream/',
+         AllContributorsDashboardStreamView.as_view(), name='generate-all-dashboards-stream'),
+    path('dashboard/<str:owner>/<str:repo>/<str:username>/',
+         ContributorDashboardView.as_view(), name='contributor-dashboard'),
+    path('dashboard/<str:owner>/<str:repo>/<str:username>/history/',
+         MetricHistoryView.as_view(), name='contributor-history'),
+    path('jobs/<str:job_id>/', JobStatusView.as_view(), name='job-status'),
+    path('metrics/cache/', CacheMetricsView.as_view(), name='cache-metrics'),
+    path('webhooks/github/', GitHubWebhookView.as_view(), name='github-webhook'),
 ]
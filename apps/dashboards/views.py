@@ -1,14 +1,45 @@
 # apps/dashboards/views.py
+import json
+from collections import deque
+from datetime import date
+from typing import Dict, Iterator
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import QueryDict, StreamingHttpResponse
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
-from social_django.models import UserSocialAuth
-from .serializers import DashboardSerializer, RepositorySerializer, ContributorSerializer
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from .serializers import (
+    ContributorSerializer,
+    DashboardSerializer,
+    MetricSeriesSerializer,
+    RepositorySerializer,
+    RepositoryStatsSerializer,
+)
+from .services.dashboard_cache import dashboard_cache_stats
 from .services.dashboard_service import DashboardService
-from core.repositories.contributor_repository import ContributorRepository
-from core.repositories.repo_repository import RepositoryRepository
-from core.integrations.github_client import GitHubClient, GitHubAPIAdapter
+from .services.metric_snapshots import (
+    CONTRIBUTOR_METRICS,
+    REPOSITORY_METRICS,
+    SNAPSHOT_GRANULARITIES,
+    MetricSnapshots,
+)
+from .services.repository_stats import GRANULARITIES
+from .services.webhook_service import GitHubWebhookService, verify_signature
+from core.exceptions import GitHubStatsPendingException
+from core.jobs import Progress, enqueue, get_job
+from core.repositories import get_repository
+from core.integrations.rate_limiter import RequestPriority
+from core.integrations.response_cache import get_response_cache
+
+
+def github_not_connected() -> Response:
+    return Response(
+        {'error': 'GitHub account not connected'},
+        status=status.HTTP_401_UNAUTHORIZED
+    )
 
 
 class UserRepositoriesView(APIView):
@@ -19,27 +50,21 @@ class UserRepositoriesView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        try:
-            # Get GitHub access token from social auth
-            social_auth = UserSocialAuth.objects.get(user=request.user, provider='github')
-            access_token = social_auth.extra_data.get('access_token')
+        # Resolved by GitHubSessionAuthentication
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
 
-            # Fetch repositories from GitHub
-            github_client = GitHubClient(access_token)
-            repos = github_client.get_user_repositories()
+        try:
+            # Fetch repositories from GitHub and store them
+            service = DashboardService(access_token)
+            adapted_repos = service.sync_user_repositories()
 
-            # Adapt and serialize
-            adapter = GitHubAPIAdapter()
-            adapted_repos = [adapter.adapt_repository(repo) for repo in repos]
+            # Serialize
             serializer = RepositorySerializer(adapted_repos, many=True)
 
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        except UserSocialAuth.DoesNotExist:
-            return Response(
-                {'error': 'GitHub account not connected'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -55,10 +80,11 @@ class RepositoryContributorsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, owner, repo):
-        try:
-            social_auth = UserSocialAuth.objects.get(user=request.user, provider='github')
-            access_token = social_auth.extra_data.get('access_token')
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
 
+        try:
             # Initialize service
             service = DashboardService(access_token)
 
@@ -66,7 +92,7 @@ class RepositoryContributorsView(APIView):
             service.sync_repository_data(owner, repo)
 
             # Get contributors from MongoDB
-            contributor_repo = ContributorRepository()
+            contributor_repo = get_repository('contributors')
             contributors = contributor_repo.get_by_repository(f"{owner}/{repo}")
 
             serializer = ContributorSerializer(contributors, many=True)
@@ -79,23 +105,134 @@ class RepositoryContributorsView(APIView):
             )
 
 
+class RepositoryStatsView(APIView):
+    """
+    GET /api/repositories/{owner}/{repo}/stats/?granularity=week|day
+    Commits and line changes of a repository and its contributors; weekly
+    numbers come from GitHub's precomputed statistics, answered with a 202
+    and Retry-After while GitHub is still computing them
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, owner, repo):
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
+
+        granularity = request.query_params.get('granularity', 'week')
+        if granularity not in GRANULARITIES:
+            return Response(
+                {'error': f"granularity must be one of: {', '.join(GRANULARITIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            service = DashboardService(access_token)
+            stats = service.get_repository_stats(owner, repo, granularity)
+
+            serializer = RepositoryStatsSerializer(stats)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        except GitHubStatsPendingException as e:
+            return Response(
+                {'status': 'pending', 'error': str(e)},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Retry-After': str(settings.GITHUB_STATS_RETRY_AFTER)}
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class MetricHistoryView(APIView):
+    """
+    GET /api/repositories/{owner}/{repo}/history/?metric=stars
+    GET /api/dashboard/{owner}/{repo}/{username}/history/?metric=commits_total
+    A metric's snapshot series, optionally with &from=&to=YYYY-MM-DD and
+    &granularity=day|week|month; served from stored rollups only
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, owner, repo, username=None):
+        metrics = CONTRIBUTOR_METRICS if username else REPOSITORY_METRICS
+        metric = request.query_params.get('metric', metrics[0])
+        if metric not in metrics:
+            return Response(
+                {'error': f"metric must be one of: {', '.join(metrics)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        granularity = request.query_params.get('granularity')
+        if granularity is not None and granularity not in SNAPSHOT_GRANULARITIES:
+            return Response(
+                {'error': f"granularity must be one of: {', '.join(SNAPSHOT_GRANULARITIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end = request.query_params.get('from'), request.query_params.get('to')
+        try:
+            for day in (start, end):
+                if day is not None:
+                    date.fromisoformat(day)
+        except ValueError:
+            return Response(
+                {'error': 'from and to must be dates as YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            series = MetricSnapshots().series(f"{owner}/{repo}", username, metric, granularity, start, end)
+
+            serializer = MetricSeriesSerializer(series)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class ContributorDashboardView(APIView):
     """
     GET /api/dashboard/{owner}/{repo}/{username}/
-    Generate and retrieve dashboard for a specific contributor
+    Generate and retrieve dashboard for a specific contributor, optionally
+    limited with &from=&to=YYYY-MM-DD and &granularity=day|week|month
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, owner, repo, username):
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
+
+        granularity = request.query_params.get('granularity')
+        if granularity is not None and granularity not in SNAPSHOT_GRANULARITIES:
+            return Response(
+                {'error': f"granularity must be one of: {', '.join(SNAPSHOT_GRANULARITIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end = request.query_params.get('from'), request.query_params.get('to')
         try:
-            social_auth = UserSocialAuth.objects.get(user=request.user, provider='github')
-            access_token = social_auth.extra_data.get('access_token')
+            # Windows are bisected as YYYY-MM-DD strings
+            start, end = (date.fromisoformat(day).isoformat() if day is not None else None for day in (start, end))
+        except ValueError:
+            return Response(
+                {'error': 'from and to must be dates as YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        try:
             # Initialize service
             service = DashboardService(access_token)
 
-            # Generate dashboard
-            dashboard = service.generate_contributor_dashboard(owner, repo, username)
+            if start is None and end is None and granularity is None:
+                # Serve a cached dashboard, generating it when missing or expired
+                dashboard = service.get_contributor_dashboard(owner, repo, username)
+            else:
+                dashboard = service.get_contributor_dashboard_window(
+                    owner, repo, username, start, end, granularity or 'day'
+                )
 
             serializer = DashboardSerializer(dashboard)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -110,31 +247,190 @@ class ContributorDashboardView(APIView):
 class AllContributorsDashboardView(APIView):
     """
     POST /api/dashboard/{owner}/{repo}/generate-all/
-    Generate dashboards for all contributors in a repository
+    Queue generation of dashboards for all contributors in a repository;
+    poll the returned job for progress
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request, owner, repo):
-        try:
-            social_auth = UserSocialAuth.objects.get(user=request.user, provider='github')
-            access_token = social_auth.extra_data.get('access_token')
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
 
-            # Initialize service
-            service = DashboardService(access_token)
+        try:
+            def generate_all(job):
+                # Bulk generation yields to interactive dashboards for the rate-limit budget
+                service = DashboardService(access_token, priority=RequestPriority.BULK)
+                dashboards = service.generate_all_contributors_dashboards(owner, repo, progress=job)
+                return {'count': len(dashboards)}
 
-            # Generate all dashboards
-            dashboards = service.generate_all_contributors_dashboards(owner, repo)
+            job = enqueue(
+                'generate-all-dashboards',
+                generate_all,
+                params={'owner': owner, 'repo': repo},
+                user_id=request.user.id,
+            )
+            job_url = reverse('job-status', args=[job.id])
 
             return Response(
                 {
-                    'message': f'Generated {len(dashboards)} dashboards',
-                    'count': len(dashboards)
+                    'message': f'Generating dashboards for {owner}/{repo}',
+                    'job_id': job.id,
+                    'status_url': job_url,
                 },
-                status=status.HTTP_201_CREATED
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': job_url}
             )
 
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class StreamedFailures(Progress):
+    """Collects per-contributor failures for a stream to emit between dashboards"""
+
+    def __init__(self):
+        self.failures = deque()
+
+    def failed(self, item: str, error: Exception) -> None:
+        self.failures.append({'username': item, 'error': str(error)})
+
+
+class AllContributorsDashboardStreamView(APIView):
+    """
+    GET /api/dashboard/{owner}/{repo}/generate-all/stream/
+    Generate dashboards for all contributors in a repository, streaming each
+    one as soon as it is built: NDJSON lines by default, or server-sent
+    events with ?output=sse. Every message is a `dashboard`, an `error`
+    for a contributor that failed, or a final `done` with the counts.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, owner, repo):
+        access_token = request.auth
+        if not access_token:
+            return github_not_connected()
+
+        sse = request.query_params.get('output') == 'sse'
+        service = DashboardService(access_token, priority=RequestPriority.BULK)
+        encode = self._event if sse else self._line
+        response = StreamingHttpResponse(
+            (encode(message) for message in self._messages(service, owner, repo)),
+            content_type='text/event-stream' if sse else 'application/x-ndjson',
+        )
+        # Keep proxies from buffering the stream
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def _messages(service: DashboardService, owner: str, repo: str) -> Iterator[Dict]:
+        progress = StreamedFailures()
+        count = failed = 0
+        try:
+            for dashboard in service.iter_contributors_dashboards(owner, repo, progress=progress):
+                while progress.failures:
+                    failed += 1
+                    yield {'type': 'error', **progress.failures.popleft()}
+                count += 1
+                yield {'type': 'dashboard', 'data': DashboardSerializer(dashboard).data}
+            while progress.failures:
+                failed += 1
+                yield {'type': 'error', **progress.failures.popleft()}
+        except Exception as e:
+            # Headers are already sent, so a failure can only be reported in-band
+            yield {'type': 'error', 'error': str(e)}
+        yield {'type': 'done', 'count': count, 'failed': failed}
+
+    @staticmethod
+    def _line(message: Dict) -> str:
+        return json.dumps(message, cls=DjangoJSONEncoder) + '\n'
+
+    @staticmethod
+    def _event(message: Dict) -> str:
+        data = {field: value for field, value in message.items() if field != 'type'}
+        return f"event: {message['type']}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class JobStatusView(APIView):
+    """
+    GET /api/jobs/{job_id}/
+    Status, progress, per-contributor failures and timings of a background job
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_job(job_id)
+        if job is None or (job['user_id'] != request.user.id and not request.user.is_staff):
+            return Response(
+                {'error': 'Job not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(
+            {field: value for field, value in job.items() if field != 'user_id'},
+            status=status.HTTP_200_OK
+        )
+
+
+class CacheMetricsView(APIView):
+    """
+    GET /api/metrics/cache/
+    Hit ratios of the GitHub response cache and the dashboard cache
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                'github_responses': get_response_cache().stats(),
+                'dashboards': dashboard_cache_stats(),
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class GitHubWebhookView(APIView):
+    """
+    POST /api/webhooks/github/
+    Apply push, issues and pull_request deliveries to stored dashboards.
+    Deliveries are authenticated by their signature, not a session.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        body = request.body
+        if not verify_signature(body, request.headers.get('X-Hub-Signature-256')):
+            return Response(
+                {'error': 'Invalid webhook signature'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        try:
+            # Webhooks may be configured to post the payload as a form field
+            if request.content_type == 'application/x-www-form-urlencoded':
+                payload = json.loads(QueryDict(body).get('payload', ''))
+            else:
+                payload = json.loads(body)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid webhook payload'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        event = request.headers.get('X-GitHub-Event', '')
+        if event == 'ping':
+            return Response({'status': 'pong'}, status=status.HTTP_200_OK)
+
+        try:
+            result = GitHubWebhookService().handle(event, request.headers.get('X-GitHub-Delivery'), payload)
+            return Response(result, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
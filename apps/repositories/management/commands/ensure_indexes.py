@@ -0,0 +1,33 @@
+# apps/repositories/management/commands/ensure_indexes.py
+from django.core.management.base import BaseCommand
+from core.repositories.base_repository import (
+    CommitRepository,
+    CommitStatsRepository,
+    ContributorRepository,
+    IssueRepository,
+    MetricSnapshotRepository,
+    PullRequestRepository,
+    RepositoryRepository,
+)
+
+# Mongo repositories whose declared indexes are managed by this command
+REPOSITORIES = [
+    ContributorRepository,
+    RepositoryRepository,
+    CommitStatsRepository,
+    MetricSnapshotRepository,
+    CommitRepository,
+    IssueRepository,
+    PullRequestRepository,
+]
+
+
+class Command(BaseCommand):
+    help = 'Create the MongoDB indexes declared by each repository'
+
+    def handle(self, *args, **options):
+        for repository_class in REPOSITORIES:
+            repository = repository_class()
+            names = repository.ensure_indexes()
+            self.stdout.write(f"{repository.collection.name}: {', '.join(names) or 'no indexes'}")
+        self.stdout.write(self.style.SUCCESS('Indexes are up to date'))
@@ -80,6 +80,31 @@ DATABASES = {
 MONGODB_SETTINGS = {
     'URI': config('MONGODB_URI', default='mongodb://localhost:27017'),
     'NAME': config('MONGODB_NAME', default='github_dashboard'),
+    'MAX_POOL_SIZE': config('MONGODB_MAX_POOL_SIZE', default=50, cast=int),
+    'MIN_POOL_SIZE': config('MONGODB_MIN_POOL_SIZE', default=0, cast=int),
+    'SERVER_SELECTION_TIMEOUT_MS': config('MONGODB_SERVER_SELECTION_TIMEOUT_MS', default=5000, cast=int),
+    'CONNECT_TIMEOUT_MS': config('MONGODB_CONNECT_TIMEOUT_MS', default=5000, cast=int),
+    'SOCKET_TIMEOUT_MS': config('MONGODB_SOCKET_TIMEOUT_MS', default=20000, cast=int),
+    'READ_PREFERENCE': config('MONGODB_READ_PREFERENCE', default='primary'),
+    'BULK_BATCH_SIZE': config('MONGODB_BULK_BATCH_SIZE', default=500, cast=int),
+}
+
+# Storage backend for application data: 'mongo', or 'memory' as an opt-in for tests and development.
+# Memory keeps everything per process, unbounded and unshared between workers
+REPOSITORY_BACKEND = config('REPOSITORY_BACKEND', default='mongo')
+
+# Caches
+# The shared cache holds state that gunicorn workers on one host must agree on
+# (e.g. GitHub rate-limit budgets). Point it at Redis or Memcached when
+# running more than one host.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('SHARED_CACHE_LOCATION', default=str(BASE_DIR / '.cache' / 'shared')),
+    },
 }
 
 # Password validation
@@ -109,7 +134,7 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
+        'apps.authentication.authentication.GitHubSessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -140,10 +165,79 @@ SOCIAL_AUTH_PIPELINE = (
     'social_core.pipeline.user.user_details',
 )
 
+# Seconds a resolved GitHub access token is reused in-process before the session is consulted again
+GITHUB_TOKEN_CACHE_TTL = config('GITHUB_TOKEN_CACHE_TTL', default=60, cast=int)
+# Cache alias keeping each user's GitHub grant version, which invalidates tokens held by every session and worker
+GITHUB_TOKEN_STORE = config('GITHUB_TOKEN_STORE', default='shared')
+
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = 'http://localhost:5173/dashboard'
 LOGOUT_REDIRECT_URL = 'http://localhost:5173/'
 
 # GitHub API Configuration
-GITHUB_API_BASE_URL = 'https://api.github.com'
-GITHUB_API_VERSION = '2022-11-28'
\ No newline at end of file
+GITHUB_API_BASE_URL = config('GITHUB_API_BASE_URL', default='https://api.github.com')
+GITHUB_API_VERSION = '2022-11-28'
+GITHUB_GRAPHQL_URL = config('GITHUB_GRAPHQL_URL', default=f'{GITHUB_API_BASE_URL}/graphql')
+# How contributor activity and user repositories are fetched: `rest`, or `graphql` for batched queries
+GITHUB_FETCH_MODE = config('GITHUB_FETCH_MODE', default='rest')
+GITHUB_API_TIMEOUT = config('GITHUB_API_TIMEOUT', default=10, cast=int)
+GITHUB_HTTP_POOL_SIZE = config('GITHUB_HTTP_POOL_SIZE', default=20, cast=int)
+# Connections per token of the async client; one event loop serves many requests over them
+GITHUB_ASYNC_POOL_SIZE = config('GITHUB_ASYNC_POOL_SIZE', default=100, cast=int)
+GITHUB_RESPONSE_CACHE_SIZE = config('GITHUB_RESPONSE_CACHE_SIZE', default=5000, cast=int)
+# Threads of the single process-wide pool that fetches listing pages: the cap is shared by
+# every listing and request in the process, not applied per listing. The async client has
+# no pool and keeps up to this many pages in flight per listing
+GITHUB_PAGE_WORKERS = config('GITHUB_PAGE_WORKERS', default=4, cast=int)
+# Statistics endpoints answer 202 until GitHub has computed them; clients are then told,
+# with a 202 of their own, to ask again after this many seconds
+GITHUB_STATS_RETRY_AFTER = config('GITHUB_STATS_RETRY_AFTER', default=10, cast=int)
+
+# GitHub webhooks: deliveries are signed with the secret and recorded by id for the retention below
+GITHUB_WEBHOOK_SECRET = config('GITHUB_WEBHOOK_SECRET', default='')
+GITHUB_WEBHOOK_STORE = 'shared'
+GITHUB_WEBHOOK_DELIVERY_TTL = config('GITHUB_WEBHOOK_DELIVERY_TTL', default=259200, cast=int)
+
+# GitHub rate limiting
+GITHUB_RATE_LIMIT_STORE = 'shared'
+# Requests kept back from bulk jobs so interactive dashboards stay responsive
+GITHUB_RATE_LIMIT_RESERVE = config('GITHUB_RATE_LIMIT_RESERVE', default=500, cast=int)
+GITHUB_RATE_LIMIT_BURST = config('GITHUB_RATE_LIMIT_BURST', default=10, cast=int)
+GITHUB_RATE_LIMIT_MAX_WAIT = config('GITHUB_RATE_LIMIT_MAX_WAIT', default=30, cast=int)
+GITHUB_RATE_LIMIT_RETRIES = config('GITHUB_RATE_LIMIT_RETRIES', default=2, cast=int)
+
+# Dashboard generation
+# Endpoint fetches run concurrently across all in-flight dashboards of a worker
+DASHBOARD_FETCH_WORKERS = config('DASHBOARD_FETCH_WORKERS', default=16, cast=int)
+# Concurrent single-commit requests for line stats missing from the commit stats store
+COMMIT_STATS_WORKERS = config('COMMIT_STATS_WORKERS', default=8, cast=int)
+
+# Dashboard cache
+# Dashboards younger than the TTL are served from cache; for STALE_TTL seconds
+# after that they are still served while being refreshed in the background
+DASHBOARD_CACHE_STORE = 'shared'
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=300, cast=int)
+DASHBOARD_CACHE_STALE_TTL = config('DASHBOARD_CACHE_STALE_TTL', default=3600, cast=int)
+DASHBOARD_CACHE_LOCAL_SIZE = config('DASHBOARD_CACHE_LOCAL_SIZE', default=512, cast=int)
+DASHBOARD_REFRESH_WORKERS = config('DASHBOARD_REFRESH_WORKERS', default=4, cast=int)
+# Coalesce identical dashboard builds across workers through a lock in the shared cache
+DASHBOARD_SINGLE_FLIGHT_SHARED = config('DASHBOARD_SINGLE_FLIGHT_SHARED', default=True, cast=bool)
+DASHBOARD_BUILD_LOCK_TIMEOUT = config('DASHBOARD_BUILD_LOCK_TIMEOUT', default=120, cast=int)
+# Freshness of dashboards of repositories that delivered a webhook within as many seconds
+DASHBOARD_WEBHOOK_TTL = config('DASHBOARD_WEBHOOK_TTL', default=86400, cast=int)
+# Incremental syncs refetch commits from this many seconds before the last one seen,
+# to pick up commits pushed after they were committed
+DASHBOARD_SYNC_COMMIT_OVERLAP = config('DASHBOARD_SYNC_COMMIT_OVERLAP', default=86400, cast=int)
+
+# Metric snapshots: days daily and weekly periods are kept before only coarser rollups remain; 0 keeps them
+METRIC_SNAPSHOT_DAY_RETENTION = config('METRIC_SNAPSHOT_DAY_RETENTION', default=90, cast=int)
+METRIC_SNAPSHOT_WEEK_RETENTION = config('METRIC_SNAPSHOT_WEEK_RETENTION', default=730, cast=int)
+METRIC_SNAPSHOT_MONTH_RETENTION = config('METRIC_SNAPSHOT_MONTH_RETENTION', default=0, cast=int)
+
+# Threads async views use for blocking repository and cache calls
+ASYNC_OFFLOAD_WORKERS = config('ASYNC_OFFLOAD_WORKERS', default=32, cast=int)
+
+# Background jobs: run on a per-process thread pool, status kept in the shared cache
+JOB_STORE = 'shared'
+JOB_WORKERS = config('JOB_WORKERS', default=2, cast=int)
+JOB_RESULT_TTL = config('JOB_RESULT_TTL', default=86400, cast=int)
@@ -5,6 +5,8 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('social_django.urls', namespace='social')),
+    # Async views; only worthwhile when served over ASGI (config/asgi.py)
+    path('api/async/', include('apps.dashboards.async_urls')),
     path('api/', include('apps.dashboards.urls')),
 ]
 
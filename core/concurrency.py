@@ -0,0 +1,42 @@
+# core/concurrency.py
+# Process-wide, fork-safe thread pools.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return the shared pool registered under `name`, creating it on first use.
+    Pools are keyed by purpose so that work submitted from inside one pool
+    never waits on a slot in that same pool.
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = executor
+        return executor
+
+
+def offload(fn: Callable) -> Callable[..., Awaitable]:
+    """
+    Wrap a blocking callable for async code: calls run on the shared
+    "offload" pool instead of blocking the event loop. Not for the ORM,
+    which needs asgiref's thread-sensitive executor.
+    """
+    return sync_to_async(fn, thread_sensitive=False, executor=get_executor('offload', settings.ASYNC_OFFLOAD_WORKERS))
+
+
+def _reset_executors() -> None:
+    # Worker threads do not survive fork; children build their own pools
+    _executors.clear()
+
+
+os.register_at_fork(after_in_child=_reset_executors)
@@ -0,0 +1,58 @@
+# core/database.py
+# Process-wide MongoDB client shared by every repository.
+import os
+import threading
+from typing import Optional
+
+from django.conf import settings
+from pymongo import MongoClient
+from pymongo.database import Database
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def get_mongo_client() -> MongoClient:
+    """
+    Return the shared MongoClient, creating it on first use.
+    MongoClient maintains its own connection pool, so one instance per
+    process serves every repository and request.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            options = settings.MONGODB_SETTINGS
+            _client = MongoClient(
+                options['URI'],
+                maxPoolSize=options['MAX_POOL_SIZE'],
+                minPoolSize=options['MIN_POOL_SIZE'],
+                serverSelectionTimeoutMS=options['SERVER_SELECTION_TIMEOUT_MS'],
+                connectTimeoutMS=options['CONNECT_TIMEOUT_MS'],
+                socketTimeoutMS=options['SOCKET_TIMEOUT_MS'],
+                readPreference=options['READ_PREFERENCE'],
+                # Defer connecting so a client created before fork is never used by a child
+                connect=False,
+            )
+        return _client
+
+
+def get_database() -> Database:
+    return get_mongo_client()[settings.MONGODB_SETTINGS['NAME']]
+
+
+def close_mongo_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _reset_after_fork() -> None:
+    # PyMongo clients are not fork-safe; each gunicorn worker builds its own
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
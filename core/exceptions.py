@@ -10,4 +10,19 @@ class RepositoryNotFoundException(Exception):
 
 class ContributorNotFoundException(Exception):
     """Contributor not found exception"""
-    pass
\ No newline at end of file
+    pass
+
+
+class GitHubRateLimitException(GitHubAPIException):
+    """GitHub rate limit exhausted or secondary rate limit hit"""
+    pass
+
+
+class GitHubStatsPendingException(GitHubAPIException):
+    """GitHub is still computing a repository's statistics"""
+    pass
+
+
+class ConcurrentUpdateException(Exception):
+    """Stored state kept changing while an update was being applied"""
+    pass
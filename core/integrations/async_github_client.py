@@ -0,0 +1,325 @@
+# core/integrations/async_github_client.py
+# asyncio GitHub REST and GraphQL API clients for the async views.
+import asyncio
+import json
+import os
+import threading
+import weakref
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiohttp
+from django.conf import settings
+from multidict import CIMultiDict
+from requests.utils import parse_header_links
+from yarl import URL
+
+from core.concurrency import offload
+from core.exceptions import GitHubAPIException
+from .github_client import (
+    EMPTY_REPOSITORY_STATUS,
+    PER_PAGE,
+    GitHubClient,
+    remaining_page_urls,
+    request_url,
+    token_scope,
+)
+from .graphql_client import (
+    CONTRIBUTOR_ACTIVITY_QUERY,
+    USER_REPOSITORIES_QUERY,
+    contributor_activity_walk,
+    graphql_data,
+)
+from .rate_limiter import RateLimitScheduler, RequestPriority
+from .response_cache import ResponseCache, get_response_cache
+
+_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, aiohttp.ClientSession]]' = \
+    weakref.WeakKeyDictionary()
+_sessions_lock = threading.Lock()
+
+
+def get_async_session(access_token: Optional[str]) -> aiohttp.ClientSession:
+    """
+    Return the pooled aiohttp session for an access token on the running loop.
+    Connections cannot move between event loops, so each loop keeps its own.
+    """
+    loop = asyncio.get_running_loop()
+    key = token_scope(access_token)
+    with _sessions_lock:
+        sessions = _sessions.setdefault(loop, {})
+        session = sessions.get(key)
+        if session is None or session.closed:
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": settings.GITHUB_API_VERSION,
+            }
+            if access_token:
+                headers["Authorization"] = f"Bearer {access_token}"
+            session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=settings.GITHUB_ASYNC_POOL_SIZE),
+                # No total timeout: requests beyond the pool wait for a connection instead of failing
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=settings.GITHUB_API_TIMEOUT,
+                    sock_read=settings.GITHUB_API_TIMEOUT,
+                ),
+            )
+            sessions[key] = session
+        return session
+
+
+async def close_async_sessions() -> None:
+    """Close the sessions of the running loop, e.g. on shutdown"""
+    with _sessions_lock:
+        sessions = _sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        await session.close()
+
+
+def _reset_sessions() -> None:
+    # Pooled sockets must not be shared between a parent and forked workers
+    _sessions.clear()
+
+
+os.register_at_fork(after_in_child=_reset_sessions)
+
+
+class AsyncResponse:
+    """
+    A GitHub response read in full.
+    Offers the parts of requests.Response that the shared response cache,
+    rate-limit scheduler and error mapping rely on.
+    """
+
+    def __init__(self, status_code: int, headers: CIMultiDict, content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    @property
+    def links(self) -> Dict[str, Dict]:
+        return {link.get("rel"): link for link in parse_header_links(self.headers.get("Link", ""))}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncGitHubClient:
+    """
+    asyncio counterpart of GitHubClient.
+    List endpoints are async generators following `Link` pagination; the
+    response cache and rate-limit scheduler are shared with the sync client,
+    with throttled requests waiting on the event loop.
+    """
+
+    def __init__(
+            self,
+            access_token: Optional[str] = None,
+            base_url: Optional[str] = None,
+            priority: str = RequestPriority.INTERACTIVE,
+    ):
+        self.access_token = access_token or ""
+        self.base_url = (base_url or settings.GITHUB_API_BASE_URL).rstrip("/")
+        self.priority = priority
+        self.cache_scope = token_scope(self.access_token)
+        self.response_cache = get_response_cache()
+        self.rate_limiter = RateLimitScheduler(self.cache_scope)
+
+    # User-level data
+    def get_user_repositories(self) -> AsyncIterator[Dict]:
+        return self._paginate("/user/repos", {"sort": "updated"})
+
+    async def get_user_activity(self, username: str) -> List[Dict]:
+        # Only the most recent page of events is ever displayed
+        return (await self._request(self._url(f"/users/{username}/events"), {"per_page": 30})).json()
+
+    # Repository-level data
+    async def get_repository(self, owner: str, repo: str) -> Dict:
+        return (await self._request(self._url(f"/repos/{owner}/{repo}"))).json()
+
+    def get_contributors(self, owner: str, repo: str) -> AsyncIterator[Dict]:
+        return self._paginate(f"/repos/{owner}/{repo}/contributors")
+
+    def get_commits(
+            self, owner: str, repo: str, author: Optional[str] = None, since: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        params = {}
+        if author:
+            params["author"] = author
+        if since:
+            params["since"] = since
+        return self._paginate(f"/repos/{owner}/{repo}/commits", params)
+
+    async def get_commit(self, owner: str, repo: str, sha: str) -> Dict:
+        return (await self._request(self._url(f"/repos/{owner}/{repo}/commits/{sha}"))).json()
+
+    async def get_issues(
+            self, owner: str, repo: str, creator: Optional[str] = None, since: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        params = {"state": "all"}
+        if creator:
+            params["creator"] = creator
+        if since:
+            params["since"] = since
+        # The issues endpoint also lists pull requests
+        async for issue in self._paginate(f"/repos/{owner}/{repo}/issues", params):
+            if "pull_request" not in issue:
+                yield issue
+
+    async def get_pull_requests(
+            self, owner: str, repo: str, creator: Optional[str] = None, since: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        params = {"state": "all"}
+        if since:
+            # See GitHubClient.get_pull_requests
+            params.update(sort="updated", direction="desc")
+        async for pr in self._paginate(f"/repos/{owner}/{repo}/pulls", params):
+            if since and (pr.get("updated_at") or "") < since:
+                return
+            if not creator or (pr.get("user") or {}).get("login") == creator:
+                yield pr
+
+    # HTTP helpers
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    async def _paginate(self, path: str, params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """Yield items page by page; see GitHubClient._paginate"""
+        url = self._url(path)
+        params = {**(params or {}), "per_page": PER_PAGE}
+        while url:
+            response = await self._send(url, params)
+            if response.status_code == EMPTY_REPOSITORY_STATUS:
+                return
+            GitHubClient._raise_for_status(response)
+            for item in response.json():
+                yield item
+            page_urls = remaining_page_urls(response.links)
+            if page_urls:
+                async for item in self._fetch_pages(page_urls):
+                    yield item
+                return
+            url = response.links.get("next", {}).get("url")
+            # The next link already carries the full query string
+            params = None
+
+    async def _fetch_pages(self, urls: List[str]) -> AsyncIterator[Dict]:
+        """Fetch pages with a bounded window of in-flight requests"""
+        pending = iter(urls)
+        in_flight = deque(
+            asyncio.ensure_future(self._request(url)) for url in islice(pending, settings.GITHUB_PAGE_WORKERS)
+        )
+        try:
+            while in_flight:
+                response = await in_flight.popleft()
+                next_url = next(pending, None)
+                if next_url:
+                    in_flight.append(asyncio.ensure_future(self._request(next_url)))
+                for item in response.json():
+                    yield item
+        finally:
+            # The consumer may stop early
+            for task in in_flight:
+                task.cancel()
+
+    async def _request(self, url: str, params: Optional[Dict] = None) -> AsyncResponse:
+        response = await self._send(url, params)
+        GitHubClient._raise_for_status(response)
+        return response
+
+    async def _send(self, url: str, params: Optional[Dict] = None) -> AsyncResponse:
+        """GET a URL, revalidating any cached copy with conditional headers"""
+        full_url = request_url(url, params)
+        cache_key = ResponseCache.key(self.cache_scope, full_url)
+        cached = self.response_cache.get(cache_key)
+        headers = cached.conditional_headers() if cached else None
+        session = get_async_session(self.access_token)
+        for _ in range(settings.GITHUB_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.aacquire(self.priority)
+            try:
+                # The query string is already encoded
+                async with session.get(URL(full_url, encoded=True), headers=headers) as raw:
+                    response = AsyncResponse(raw.status, CIMultiDict(raw.headers), await raw.read(), full_url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise GitHubAPIException(f"GitHub request failed: {e}") from e
+            # A rate-limited response blocks the scheduler until it is safe to retry
+            if not await offload(self.rate_limiter.update)(response):
+                break
+
+        if response.status_code == 304 and cached:
+            self.response_cache.record_not_modified()
+            # Rebuild a 200 response from the cache, keeping the fresh 304 headers
+            headers = CIMultiDict(cached.headers)
+            headers.update(response.headers)
+            return AsyncResponse(200, headers, cached.content, full_url)
+        if response.status_code == 200:
+            self.response_cache.store(cache_key, response)
+        return response
+
+
+class AsyncGitHubGraphQLClient:
+    """
+    asyncio counterpart of GitHubGraphQLClient, walking the same queries
+    over the pooled aiohttp session of the token.
+    """
+
+    def __init__(
+            self,
+            access_token: Optional[str] = None,
+            url: Optional[str] = None,
+            priority: str = RequestPriority.INTERACTIVE,
+    ):
+        self.access_token = access_token or ""
+        self.url = url or settings.GITHUB_GRAPHQL_URL
+        self.priority = priority
+        self.rate_limiter = RateLimitScheduler(f"{token_scope(self.access_token)}:graphql")
+
+    async def get_contributor_activity(
+            self,
+            owner: str,
+            repo: str,
+            login: str,
+            commits_since: Optional[str] = None,
+            issues_since: Optional[str] = None,
+            pulls_since: Optional[str] = None,
+    ) -> Dict[str, List[Dict]]:
+        """See GitHubGraphQLClient.get_contributor_activity"""
+        walk = contributor_activity_walk(owner, repo, login, commits_since, issues_since, pulls_since)
+        variables = next(walk)
+        try:
+            while True:
+                variables = walk.send(await self._query(CONTRIBUTOR_ACTIVITY_QUERY, variables))
+        except StopIteration as done:
+            return done.value
+
+    async def get_user_repositories(self) -> AsyncIterator[Dict]:
+        """See GitHubGraphQLClient.get_user_repositories"""
+        after = None
+        while True:
+            repositories = (await self._query(USER_REPOSITORIES_QUERY, {'after': after}))['viewer']['repositories']
+            for repository in repositories['nodes']:
+                yield repository
+            if not repositories['pageInfo']['hasNextPage']:
+                return
+            after = repositories['pageInfo']['endCursor']
+
+    async def _query(self, query: str, variables: Dict) -> Dict:
+        session = get_async_session(self.access_token)
+        for _ in range(settings.GITHUB_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.aacquire(self.priority)
+            try:
+                async with session.post(self.url, json={'query': query, 'variables': variables}) as raw:
+                    response = AsyncResponse(raw.status, CIMultiDict(raw.headers), await raw.read(), self.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise GitHubAPIException(f"GitHub request failed: {e}") from e
+            if not await offload(self.rate_limiter.update)(response):
+                break
+        GitHubClient._raise_for_status(response)
+        return graphql_data(response.json())
@@ -1,41 +1,311 @@
 # core/integrations/github_client.py
-# Minimal GitHub API client and adapter to satisfy imports and allow the server to run.
-# These are lightweight placeholders and can be expanded to call the real GitHub API.
-from typing import Dict, List, Optional
+# GitHub REST API client and adapter.
+import hashlib
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice, takewhile
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from core.concurrency import get_executor
+from core.exceptions import (
+    GitHubAPIException,
+    GitHubRateLimitException,
+    GitHubStatsPendingException,
+    RepositoryNotFoundException,
+)
+from .rate_limiter import RateLimitScheduler, RequestPriority, is_rate_limited
+from .response_cache import ResponseCache, get_response_cache
+
+PER_PAGE = 100
+
+# GitHub answers 409 on the commits endpoint of an empty repository
+EMPTY_REPOSITORY_STATUS = 409
+
+# Statistics endpoints answer 202 while GitHub computes them, and 204 when there is nothing to count
+STATS_COMPUTING_STATUS = 202
+NO_CONTENT_STATUS = 204
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def token_scope(access_token: Optional[str]) -> str:
+    """Stable, non-reversible key identifying an access token"""
+    return hashlib.sha256((access_token or "").encode()).hexdigest()
+
+
+def utc_timestamp(timestamp: Optional[str]) -> Optional[str]:
+    """An ISO-8601 timestamp with any UTC offset, in UTC as REST reports dates"""
+    if not timestamp:
+        return timestamp
+    return datetime.fromisoformat(timestamp).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def request_url(url: str, params: Optional[Dict] = None) -> str:
+    """
+    The URL a GET with `params` is sent to, encoded the way requests does.
+    Response cache keys are built from it by both clients, so they share entries.
+    """
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def get_session(access_token: Optional[str]) -> requests.Session:
+    """
+    Return the process-wide pooled session for an access token.
+    Every client built for the same token reuses the same keep-alive
+    connection pool instead of opening a new connection per call.
+    """
+    key = token_scope(access_token)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=settings.GITHUB_HTTP_POOL_SIZE,
+                pool_maxsize=settings.GITHUB_HTTP_POOL_SIZE,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": settings.GITHUB_API_VERSION,
+            })
+            if access_token:
+                session.headers["Authorization"] = f"Bearer {access_token}"
+            _sessions[key] = session
+        return session
+
+
+def _reset_sessions() -> None:
+    # Pooled sockets must not be shared between a parent and forked workers
+    _sessions.clear()
+
+
+os.register_at_fork(after_in_child=_reset_sessions)
+
+
+def remaining_page_urls(links: Dict) -> Optional[List[str]]:
+    """
+    Expand `rel="next"` .. `rel="last"` into every remaining page URL.
+    Returns None when the Link header does not use numbered pages.
+    """
+    next_url = links.get("next", {}).get("url")
+    last_url = links.get("last", {}).get("url")
+    if not next_url or not last_url:
+        return None
+    next_query = parse_qs(urlsplit(next_url).query)
+    last_query = parse_qs(urlsplit(last_url).query)
+    try:
+        first, last = int(next_query["page"][-1]), int(last_query["page"][-1])
+    except (KeyError, ValueError):
+        return None
+    parts = urlsplit(next_url)
+    urls = []
+    for page in range(first, last + 1):
+        query = urlencode({**next_query, "page": [str(page)]}, doseq=True)
+        urls.append(urlunsplit(parts._replace(query=query)))
+    return urls
 
 
 class GitHubClient:
     """
-    Minimal stub GitHub client. In a real implementation this would call GitHub's REST API
-    using the provided access token.
+    GitHub REST API client.
+    List endpoints return lazy generators that follow `Link: rel="next"`
+    pagination, so callers can stream large histories page by page.
     """
 
-    def __init__(self, access_token: Optional[str] = None):
+    def __init__(
+            self,
+            access_token: Optional[str] = None,
+            base_url: Optional[str] = None,
+            priority: str = RequestPriority.INTERACTIVE,
+    ):
         self.access_token = access_token or ""
+        self.base_url = (base_url or settings.GITHUB_API_BASE_URL).rstrip("/")
+        self.timeout = settings.GITHUB_API_TIMEOUT
+        self.priority = priority
+        self.session = get_session(self.access_token)
+        self.cache_scope = token_scope(self.access_token)
+        self.response_cache = get_response_cache()
+        self.rate_limiter = RateLimitScheduler(self.cache_scope)
 
     # User-level data
-    def get_user_repositories(self) -> List[Dict]:
-        # Return an empty list for now; structure matches expected adapter input
-        return []
+    def get_user_repositories(self) -> Iterator[Dict]:
+        return self._paginate("/user/repos", {"sort": "updated"})
 
     def get_user_activity(self, username: str) -> List[Dict]:
-        return []
+        # Only the most recent page of events is ever displayed
+        return self._request(self._url(f"/users/{username}/events"), {"per_page": 30}).json()
 
     # Repository-level data
     def get_repository(self, owner: str, repo: str) -> Dict:
-        return {"full_name": f"{owner}/{repo}", "name": repo, "owner": {"login": owner}}
+        return self._request(self._url(f"/repos/{owner}/{repo}")).json()
+
+    def get_contributors(self, owner: str, repo: str) -> Iterator[Dict]:
+        return self._paginate(f"/repos/{owner}/{repo}/contributors")
 
-    def get_contributors(self, owner: str, repo: str) -> List[Dict]:
-        return []
+    def get_commits(
+            self, owner: str, repo: str, author: Optional[str] = None, since: Optional[str] = None
+    ) -> Iterator[Dict]:
+        params = {}
+        if author:
+            params["author"] = author
+        if since:
+            params["since"] = since
+        return self._paginate(f"/repos/{owner}/{repo}/commits", params)
 
-    def get_commits(self, owner: str, repo: str, author: Optional[str] = None) -> List[Dict]:
-        return []
+    def get_commit(self, owner: str, repo: str, sha: str) -> Dict:
+        # Unlike the list endpoint, a single commit carries its `stats`
+        return self._request(self._url(f"/repos/{owner}/{repo}/commits/{sha}")).json()
 
-    def get_issues(self, owner: str, repo: str, creator: Optional[str] = None) -> List[Dict]:
-        return []
+    def get_issues(
+            self, owner: str, repo: str, creator: Optional[str] = None, since: Optional[str] = None
+    ) -> Iterator[Dict]:
+        params = {"state": "all"}
+        if creator:
+            params["creator"] = creator
+        if since:
+            # Issues updated at or after `since`
+            params["since"] = since
+        # The issues endpoint also lists pull requests
+        return (
+            issue for issue in self._paginate(f"/repos/{owner}/{repo}/issues", params)
+            if "pull_request" not in issue
+        )
 
-    def get_pull_requests(self, owner: str, repo: str, creator: Optional[str] = None) -> List[Dict]:
-        return []
+    def get_pull_requests(
+            self, owner: str, repo: str, creator: Optional[str] = None, since: Optional[str] = None
+    ) -> Iterator[Dict]:
+        params = {"state": "all"}
+        if since:
+            # The pulls endpoint has no `since` filter: walk the most recently
+            # updated first and stop at the first one older than `since`
+            params.update(sort="updated", direction="desc")
+        pulls = self._paginate(f"/repos/{owner}/{repo}/pulls", params)
+        if since:
+            pulls = takewhile(lambda pr: (pr.get("updated_at") or "") >= since, pulls)
+        # The pulls endpoint has no author filter, so it is applied client-side
+        if not creator:
+            return pulls
+        return (pr for pr in pulls if (pr.get("user") or {}).get("login") == creator)
+
+    # Repository statistics, precomputed by GitHub
+    def get_contributor_stats(self, owner: str, repo: str) -> List[Dict]:
+        # Weekly commits, additions and deletions of the top 100 contributors
+        return self._get_stats(f"/repos/{owner}/{repo}/stats/contributors")
+
+    def get_commit_activity(self, owner: str, repo: str) -> List[Dict]:
+        # Commits per day of each week of the last year
+        return self._get_stats(f"/repos/{owner}/{repo}/stats/commit_activity")
+
+    def get_code_frequency(self, owner: str, repo: str) -> List[List[int]]:
+        # Additions and deletions per week
+        return self._get_stats(f"/repos/{owner}/{repo}/stats/code_frequency")
+
+    # HTTP helpers
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def _get_stats(self, path: str) -> List:
+        """
+        GET a statistics endpoint. While GitHub computes it in the background
+        the endpoint answers 202, raised as GitHubStatsPendingException for
+        the caller to ask again later rather than wait here.
+        """
+        response = self._request(self._url(path))
+        if response.status_code == NO_CONTENT_STATUS:
+            return []
+        if response.status_code == STATS_COMPUTING_STATUS:
+            raise GitHubStatsPendingException(f"GitHub is still computing {path}")
+        return response.json()
+
+    def _paginate(self, path: str, params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Yield items page by page, following the Link header.
+        Once `rel="last"` reveals the page count, the remaining pages are
+        fetched concurrently and still yielded in order.
+        """
+        url = self._url(path)
+        params = {**(params or {}), "per_page": PER_PAGE}
+        while url:
+            response = self._send(url, params)
+            if response.status_code == EMPTY_REPOSITORY_STATUS:
+                return
+            self._raise_for_status(response)
+            yield from response.json()
+            page_urls = remaining_page_urls(response.links)
+            if page_urls:
+                yield from self._fetch_pages(page_urls)
+                return
+            url = response.links.get("next", {}).get("url")
+            # The next link already carries the full query string
+            params = None
+
+    def _fetch_pages(self, urls: List[str]) -> Iterator[Dict]:
+        """Fetch pages with a bounded window of in-flight requests"""
+        workers = settings.GITHUB_PAGE_WORKERS
+        executor = get_executor("github-pages", workers)
+        pending = iter(urls)
+        in_flight = deque(executor.submit(self._request, url) for url in islice(pending, workers))
+        while in_flight:
+            response = in_flight.popleft().result()
+            next_url = next(pending, None)
+            if next_url:
+                in_flight.append(executor.submit(self._request, next_url))
+            yield from response.json()
+
+    def _request(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        response = self._send(url, params)
+        self._raise_for_status(response)
+        return response
+
+    def _send(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET a URL, revalidating any cached copy with conditional headers"""
+        full_url = request_url(url, params)
+        cache_key = ResponseCache.key(self.cache_scope, full_url)
+        cached = self.response_cache.get(cache_key)
+        headers = cached.conditional_headers() if cached else None
+        for _ in range(settings.GITHUB_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire(self.priority)
+            try:
+                response = self.session.get(full_url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise GitHubAPIException(f"GitHub request failed: {e}") from e
+            # A rate-limited response blocks the scheduler until it is safe to retry
+            if not self.rate_limiter.update(response):
+                break
+
+        if response.status_code == 304 and cached:
+            self.response_cache.record_not_modified()
+            return cached.to_response(response)
+        if response.status_code == 200:
+            self.response_cache.store(cache_key, response)
+        return response
+
+    def cache_stats(self) -> Dict:
+        """Hit / miss / 304 counters of the shared response cache"""
+        return self.response_cache.stats()
+
+    @staticmethod
+    def _raise_for_status(response: requests.Response) -> None:
+        if response.status_code < 400:
+            return
+        try:
+            message = response.json().get("message", "")
+        except ValueError:
+            message = response.text
+        if response.status_code == 404 and "/repos/" in str(response.url):
+            raise RepositoryNotFoundException(message or str(response.url))
+        if is_rate_limited(response):
+            raise GitHubRateLimitException(f"GitHub rate limit exceeded: {message}")
+        raise GitHubAPIException(f"GitHub API error {response.status_code}: {message}")
 
 
 class GitHubAPIAdapter:
@@ -56,10 +326,14 @@ class GitHubAPIAdapter:
                 f"{repo.get('owner', {}).get('login','')}/{repo.get('name','')}" if repo.get("name") else None
             ),
             "owner": repo.get("owner", {}).get("login"),
+            "description": repo.get("description"),
+            "url": repo.get("html_url"),
+            "language": repo.get("language"),
             "private": repo.get("private", False),
             "stars": repo.get("stargazers_count", 0),
             "forks": repo.get("forks_count", 0),
             "open_issues": repo.get("open_issues_count", 0),
+            "pushed_at": repo.get("pushed_at"),
         }
 
     def adapt_contributor(self, contributor: Dict) -> Dict:
@@ -70,7 +344,7 @@ class GitHubAPIAdapter:
             "login": contributor.get("login"),
             "contributions": contributor.get("contributions", 0),
             "avatar_url": contributor.get("avatar_url"),
-            "html_url": contributor.get("html_url"),
+            "profile_url": contributor.get("html_url"),
         }
 
     def adapt_commit(self, commit: Dict) -> Dict:
@@ -79,9 +353,12 @@ class GitHubAPIAdapter:
         stats = commit.get("stats") or {}
         commit_info = commit.get("commit") or {}
         author_info = commit_info.get("author") or {}
+        committer_info = commit_info.get("committer") or {}
         return {
             "sha": commit.get("sha"),
             "message": commit_info.get("message"),
+            # What the commits `since` filter compares against
+            "committed_at": committer_info.get("date") or author_info.get("date"),
             "stats": {
                 "additions": stats.get("additions", 0),
                 "deletions": stats.get("deletions", 0),
@@ -89,6 +366,25 @@ class GitHubAPIAdapter:
             "author": {
                 "date": author_info.get("date"),
                 "name": author_info.get("name"),
+                # GitHub account the commit is attributed to, if any
+                "login": (commit.get("author") or {}).get("login"),
+            },
+        }
+
+    def adapt_push_commit(self, commit: Dict) -> Dict:
+        """A commit of a push webhook payload, which has no line changes"""
+        author_info = commit.get("author") or {}
+        # Pushes carry the committer's UTC offset; REST dates are in UTC
+        timestamp = utc_timestamp(commit.get("timestamp"))
+        return {
+            "sha": commit.get("id"),
+            "message": commit.get("message"),
+            "committed_at": timestamp,
+            "stats": {"additions": 0, "deletions": 0},
+            "author": {
+                "date": timestamp,
+                "name": author_info.get("name"),
+                "login": author_info.get("username"),
             },
         }
 
@@ -100,6 +396,7 @@ class GitHubAPIAdapter:
             "title": issue.get("title"),
             "state": issue.get("state", "open"),
             "created_at": issue.get("created_at"),
+            "updated_at": issue.get("updated_at"),
             "closed_at": issue.get("closed_at"),
             "user": (issue.get("user") or {}).get("login"),
         }
@@ -111,8 +408,47 @@ class GitHubAPIAdapter:
             "id": pr.get("id"),
             "title": pr.get("title"),
             "state": pr.get("state", "open"),
-            "merged": pr.get("merged", False),
+            "merged": pr.get("merged", bool(pr.get("merged_at"))),
             "created_at": pr.get("created_at"),
+            "updated_at": pr.get("updated_at"),
             "merged_at": pr.get("merged_at"),
             "user": (pr.get("user") or {}).get("login"),
         }
+
+    def adapt_contributor_stats(self, entry: Dict) -> Dict:
+        weeks = [
+            {
+                "week": self._week(week.get("w")),
+                "commits": week.get("c", 0),
+                "additions": week.get("a", 0),
+                "deletions": week.get("d", 0),
+            }
+            for week in entry.get("weeks") or []
+        ]
+        return {
+            "login": (entry.get("author") or {}).get("login"),
+            "commits": entry.get("total", 0),
+            "additions": sum(week["additions"] for week in weeks),
+            "deletions": sum(week["deletions"] for week in weeks),
+            "weeks": weeks,
+        }
+
+    def adapt_commit_activity(self, week: Dict) -> Dict:
+        return {
+            "week": self._week(week.get("week")),
+            "commits": week.get("total", 0),
+            # Sunday first, like GitHub's weeks
+            "days": week.get("days") or [],
+        }
+
+    def adapt_code_frequency(self, week: List[int]) -> Dict:
+        timestamp, additions, deletions = week
+        # GitHub reports deletions as negative numbers
+        return {"week": self._week(timestamp), "additions": additions, "deletions": abs(deletions)}
+
+    @staticmethod
+    def _week(timestamp: Optional[int]) -> Optional[str]:
+        """Start day of a statistics week, given as a Unix timestamp"""
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
@@ -0,0 +1,299 @@
+# core/integrations/graphql_client.py
+# GitHub GraphQL API client and adapter, for batched fetches.
+from typing import Dict, Generator, Iterator, List, Optional
+
+import requests
+from django.conf import settings
+
+from core.exceptions import GitHubAPIException, GitHubRateLimitException, RepositoryNotFoundException
+from .github_client import GitHubClient, get_session, token_scope, utc_timestamp
+from .rate_limiter import RateLimitScheduler, RequestPriority
+
+# Largest page GitHub allows on a connection
+PAGE_SIZE = 100
+
+PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+
+CONTRIBUTOR_ACTIVITY_QUERY = """
+query ContributorActivity(
+  $owner: String!, $repo: String!, $login: String!, $authorId: ID,
+  $commitsSince: GitTimestamp, $issuesSince: DateTime,
+  $commitsAfter: String, $issuesAfter: String, $pullsAfter: String, $pullsQuery: String!,
+  $withCommits: Boolean!, $withIssues: Boolean!, $withPulls: Boolean!
+) {
+  user(login: $login) { id }
+  search(type: ISSUE, first: %(page)d, after: $pullsAfter, query: $pullsQuery) @include(if: $withPulls) {
+    %(page_info)s
+    nodes {
+      ... on PullRequest { databaseId title state merged createdAt updatedAt mergedAt author { login } }
+    }
+  }
+  repository(owner: $owner, name: $repo) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: %(page)d, after: $commitsAfter, author: {id: $authorId}, since: $commitsSince)
+              @include(if: $withCommits) {
+            %(page_info)s
+            nodes {
+              oid message committedDate additions deletions
+              author { name date user { login } }
+            }
+          }
+        }
+      }
+    }
+    issues(first: %(page)d, after: $issuesAfter, filterBy: {createdBy: $login, since: $issuesSince})
+        @include(if: $withIssues) {
+      %(page_info)s
+      nodes { databaseId title state createdAt updatedAt closedAt author { login } }
+    }
+  }
+}
+""" % {'page': PAGE_SIZE, 'page_info': PAGE_INFO}
+
+USER_REPOSITORIES_QUERY = """
+query UserRepositories($after: String) {
+  viewer {
+    repositories(first: %(page)d, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      %(page_info)s
+      nodes {
+        databaseId name nameWithOwner description url isPrivate stargazerCount forkCount pushedAt
+        owner { login }
+        primaryLanguage { name }
+        issues(states: OPEN) { totalCount }
+      }
+    }
+  }
+}
+""" % {'page': PAGE_SIZE, 'page_info': PAGE_INFO}
+
+
+class GitHubGraphQLClient:
+    """
+    GitHub GraphQL API client.
+    Fetches what takes several REST paginations in a few batched queries:
+    a contributor's commits, issues and pull requests advance their own
+    cursors within the same query until each connection is exhausted.
+    GraphQL has its own rate-limit budget, scheduled apart from REST's.
+    """
+
+    def __init__(
+            self,
+            access_token: Optional[str] = None,
+            url: Optional[str] = None,
+            priority: str = RequestPriority.INTERACTIVE,
+    ):
+        self.access_token = access_token or ""
+        self.url = url or settings.GITHUB_GRAPHQL_URL
+        self.timeout = settings.GITHUB_API_TIMEOUT
+        self.priority = priority
+        self.session = get_session(self.access_token)
+        self.rate_limiter = RateLimitScheduler(f"{token_scope(self.access_token)}:graphql")
+
+    def get_contributor_activity(
+            self,
+            owner: str,
+            repo: str,
+            login: str,
+            commits_since: Optional[str] = None,
+            issues_since: Optional[str] = None,
+            pulls_since: Optional[str] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        A contributor's commits, issues and pull requests in a repository,
+        as GraphQL nodes under `commits`, `issues` and `pull_requests`.
+        Pull requests have no author filter on the repository, so they are
+        searched for by author and updated date instead; like any search,
+        at most the first 1,000 are reachable.
+        """
+        walk = contributor_activity_walk(owner, repo, login, commits_since, issues_since, pulls_since)
+        variables = next(walk)
+        try:
+            while True:
+                variables = walk.send(self._query(CONTRIBUTOR_ACTIVITY_QUERY, variables))
+        except StopIteration as done:
+            return done.value
+
+    def get_user_repositories(self) -> Iterator[Dict]:
+        """The viewer's repositories as GraphQL nodes, most recently updated first"""
+        after = None
+        while True:
+            repositories = self._query(USER_REPOSITORIES_QUERY, {'after': after})['viewer']['repositories']
+            yield from repositories['nodes']
+            if not repositories['pageInfo']['hasNextPage']:
+                return
+            after = repositories['pageInfo']['endCursor']
+
+    def _query(self, query: str, variables: Dict) -> Dict:
+        for _ in range(settings.GITHUB_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire(self.priority)
+            try:
+                response = self.session.post(
+                    self.url, json={'query': query, 'variables': variables}, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                raise GitHubAPIException(f"GitHub request failed: {e}") from e
+            if not self.rate_limiter.update(response):
+                break
+        GitHubClient._raise_for_status(response)
+        return graphql_data(response.json())
+
+
+def _login(actor: Optional[Dict]) -> Optional[str]:
+    # Deleted accounts come back as a null actor
+    return (actor or {}).get('login')
+
+
+def graphql_data(body: Dict) -> Dict:
+    """The data of a GraphQL response body, or the exception its errors map to"""
+    errors = body.get('errors') or []
+    if any(error.get('type') == 'RATE_LIMITED' for error in errors):
+        raise GitHubRateLimitException(f"GitHub GraphQL rate limit exceeded: {errors[0].get('message')}")
+    if any(error.get('type') == 'NOT_FOUND' for error in errors):
+        raise RepositoryNotFoundException(errors[0].get('message'))
+    if errors:
+        raise GitHubAPIException(f"GitHub GraphQL error: {'; '.join(e.get('message', '') for e in errors)}")
+    return body['data']
+
+
+def _advance(variables: Dict, name: str, connection: Optional[Dict], nodes: List[Dict]) -> None:
+    """Collect a connection's page and move its cursor, or stop querying it"""
+    if not connection:
+        variables[f'with{name}'] = False
+        return
+    nodes.extend(connection['nodes'])
+    page_info = connection['pageInfo']
+    if page_info.get('hasNextPage'):
+        variables[f'{name[0].lower()}{name[1:]}After'] = page_info['endCursor']
+    else:
+        variables[f'with{name}'] = False
+
+
+def pull_request_search(owner: str, repo: str, login: str, since: Optional[str] = None) -> str:
+    """Search query of a contributor's pull requests in a repository, updated from `since` on"""
+    query = f"repo:{owner}/{repo} is:pr author:{login}"
+    return f"{query} updated:>={since}" if since else query
+
+
+def contributor_activity_walk(
+        owner: str,
+        repo: str,
+        login: str,
+        commits_since: Optional[str] = None,
+        issues_since: Optional[str] = None,
+        pulls_since: Optional[str] = None,
+) -> Generator[Dict, Dict, Dict[str, List[Dict]]]:
+    """
+    The queries of GitHubGraphQLClient.get_contributor_activity, for both
+    clients: yields the variables of each query, is sent back its data, and
+    returns the activity once every connection is exhausted.
+    """
+    activity = {'commits': [], 'issues': [], 'pull_requests': []}
+    variables = {
+        'owner': owner, 'repo': repo, 'login': login, 'authorId': None,
+        'commitsSince': commits_since, 'issuesSince': issues_since,
+        'commitsAfter': None, 'issuesAfter': None, 'pullsAfter': None,
+        'pullsQuery': pull_request_search(owner, repo, login, pulls_since),
+        # Commit history is filtered by user id, known after the first query
+        'withCommits': False, 'withIssues': True, 'withPulls': True,
+    }
+    first = True
+    while first or variables['withCommits'] or variables['withIssues'] or variables['withPulls']:
+        data = yield variables
+        repository = data.get('repository')
+        if repository is None:
+            raise RepositoryNotFoundException(f"{owner}/{repo}")
+
+        if variables['withCommits']:
+            history = ((repository.get('defaultBranchRef') or {}).get('target') or {}).get('history')
+            _advance(variables, 'Commits', history, activity['commits'])
+        if variables['withIssues']:
+            _advance(variables, 'Issues', repository.get('issues'), activity['issues'])
+        if variables['withPulls']:
+            _advance(variables, 'Pulls', data.get('search'), activity['pull_requests'])
+
+        if first:
+            first = False
+            user = data.get('user')
+            # A login without an account, or a repository without a branch, has no history to walk
+            if user and repository.get('defaultBranchRef'):
+                variables.update(authorId=user['id'], withCommits=True)
+    return activity
+
+
+class GitHubGraphQLAdapter:
+    """
+    Adapts GraphQL nodes to the shapes GitHubAPIAdapter produces from REST
+    responses, so either fetch mode feeds the same aggregation. Ids are
+    `databaseId`s, the same numbers REST reports as `id`.
+    """
+
+    def adapt_repository(self, repo: Dict) -> Dict:
+        if not repo:
+            return {}
+        return {
+            "id": repo.get("databaseId"),
+            "name": repo.get("name"),
+            "full_name": repo.get("nameWithOwner"),
+            "owner": _login(repo.get("owner")),
+            "description": repo.get("description"),
+            "url": repo.get("url"),
+            "language": (repo.get("primaryLanguage") or {}).get("name"),
+            "private": repo.get("isPrivate", False),
+            "stars": repo.get("stargazerCount", 0),
+            "forks": repo.get("forkCount", 0),
+            "open_issues": (repo.get("issues") or {}).get("totalCount", 0),
+            "pushed_at": repo.get("pushedAt"),
+        }
+
+    def adapt_commit(self, commit: Dict) -> Dict:
+        if not commit:
+            return {"stats": {"additions": 0, "deletions": 0}, "author": {"date": None}}
+        author = commit.get("author") or {}
+        # GraphQL dates keep the committer's UTC offset; REST dates are in UTC
+        date = utc_timestamp(author.get("date"))
+        return {
+            "sha": commit.get("oid"),
+            "message": commit.get("message"),
+            "committed_at": utc_timestamp(commit.get("committedDate")) or date,
+            # GraphQL reports line changes with the commit, unlike the REST list
+            "stats": {
+                "additions": commit.get("additions", 0),
+                "deletions": commit.get("deletions", 0),
+            },
+            "author": {
+                "date": date,
+                "name": author.get("name"),
+                "login": _login(author.get("user")),
+            },
+        }
+
+    def adapt_issue(self, issue: Dict) -> Dict:
+        if not issue:
+            return {"state": "open"}
+        return {
+            "id": issue.get("databaseId"),
+            "title": issue.get("title"),
+            "state": (issue.get("state") or "OPEN").lower(),
+            "created_at": issue.get("createdAt"),
+            "updated_at": issue.get("updatedAt"),
+            "closed_at": issue.get("closedAt"),
+            "user": _login(issue.get("author")),
+        }
+
+    def adapt_pull_request(self, pr: Dict) -> Dict:
+        if not pr:
+            return {"state": "open", "merged": False}
+        # GraphQL has a MERGED state where REST reports a closed, merged pull request
+        state = (pr.get("state") or "OPEN").lower()
+        return {
+            "id": pr.get("databaseId"),
+            "title": pr.get("title"),
+            "state": "closed" if state == "merged" else state,
+            "merged": pr.get("merged", state == "merged"),
+            "created_at": pr.get("createdAt"),
+            "updated_at": pr.get("updatedAt"),
+            "merged_at": pr.get("mergedAt"),
+            "user": _login(pr.get("author")),
+        }
@@ -0,0 +1,174 @@
+# core/integrations/rate_limiter.py
+# Rate-limit aware scheduling of GitHub requests.
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+
+from core.concurrency import offload
+from core.exceptions import GitHubRateLimitException
+
+
+class RequestPriority:
+    """Priority classes competing for the same token's budget"""
+    INTERACTIVE = 'interactive'
+    BULK = 'bulk'
+
+
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+SECONDARY_LIMIT_BACKOFF = 60
+
+# Serialises read-modify-write of budget state between threads of a worker
+_state_lock = threading.Lock()
+
+
+class RateLimitScheduler:
+    """
+    Token-bucket scheduler for one access token.
+
+    The budget reported by `X-RateLimit-Remaining` / `X-RateLimit-Reset` is
+    kept in the shared cache so every worker on the host sees it.
+    Interactive requests may spend the whole budget; bulk requests leave
+    `GITHUB_RATE_LIMIT_RESERVE` untouched and are paced by a token bucket
+    that spreads what is left evenly until the window resets.
+    """
+
+    def __init__(self, scope: str):
+        self.key = f"github:ratelimit:{scope}"
+        self.store = caches[settings.GITHUB_RATE_LIMIT_STORE]
+        self.reserve = settings.GITHUB_RATE_LIMIT_RESERVE
+        self.burst = settings.GITHUB_RATE_LIMIT_BURST
+        self.max_wait = settings.GITHUB_RATE_LIMIT_MAX_WAIT
+        self.clock = time.time
+        self.sleep = time.sleep
+        self.asleep = asyncio.sleep
+
+    def state(self) -> Dict:
+        return self.store.get(self.key) or {
+            'limit': None,
+            'remaining': None,
+            'reset': 0,
+            'blocked_until': 0,
+            'bulk_tokens': self.burst,
+            'bulk_updated': self.clock(),
+        }
+
+    def acquire(self, priority: str = RequestPriority.INTERACTIVE) -> None:
+        """Block until a request of the given priority may be sent"""
+        waited = 0.0
+        while True:
+            delay = self._reserve(priority, waited)
+            if delay <= 0:
+                return
+            self.sleep(delay)
+            waited += delay
+
+    async def aacquire(self, priority: str = RequestPriority.INTERACTIVE) -> None:
+        """`acquire` for async code: waits on the event loop, so a throttled request holds no thread"""
+        waited = 0.0
+        while True:
+            delay = await offload(self._reserve)(priority, waited)
+            if delay <= 0:
+                return
+            await self.asleep(delay)
+            waited += delay
+
+    def _reserve(self, priority: str, waited: float) -> float:
+        """Take the budget of one request and return 0, or the seconds to wait before trying again"""
+        with _state_lock:
+            state = self.state()
+            delay = self._delay(state, priority, self.clock())
+            if delay <= 0:
+                if state['remaining'] is not None:
+                    state['remaining'] -= 1
+                self._save(state)
+                return 0
+        if waited + delay > self.max_wait:
+            raise GitHubRateLimitException(
+                f"GitHub rate limit budget exhausted, retry in {int(delay) + 1}s"
+            )
+        return delay
+
+    def available(self, priority: str = RequestPriority.INTERACTIVE) -> Optional[int]:
+        """
+        Requests of the given priority that may still be sent before the
+        budget resets; None while the budget is unknown.
+        """
+        state = self.state()
+        now = self.clock()
+        if state['blocked_until'] > now:
+            return 0
+        if state['remaining'] is None or state['reset'] <= now:
+            return None
+        floor = 0 if priority == RequestPriority.INTERACTIVE else self.reserve
+        return max(0, state['remaining'] - floor)
+
+    def update(self, response: requests.Response) -> bool:
+        """
+        Record the budget reported by a response.
+        Returns True when the response was rejected by a rate limit and the
+        request should be retried once the backoff has elapsed.
+        """
+        headers = response.headers
+        now = self.clock()
+        with _state_lock:
+            state = self.state()
+            if 'X-RateLimit-Remaining' in headers:
+                state['remaining'] = int(headers['X-RateLimit-Remaining'])
+                state['reset'] = int(headers.get('X-RateLimit-Reset', 0))
+                state['limit'] = int(headers.get('X-RateLimit-Limit', 0)) or state['limit']
+            limited = is_rate_limited(response)
+            if limited:
+                if 'Retry-After' in headers:
+                    state['blocked_until'] = now + int(headers['Retry-After'])
+                elif state['remaining'] == 0:
+                    state['blocked_until'] = state['reset']
+                else:
+                    state['blocked_until'] = now + SECONDARY_LIMIT_BACKOFF
+            self._save(state)
+        return limited
+
+    def _delay(self, state: Dict, priority: str, now: float) -> float:
+        """Seconds to wait before sending; consumes a bulk token when zero"""
+        if state['blocked_until'] > now:
+            return state['blocked_until'] - now
+        if state['remaining'] is None or state['reset'] <= now:
+            # Unknown or freshly reset budget
+            return 0
+        floor = 0 if priority == RequestPriority.INTERACTIVE else self.reserve
+        spendable = state['remaining'] - floor
+        if spendable <= 0:
+            return state['reset'] - now
+        if priority == RequestPriority.INTERACTIVE:
+            return 0
+
+        # Refill the bulk bucket so the spendable budget lasts until reset
+        rate = spendable / (state['reset'] - now)
+        tokens = min(self.burst, state['bulk_tokens'] + (now - state['bulk_updated']) * rate)
+        state['bulk_updated'] = now
+        if tokens >= 1:
+            state['bulk_tokens'] = tokens - 1
+            return 0
+        state['bulk_tokens'] = tokens
+        return (1 - tokens) / rate
+
+    def _save(self, state: Dict) -> None:
+        timeout = max(state['reset'], state['blocked_until']) - self.clock() + 60
+        self.store.set(self.key, state, timeout=max(int(timeout), 60))
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """Tell rate-limit rejections apart from ordinary permission errors"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (
+        response.headers.get('X-RateLimit-Remaining') == '0'
+        or 'Retry-After' in response.headers
+    )
+
@@ -0,0 +1,125 @@
+# core/integrations/response_cache.py
+# Conditional request cache for GitHub REST responses.
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from django.conf import settings
+from requests.structures import CaseInsensitiveDict
+
+# Response headers needed to replay a cached page
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class CachedResponse:
+    """Body and validators of a single cached page"""
+
+    __slots__ = ('content', 'headers')
+
+    def __init__(self, content: bytes, headers: Dict[str, str]):
+        self.content = content
+        self.headers = headers
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, not_modified: requests.Response) -> requests.Response:
+        """Rebuild a 200 response from the cache, keeping the fresh 304 headers"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers.update(not_modified.headers)
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.encoding = 'utf-8'
+        return response
+
+
+class ResponseCache:
+    """
+    Bounded LRU of GitHub pages keyed by token scope and full URL.
+    The client sends the stored ETag / Last-Modified validators and serves
+    the stored body when GitHub answers `304 Not Modified`, which does not
+    count against the rate limit.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(scope: str, url: str) -> str:
+        return f"{scope}:{url}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Remember a 200 response if it carries a validator"""
+        if 'ETag' not in response.headers and 'Last-Modified' not in response.headers:
+            return
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        with self._lock:
+            self._entries[key] = CachedResponse(response.content, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_ratio': (self.hits / lookups) if lookups else 0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.not_modified = 0
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(settings.GITHUB_RESPONSE_CACHE_SIZE)
+        return _response_cache
@@ -0,0 +1,165 @@
+# core/jobs.py
+# Background jobs on a local thread pool, with their status in the shared cache.
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from django.conf import settings
+from django.core.cache import caches
+from core.concurrency import get_executor
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+
+class Progress:
+    """Progress reporting interface for long-running work; does nothing by default"""
+
+    def start(self, total: int) -> None:
+        pass
+
+    def succeeded(self, item: str) -> None:
+        pass
+
+    def failed(self, item: str, error: Exception) -> None:
+        pass
+
+    def record_timing(self, phase: str, seconds: float) -> None:
+        pass
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_timing(phase, time.monotonic() - started)
+
+
+class Job(Progress):
+    """
+    A unit of background work and its status record.
+    The record lives in the JOB_STORE cache, so any worker can report on a
+    job whichever worker runs it.
+    """
+
+    def __init__(self, record: Dict):
+        self.record = record
+        self._lock = threading.Lock()
+
+    @property
+    def id(self) -> str:
+        return self.record['id']
+
+    def start(self, total: int) -> None:
+        self._update(lambda r: r['progress'].update(total=total))
+
+    def succeeded(self, item: str) -> None:
+        self._update(lambda r: r['progress'].update(completed=r['progress']['completed'] + 1))
+
+    def failed(self, item: str, error: Exception) -> None:
+        def update(record: Dict) -> None:
+            record['progress']['failed'] += 1
+            record['failures'].append({'item': item, 'error': str(error)})
+
+        self._update(update)
+
+    def record_timing(self, phase: str, seconds: float) -> None:
+        self._update(lambda r: r['timings'].update({phase: round(seconds, 3)}))
+
+    def run(self, fn: Callable[['Job'], Any]) -> None:
+        started = time.monotonic()
+        self._update(lambda r: r.update(
+            status=JobStatus.RUNNING,
+            started_at=datetime.utcnow().isoformat(),
+        ), queued=True)
+        try:
+            result = fn(self)
+        except Exception as e:
+            logger.exception("Job %s failed", self.id)
+            self._update(lambda r: r.update(status=JobStatus.FAILED, error=str(e)))
+        else:
+            self._update(lambda r: r.update(status=JobStatus.SUCCEEDED, result=result))
+        finally:
+            self._update(lambda r: r.update(finished_at=datetime.utcnow().isoformat()))
+            self.record_timing('running', time.monotonic() - started)
+
+    def save(self) -> None:
+        _store().set(_job_key(self.id), self.record, timeout=settings.JOB_RESULT_TTL)
+
+    def _update(self, change: Callable[[Dict], None], queued: bool = False) -> None:
+        with self._lock:
+            change(self.record)
+            if queued:
+                created = datetime.fromisoformat(self.record['created_at'])
+                self.record['timings']['queued'] = round((datetime.utcnow() - created).total_seconds(), 3)
+            self.save()
+
+
+_futures: Dict[str, Future] = {}
+_futures_lock = threading.Lock()
+
+
+def _store():
+    return caches[settings.JOB_STORE]
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def enqueue(kind: str, fn: Callable[[Job], Any], params: Optional[Dict] = None,
+            user_id: Optional[int] = None) -> Job:
+    """
+    Queue `fn(job)` on the job pool and return the job straight away.
+    At most JOB_WORKERS jobs run at once per process; the rest wait queued.
+    Whatever `fn` returns is stored as the job's result.
+    """
+    job = Job({
+        'id': uuid.uuid4().hex,
+        'kind': kind,
+        'params': params or {},
+        'user_id': user_id,
+        'status': JobStatus.QUEUED,
+        'created_at': datetime.utcnow().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+        'progress': {'total': None, 'completed': 0, 'failed': 0},
+        'failures': [],
+        'timings': {},
+        'result': None,
+        'error': None,
+    })
+    job.save()
+
+    executor = get_executor('jobs', settings.JOB_WORKERS)
+    with _futures_lock:
+        future = executor.submit(job.run, fn)
+        _futures[job.id] = future
+    future.add_done_callback(lambda _: _forget(job.id))
+    return job
+
+
+def _forget(job_id: str) -> None:
+    with _futures_lock:
+        _futures.pop(job_id, None)
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    return _store().get(_job_key(job_id))
+
+
+def pending_jobs() -> List[Future]:
+    """Futures of the jobs this process has not finished yet"""
+    with _futures_lock:
+        return list(_futures.values())
@@ -0,0 +1,33 @@
+# core/repositories/__init__.py
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Repository classes per storage backend, selected by settings.REPOSITORY_BACKEND
+REPOSITORY_BACKENDS = {
+    'mongo': {
+        'contributors': 'core.repositories.base_repository.ContributorRepository',
+        'repositories': 'core.repositories.base_repository.RepositoryRepository',
+        'commit_stats': 'core.repositories.base_repository.CommitStatsRepository',
+        'metric_snapshots': 'core.repositories.base_repository.MetricSnapshotRepository',
+        'activity': 'core.repositories.base_repository.ActivityRepository',
+        'commits': 'core.repositories.base_repository.CommitRepository',
+        'issues': 'core.repositories.base_repository.IssueRepository',
+        'pull_requests': 'core.repositories.base_repository.PullRequestRepository',
+    },
+    'memory': {
+        'contributors': 'core.repositories.contributor_repository.ContributorRepository',
+        'repositories': 'core.repositories.repo_repository.RepositoryRepository',
+        'commit_stats': 'core.repositories.commit_stats_repository.CommitStatsRepository',
+        'metric_snapshots': 'core.repositories.metric_snapshot_repository.MetricSnapshotRepository',
+        'activity': 'core.repositories.activity_repository.ActivityRepository',
+        'commits': 'core.repositories.activity_repository.CommitRepository',
+        'issues': 'core.repositories.activity_repository.IssueRepository',
+        'pull_requests': 'core.repositories.activity_repository.PullRequestRepository',
+    },
+}
+
+
+def get_repository(name: str, backend: str = None):
+    """Instantiate the repository for a collection from the configured backend"""
+    backend = backend or settings.REPOSITORY_BACKEND
+    return import_string(REPOSITORY_BACKENDS[backend][name])()
@@ -0,0 +1,103 @@
+# core/repositories/activity_repository.py
+# In-memory raw activity store, the development and test stand-in for MongoDB.
+from datetime import datetime
+from typing import Dict, List, Optional
+from .base_repository import daily_totals
+from .memory_repository import InMemoryRepository
+
+
+class RawActivityRepository(InMemoryRepository):
+    """
+    Raw Activity Repository - Adapted commits, issues or pull requests in memory
+    One document per item and repository, upserted by its SHA or id, so
+    refetching an item replaces it. Documents carry `repository`, `author`
+    (login) and `date` (a UTC datetime) for range reads of a contributor's
+    activity. Nothing expires: activity is kept for any later computation.
+    """
+
+    key_fields = ('repository', 'id')
+    indexed_fields = ('repository',)
+
+    def get_by_author(
+            self,
+            repository: str,
+            author: str,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """A contributor's items dated from `start` until before `end`, oldest first"""
+        documents = [
+            d for d in self.get_all({'repository': repository, 'author': author})
+            if (start is None or (d.get('date') and d['date'] >= start))
+            and (end is None or (d.get('date') and d['date'] < end))
+        ]
+        return sorted(documents, key=lambda d: (d.get('date') is not None, d.get('date') or datetime.min))
+
+    def bulk_upsert(self, documents: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """Bulk upsert items keyed by (repository, SHA or id)"""
+        id_field = self.key_fields[1]
+        return self._bulk_upsert(
+            document for document in documents
+            if document.get('repository') and document.get(id_field) is not None
+        )
+
+
+class CommitRepository(RawActivityRepository):
+    """Commit Repository - Adapted commits in memory, by SHA"""
+
+    key_fields = ('repository', 'sha')
+
+    def __init__(self):
+        super().__init__('commits')
+
+
+class IssueRepository(RawActivityRepository):
+    """Issue Repository - Adapted issues in memory, by id"""
+
+    def __init__(self):
+        super().__init__('issues')
+
+
+class PullRequestRepository(RawActivityRepository):
+    """Pull Request Repository - Adapted pull requests in memory, by id"""
+
+    def __init__(self):
+        super().__init__('pull_requests')
+
+
+class ActivityRepository:
+    """
+    Activity Repository - Contributor metrics computed from stored raw activity
+    Read-only, so not a repository of its own collection: items are written
+    through the commit, issue and pull request repositories. Reads their
+    collections, whose documents carry `repository`, `author` (lowercased login) and
+    `date` (a UTC datetime) besides their own fields: `additions` and
+    `deletions` for commits, `state` for issues, `state` and `merged` for
+    pull requests.
+    """
+
+    def __init__(self):
+        self.commits = CommitRepository()
+        self.issues = IssueRepository()
+        self.pull_requests = PullRequestRepository()
+
+    def clear(self) -> None:
+        """Drop the stored activity of every collection read"""
+        for collection in (self.commits, self.issues, self.pull_requests):
+            collection.clear()
+
+    def aggregate_daily_activity(self, repository: str, author: str) -> Dict[Optional[str], Dict[str, int]]:
+        """A contributor's ACTIVITY_TOTALS per day they were active; undated items are under None"""
+        match = {'repository': repository, 'author': author}
+        return daily_totals([
+            *({'day': _day(c), 'kind': 'commit', 'count': 1, 'additions': c.get('additions', 0),
+               'deletions': c.get('deletions', 0)} for c in self.commits.get_all(match)),
+            *({'day': _day(i), 'kind': 'issue', 'status': i.get('state'), 'count': 1}
+              for i in self.issues.get_all(match)),
+            *({'day': _day(pr), 'kind': 'pull_request', 'status': 'merged' if pr.get('merged') else pr.get('state'),
+               'count': 1} for pr in self.pull_requests.get_all(match)),
+        ])
+
+
+def _day(document: Dict) -> Optional[str]:
+    return document['date'].strftime('%Y-%m-%d') if document.get('date') else None
@@ -1,8 +1,13 @@
 # core/repositories/base_repository.py
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
-from pymongo import MongoClient
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+from bson import ObjectId
 from django.conf import settings
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+from core.database import get_database
 
 
 class BaseRepository(ABC):
@@ -11,9 +16,13 @@ class BaseRepository(ABC):
     Provides interface for data access operations
     """
 
+    # Indexes backing this repository's lookups, applied by `manage.py ensure_indexes`
+    indexes: List[IndexModel] = []
+
     def __init__(self, collection_name: str):
-        self.client = MongoClient(settings.DATABASES['default']['CLIENT']['host'])
-        self.db = self.client[settings.DATABASES['default']['NAME']]
+        # Every repository shares the process-wide client and its pool
+        self.db = get_database()
+        self.client = self.db.client
         self.collection = self.db[collection_name]
 
     @abstractmethod
@@ -22,7 +31,14 @@ class BaseRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self, filters: Optional[Dict] = None) -> List[Dict]:
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
         """Retrieve all documents matching filters"""
         pass
 
@@ -41,11 +57,71 @@ class BaseRepository(ABC):
         """Delete a document"""
         pass
 
+    def ensure_indexes(self) -> List[str]:
+        """Create the declared indexes; returns their names"""
+        if not self.indexes:
+            return []
+        return self.collection.create_indexes(self.indexes)
+
+    def _find(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Query with optional field projection and pagination.
+        `after` is the `_id` of the last document of the previous page;
+        paging on `_id` stays an index range scan however deep the page.
+        """
+        query = dict(filters or {})
+        if after:
+            query['_id'] = {'$gt': ObjectId(after)}
+        cursor = self.collection.find(query, projection)
+        if limit or skip or after:
+            cursor = cursor.sort('_id', ASCENDING)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return [self._serialize(document) for document in cursor]
+
+    @staticmethod
+    def _serialize(document: Dict) -> Dict:
+        document['_id'] = str(document['_id'])
+        return document
+
+    def _bulk_write(self, operations: Iterable, batch_size: Optional[int] = None) -> Dict:
+        """
+        Send write operations in unordered batches.
+        Unordered batches let the server apply the remaining writes of a
+        batch when one fails; failures are counted instead of raised.
+        """
+        batch_size = batch_size or settings.MONGODB_SETTINGS['BULK_BATCH_SIZE']
+        counts = {'matched': 0, 'modified': 0, 'upserted': 0, 'errors': 0}
+        operations = iter(operations)
+        while True:
+            batch = list(islice(operations, batch_size))
+            if not batch:
+                return counts
+            try:
+                result = self.collection.bulk_write(batch, ordered=False).bulk_api_result
+            except BulkWriteError as e:
+                result = e.details
+                counts['errors'] += len(result.get('writeErrors', []))
+            counts['matched'] += result.get('nMatched', 0)
+            counts['modified'] += result.get('nModified', 0)
+            counts['upserted'] += result.get('nUpserted', 0)
+
 
 # core/repositories/contributor_repository.py
 from typing import Dict, List, Optional
 from bson import ObjectId
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.errors import DuplicateKeyError
 from .base_repository import BaseRepository
 
 
@@ -54,6 +130,14 @@ class ContributorRepository(BaseRepository):
     Contributor Repository - Manages contributor data in MongoDB
     """
 
+    indexes = [
+        IndexModel([('repository', ASCENDING), ('username', ASCENDING)], unique=True, name='repository_username'),
+    ]
+
+    # Exactly the fields ContributorSerializer renders for the contributor list;
+    # embedded dashboards and sync state stay in the database
+    SUMMARY_FIELDS = ['username', 'avatar_url', 'profile_url', 'contributions']
+
     def __init__(self):
         super().__init__('contributors')
 
@@ -77,17 +161,36 @@ class ContributorRepository(BaseRepository):
             result['_id'] = str(result['_id'])
         return result
 
-    def get_all(self, filters: Optional[Dict] = None) -> List[Dict]:
+    def get_by_login_and_repo(
+            self, login: str, repo_full_name: str, projection: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Contributors of a repository stored under any casing of a GitHub login"""
+        # Anchored, so only the repository prefix of the index is scanned
+        return self._find({
+            'repository': repo_full_name,
+            'username': {'$regex': f'^{re.escape(login)}$', '$options': 'i'},
+        }, projection)
+
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
         """Get all contributors with optional filters"""
-        query = filters or {}
-        results = list(self.collection.find(query))
-        for result in results:
-            result['_id'] = str(result['_id'])
-        return results
-
-    def get_by_repository(self, repo_full_name: str) -> List[Dict]:
-        """Get all contributors for a specific repository"""
-        return self.get_all({'repository': repo_full_name})
+        return self._find(filters, projection, limit, skip, after)
+
+    def get_by_repository(
+            self,
+            repo_full_name: str,
+            projection: Optional[List[str]] = SUMMARY_FIELDS,
+            limit: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get contributor summaries for a specific repository"""
+        return self.get_all({'repository': repo_full_name}, projection, limit=limit, after=after)
 
     def create(self, data: Dict) -> Dict:
         """Create a new contributor record"""
@@ -121,6 +224,30 @@ class ContributorRepository(BaseRepository):
             data['repository'] = repo_full_name
             return self.create(data)
 
+    def upsert_if_unchanged(self, username: str, repo_full_name: str, data: Dict, version: int) -> bool:
+        """
+        Create or update contributor, only while their stored `sync_state` is
+        still at `version` (0 for none); False when another writer got there first
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            # A missing version also matches states saved before they were numbered
+            {'username': username, 'repository': repo_full_name, 'sync_state.version': version or None},
+            {'$set': {**data, 'updated_at': now}},
+        )
+        if result.matched_count:
+            return True
+        if version:
+            return False
+        try:
+            # The unique (repository, username) index rejects it if a versioned document exists
+            self.collection.insert_one({
+                **data, 'username': username, 'repository': repo_full_name, 'created_at': now, 'updated_at': now,
+            })
+        except DuplicateKeyError:
+            return False
+        return True
+
     def delete(self, id: str) -> bool:
         """Delete a contributor"""
         try:
@@ -129,26 +256,33 @@ class ContributorRepository(BaseRepository):
         except Exception as e:
             return False
 
-    def bulk_upsert(self, contributors: List[Dict]) -> int:
-        """Bulk upsert multiple contributors"""
-        count = 0
+    def bulk_upsert(self, contributors: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Bulk upsert contributors keyed by (repository, username).
+        Returns matched / modified / upserted / errors counts.
+        """
+        now = datetime.utcnow()
+        operations = []
         for contributor in contributors:
-            try:
-                self.upsert_contributor(
-                    username=contributor['username'],
-                    repo_full_name=contributor['repository'],
-                    data=contributor
-                )
-                count += 1
-            except Exception as e:
+            username = contributor.get('username') or contributor.get('login')
+            if not username or not contributor.get('repository'):
                 continue
-        return count
+            data = {k: v for k, v in contributor.items() if k != '_id'}
+            data['username'] = username
+            data['updated_at'] = now
+            operations.append(UpdateOne(
+                {'repository': data['repository'], 'username': username},
+                {'$set': data, '$setOnInsert': {'created_at': now}},
+                upsert=True,
+            ))
+        return self._bulk_write(operations, batch_size)
 
 
 # core/repositories/repo_repository.py
 from typing import Dict, List, Optional
 from bson import ObjectId
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel, UpdateOne
 from .base_repository import BaseRepository
 
 
@@ -157,6 +291,11 @@ class RepositoryRepository(BaseRepository):
     Repository Repository - Manages GitHub repository data in MongoDB
     """
 
+    indexes = [
+        IndexModel([('full_name', ASCENDING)], unique=True, name='full_name'),
+        IndexModel([('owner', ASCENDING)], name='owner'),
+    ]
+
     def __init__(self):
         super().__init__('repositories')
 
@@ -177,17 +316,26 @@ class RepositoryRepository(BaseRepository):
             result['_id'] = str(result['_id'])
         return result
 
-    def get_all(self, filters: Optional[Dict] = None) -> List[Dict]:
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
         """Get all repositories with optional filters"""
-        query = filters or {}
-        results = list(self.collection.find(query))
-        for result in results:
-            result['_id'] = str(result['_id'])
-        return results
-
-    def get_by_owner(self, owner: str) -> List[Dict]:
+        return self._find(filters, projection, limit, skip, after)
+
+    def get_by_owner(
+            self,
+            owner: str,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
         """Get all repositories by owner"""
-        return self.get_all({'owner': owner})
+        return self.get_all({'owner': owner}, projection, limit=limit, after=after)
 
     def create(self, data: Dict) -> Dict:
         """Create a new repository record"""
@@ -226,4 +374,454 @@ class RepositoryRepository(BaseRepository):
             result = self.collection.delete_one({'_id': ObjectId(id)})
             return result.deleted_count > 0
         except Exception as e:
-            return False
\ No newline at end of file
+            return False
+
+    def bulk_upsert(self, repositories: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Bulk upsert repositories keyed by full name.
+        Returns matched / modified / upserted / errors counts.
+        """
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {'full_name': repository['full_name']},
+                {
+                    '$set': {**{k: v for k, v in repository.items() if k != '_id'}, 'updated_at': now},
+                    '$setOnInsert': {'created_at': now},
+                },
+                upsert=True,
+            )
+            for repository in repositories if repository.get('full_name')
+        ]
+        return self._bulk_write(operations, batch_size)
+
+
+# core/repositories/commit_stats_repository.py
+from typing import Dict, Iterable, List, Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from .base_repository import BaseRepository
+
+
+class CommitStatsRepository(BaseRepository):
+    """
+    Commit Stats Repository - Line changes of commits in MongoDB, keyed by SHA
+    A commit never changes once pushed, so documents are written once and
+    shared by every user, repository and fork the commit appears in.
+    """
+
+    indexes = [
+        IndexModel([('sha', ASCENDING)], unique=True, name='sha'),
+    ]
+
+    def __init__(self):
+        super().__init__('commit_stats')
+
+    def get_by_id(self, id: str) -> Optional[Dict]:
+        """Get commit stats by MongoDB ID"""
+        try:
+            result = self.collection.find_one({'_id': ObjectId(id)})
+            if result:
+                result['_id'] = str(result['_id'])
+            return result
+        except Exception as e:
+            return None
+
+    def get_by_shas(self, shas: Iterable[str]) -> Dict[str, Dict]:
+        """Stats of the known commits among `shas`, by SHA"""
+        cursor = self.collection.find(
+            {'sha': {'$in': list(set(shas))}},
+            {'_id': 0, 'sha': 1, 'additions': 1, 'deletions': 1},
+        )
+        return {d['sha']: {'additions': d['additions'], 'deletions': d['deletions']} for d in cursor}
+
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get all commit stats with optional filters"""
+        return self._find(filters, projection, limit, skip, after)
+
+    def create(self, data: Dict) -> Dict:
+        """Create a new commit stats record"""
+        data['created_at'] = datetime.utcnow()
+        result = self.collection.insert_one(data)
+        data['_id'] = str(result.inserted_id)
+        return data
+
+    def update(self, id: str, data: Dict) -> bool:
+        """Commit stats are immutable"""
+        return False
+
+    def delete(self, id: str) -> bool:
+        """Delete commit stats"""
+        try:
+            result = self.collection.delete_one({'_id': ObjectId(id)})
+            return result.deleted_count > 0
+        except Exception as e:
+            return False
+
+    def bulk_insert(self, stats: Dict[str, Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Store stats by SHA, leaving commits that are already known untouched.
+        Returns matched / modified / upserted / errors counts.
+        """
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {'sha': sha},
+                {'$setOnInsert': {
+                    'additions': commit_stats['additions'],
+                    'deletions': commit_stats['deletions'],
+                    'created_at': now,
+                }},
+                upsert=True,
+            )
+            for sha, commit_stats in stats.items()
+        ]
+        return self._bulk_write(operations, batch_size)
+
+
+# core/repositories/metric_snapshot_repository.py
+from typing import Dict, List, Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from .base_repository import BaseRepository
+
+
+class MetricSnapshotRepository(BaseRepository):
+    """
+    Metric Snapshot Repository - Time series of contributor and repository metrics in MongoDB
+    One document per (repository, username, granularity, period), holding the
+    metrics as of the last snapshot taken in that period. Repository-wide
+    series have no username. MongoDB's TTL monitor drops documents past
+    their `expire_at`; documents without one are kept.
+    """
+
+    indexes = [
+        # A series over any date range is one scan of this index
+        IndexModel(
+            [('repository', ASCENDING), ('username', ASCENDING), ('granularity', ASCENDING), ('period', ASCENDING)],
+            unique=True, name='repository_username_granularity_period',
+        ),
+        IndexModel([('expire_at', ASCENDING)], expireAfterSeconds=0, name='expire_at'),
+    ]
+
+    def __init__(self):
+        super().__init__('metric_snapshots')
+
+    def get_by_id(self, id: str) -> Optional[Dict]:
+        """Get a snapshot by MongoDB ID"""
+        try:
+            result = self.collection.find_one({'_id': ObjectId(id)})
+            if result:
+                result['_id'] = str(result['_id'])
+            return result
+        except Exception as e:
+            return None
+
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get all snapshots with optional filters"""
+        return self._find(filters, projection, limit, skip, after)
+
+    def get_series(
+            self,
+            repository: str,
+            username: Optional[str],
+            granularity: str,
+            metric: str,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+    ) -> List[Dict]:
+        """One metric's values over the periods from `start` to `end`, oldest first"""
+        query = {'repository': repository, 'username': username, 'granularity': granularity}
+        period = {**({'$gte': start} if start else {}), **({'$lte': end} if end else {})}
+        if period:
+            query['period'] = period
+        cursor = self.collection.find(query, {'_id': 0, 'period': 1, f'metrics.{metric}': 1}).sort('period', ASCENDING)
+        return [{'period': d['period'], 'value': (d.get('metrics') or {}).get(metric)} for d in cursor]
+
+    def create(self, data: Dict) -> Dict:
+        """Create a new snapshot"""
+        data['created_at'] = datetime.utcnow()
+        data['updated_at'] = datetime.utcnow()
+        result = self.collection.insert_one(data)
+        data['_id'] = str(result.inserted_id)
+        return data
+
+    def update(self, id: str, data: Dict) -> bool:
+        """Update a snapshot"""
+        try:
+            data['updated_at'] = datetime.utcnow()
+            result = self.collection.update_one(
+                {'_id': ObjectId(id)},
+                {'$set': data}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            return False
+
+    def delete(self, id: str) -> bool:
+        """Delete a snapshot"""
+        try:
+            result = self.collection.delete_one({'_id': ObjectId(id)})
+            return result.deleted_count > 0
+        except Exception as e:
+            return False
+
+    def record(self, snapshots: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Upsert snapshots keyed by (repository, username, granularity, period).
+        Returns matched / modified / upserted / errors counts.
+        """
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {field: snapshot.get(field) for field in ('repository', 'username', 'granularity', 'period')},
+                {
+                    '$set': {**{k: v for k, v in snapshot.items() if k != '_id'}, 'updated_at': now},
+                    '$setOnInsert': {'created_at': now},
+                },
+                upsert=True,
+            )
+            for snapshot in snapshots
+        ]
+        return self._bulk_write(operations, batch_size)
+
+    def delete_expired(self, now: Optional[datetime] = None) -> int:
+        """Drop snapshots past their retention ahead of the TTL monitor; returns how many"""
+        result = self.collection.delete_many({'expire_at': {'$lte': now or datetime.utcnow()}})
+        return result.deleted_count
+
+
+# core/repositories/activity_repository.py
+from typing import Dict, Iterable, List, Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from core.database import get_database
+from .base_repository import BaseRepository
+
+
+# Counters of MetricsAccumulator.state() that activity adds up to
+ACTIVITY_TOTALS = (
+    'commits_total', 'additions', 'deletions',
+    'issues_total', 'issues_open', 'issues_closed',
+    'prs_total', 'prs_open', 'prs_merged', 'prs_closed_unmerged',
+)
+ISSUE_STATUS_TOTALS = {'open': 'issues_open', 'closed': 'issues_closed'}
+PULL_REQUEST_STATUS_TOTALS = {'open': 'prs_open', 'merged': 'prs_merged', 'closed': 'prs_closed_unmerged'}
+
+
+def daily_totals(groups: Iterable[Dict]) -> Dict[Optional[str], Dict[str, int]]:
+    """
+    ACTIVITY_TOTALS per day, from activity grouped by `day` (YYYY-MM-DD or
+    None), `kind` (commit, issue or pull_request) and `status`, with a
+    `count` and, for commits, summed `additions` and `deletions`
+    """
+    days: Dict[Optional[str], Dict[str, int]] = {}
+    for group in groups:
+        totals = days.setdefault(group.get('day'), dict.fromkeys(ACTIVITY_TOTALS, 0))
+        count, kind = group['count'], group['kind']
+        if kind == 'commit':
+            totals['commits_total'] += count
+            totals['additions'] += group.get('additions') or 0
+            totals['deletions'] += group.get('deletions') or 0
+            continue
+        prefix, statuses = ('issues', ISSUE_STATUS_TOTALS) if kind == 'issue' else ('prs', PULL_REQUEST_STATUS_TOTALS)
+        totals[f'{prefix}_total'] += count
+        if group.get('status') in statuses:
+            totals[statuses[group['status']]] += count
+    return days
+
+
+class RawActivityRepository(BaseRepository):
+    """
+    Raw Activity Repository - Adapted commits, issues or pull requests in MongoDB
+    One document per item and repository, upserted by its SHA or id, so
+    refetching an item replaces it. Documents carry `repository`, `author`
+    (login) and `date` (a UTC datetime) for range reads of a contributor's
+    activity. Nothing expires: activity is kept for any later computation.
+    """
+
+    # Field identifying an item within its repository
+    id_field = 'id'
+
+    def __init__(self, collection_name: str):
+        super().__init__(collection_name)
+        self.indexes = [
+            IndexModel([('repository', ASCENDING), (self.id_field, ASCENDING)], unique=True,
+                       name=f'repository_{self.id_field}'),
+            IndexModel([('repository', ASCENDING), ('author', ASCENDING), ('date', ASCENDING)],
+                       name='repository_author_date'),
+        ]
+
+    def get_by_id(self, id: str) -> Optional[Dict]:
+        """Get an item by MongoDB ID"""
+        try:
+            result = self.collection.find_one({'_id': ObjectId(id)})
+            if result:
+                result['_id'] = str(result['_id'])
+            return result
+        except Exception as e:
+            return None
+
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get all items with optional filters"""
+        return self._find(filters, projection, limit, skip, after)
+
+    def get_by_author(
+            self,
+            repository: str,
+            author: str,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """A contributor's items dated from `start` until before `end`, oldest first"""
+        query = {'repository': repository, 'author': author}
+        date = {**({'$gte': start} if start else {}), **({'$lt': end} if end else {})}
+        if date:
+            query['date'] = date
+        cursor = self.collection.find(query, {'_id': 0}).sort('date', ASCENDING)
+        return list(cursor)
+
+    def create(self, data: Dict) -> Dict:
+        """Create a new item"""
+        data['created_at'] = datetime.utcnow()
+        data['updated_at'] = datetime.utcnow()
+        result = self.collection.insert_one(data)
+        data['_id'] = str(result.inserted_id)
+        return data
+
+    def update(self, id: str, data: Dict) -> bool:
+        """Update an item"""
+        try:
+            data['updated_at'] = datetime.utcnow()
+            result = self.collection.update_one(
+                {'_id': ObjectId(id)},
+                {'$set': data}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            return False
+
+    def delete(self, id: str) -> bool:
+        """Delete an item"""
+        try:
+            result = self.collection.delete_one({'_id': ObjectId(id)})
+            return result.deleted_count > 0
+        except Exception as e:
+            return False
+
+    def bulk_upsert(self, documents: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Bulk upsert items keyed by (repository, SHA or id).
+        Returns matched / modified / upserted / errors counts.
+        """
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {'repository': document['repository'], self.id_field: document[self.id_field]},
+                {
+                    '$set': {**{k: v for k, v in document.items() if k != '_id'}, 'updated_at': now},
+                    '$setOnInsert': {'created_at': now},
+                },
+                upsert=True,
+            )
+            for document in documents if document.get('repository') and document.get(self.id_field) is not None
+        ]
+        return self._bulk_write(operations, batch_size)
+
+
+class CommitRepository(RawActivityRepository):
+    """Commit Repository - Adapted commits in MongoDB, by SHA"""
+
+    id_field = 'sha'
+
+    def __init__(self):
+        super().__init__('commits')
+
+
+class IssueRepository(RawActivityRepository):
+    """Issue Repository - Adapted issues in MongoDB, by id"""
+
+    def __init__(self):
+        super().__init__('issues')
+
+
+class PullRequestRepository(RawActivityRepository):
+    """Pull Request Repository - Adapted pull requests in MongoDB, by id"""
+
+    def __init__(self):
+        super().__init__('pull_requests')
+
+
+class ActivityRepository:
+    """
+    Activity Repository - Contributor metrics computed by MongoDB from stored raw activity
+    Read-only, so not a BaseRepository: items are written through the commit,
+    issue and pull request repositories. Reads their collections, whose
+    documents carry `repository`, `author` (lowercased login) and `date` (a UTC datetime)
+    besides their own fields: `additions` and `deletions` for commits,
+    `state` for issues, `state` and `merged` for pull requests.
+    """
+
+    def __init__(self):
+        self.db = get_database()
+        # Pipelines start from commits and take in the other collections;
+        # their (repository, author, date) indexes are declared by the raw activity repositories
+        self.collection = self.db['commits']
+
+    def aggregate_daily_activity(self, repository: str, author: str) -> Dict[Optional[str], Dict[str, int]]:
+        """
+        A contributor's ACTIVITY_TOTALS per day they were active; undated items
+        are under None. One pipeline over the three collections: only counts
+        grouped by day, kind and status leave the server, however many
+        documents they summarize.
+        """
+        match = {'$match': {'repository': repository, 'author': author}}
+        # Null for undated items
+        day = {'$dateToString': {'date': '$date', 'format': '%Y-%m-%d'}}
+        pipeline = [
+            match,
+            {'$project': {'_id': 0, 'day': day, 'kind': {'$literal': 'commit'}, 'additions': 1, 'deletions': 1}},
+            {'$unionWith': {'coll': 'issues', 'pipeline': [
+                match,
+                {'$project': {'_id': 0, 'day': day, 'kind': {'$literal': 'issue'}, 'status': '$state'}},
+            ]}},
+            {'$unionWith': {'coll': 'pull_requests', 'pipeline': [
+                match,
+                {'$project': {'_id': 0, 'day': day, 'kind': {'$literal': 'pull_request'},
+                              'status': {'$cond': ['$merged', 'merged', '$state']}}},
+            ]}},
+            {'$group': {
+                '_id': {'day': '$day', 'kind': '$kind', 'status': '$status'},
+                'count': {'$sum': 1},
+                'additions': {'$sum': '$additions'},
+                'deletions': {'$sum': '$deletions'},
+            }},
+        ]
+        return daily_totals(
+            {**group['_id'], 'count': group['count'], 'additions': group['additions'], 'deletions': group['deletions']}
+            for group in self.collection.aggregate(pipeline)
+        )
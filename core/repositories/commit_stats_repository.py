@@ -0,0 +1,36 @@
+# core/repositories/commit_stats_repository.py
+# In-memory commit stats store, the development and test stand-in for MongoDB.
+from typing import Dict, Iterable, Optional
+from .memory_repository import InMemoryRepository
+
+
+class CommitStatsRepository(InMemoryRepository):
+    """
+    Commit Stats Repository - Line changes of commits, keyed by SHA
+    A commit never changes once pushed, so documents are written once and
+    shared by every user, repository and fork the commit appears in.
+    """
+
+    key_fields = ('sha',)
+
+    def __init__(self):
+        super().__init__('commit_stats')
+
+    def get_by_shas(self, shas: Iterable[str]) -> Dict[str, Dict]:
+        """Stats of the known commits among `shas`, by SHA"""
+        with self.collection.lock:
+            documents = (self._get_by_key(sha) for sha in set(shas))
+            return {d['sha']: {'additions': d['additions'], 'deletions': d['deletions']} for d in documents if d}
+
+    def bulk_insert(self, stats: Dict[str, Dict], batch_size: Optional[int] = None) -> Dict:
+        """Store stats by SHA, leaving commits that are already known untouched"""
+        counts = {'matched': 0, 'modified': 0, 'upserted': 0, 'errors': 0}
+        with self.collection.lock:
+            for sha, commit_stats in stats.items():
+                if self.collection.by_key.get((sha,)):
+                    counts['matched'] += 1
+                    continue
+                self.create({'sha': sha, 'additions': commit_stats['additions'],
+                             'deletions': commit_stats['deletions']})
+                counts['upserted'] += 1
+        return counts
@@ -1,37 +1,69 @@
 # core/repositories/contributor_repository.py
-# Minimal in-memory repository to satisfy service dependencies.
-from typing import Dict, List
-
-
-class ContributorRepository:
-    _store: Dict[str, List[Dict]] = {}
-    _dashboards: Dict[str, Dict] = {}
-
-    def get_by_repository(self, full_repo_name: str) -> List[Dict]:
-        return self._store.get(full_repo_name, [])
-
-    def bulk_upsert(self, contributors: List[Dict]) -> None:
-        # Group contributors by repository key
-        by_repo: Dict[str, List[Dict]] = {}
-        for c in contributors:
-            repo = c.get("repository")
-            if not repo:
-                continue
-            by_repo.setdefault(repo, [])
-            # Upsert by login
-            existing = {ec.get("login"): ec for ec in by_repo[repo]}
-            login = c.get("login")
-            if login in existing:
-                existing[login].update(c)
-            else:
-                by_repo[repo].append(c)
-        for repo, items in by_repo.items():
-            self._store[repo] = items
-
-    def upsert_contributor(self, username: str, repository: str, dashboard: Dict) -> None:
-        key = f"{repository}:{username}"
-        self._dashboards[key] = dashboard
-
-    def get_dashboard(self, username: str, repository: str) -> Dict:
-        key = f"{repository}:{username}"
-        return self._dashboards.get(key, {})
+# In-memory contributor store, the development and test stand-in for MongoDB.
+from typing import Dict, List, Optional
+from .memory_repository import InMemoryRepository
+
+
+class ContributorRepository(InMemoryRepository):
+    """
+    Contributor Repository - Manages contributor data in memory
+    Keyed by (repository, username) with a secondary index on repository.
+    """
+
+    key_fields = ('repository', 'username')
+    indexed_fields = ('repository',)
+
+    # Exactly the fields ContributorSerializer renders for the contributor list;
+    # embedded dashboards and sync state stay in the database
+    SUMMARY_FIELDS = ['username', 'avatar_url', 'profile_url', 'contributions']
+
+    def __init__(self):
+        super().__init__('contributors')
+
+    def get_by_username_and_repo(self, username: str, repo_full_name: str) -> Optional[Dict]:
+        """Get contributor by username and repository"""
+        return self._get_by_key(repo_full_name, username)
+
+    def get_by_login_and_repo(
+            self, login: str, repo_full_name: str, projection: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Contributors of a repository stored under any casing of a GitHub login"""
+        return [
+            self._project(contributor, projection)
+            for contributor in self.get_all({'repository': repo_full_name})
+            if contributor['username'].lower() == login.lower()
+        ]
+
+    def get_by_repository(
+            self,
+            repo_full_name: str,
+            projection: Optional[List[str]] = SUMMARY_FIELDS,
+            limit: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get contributor summaries for a specific repository"""
+        return self.get_all({'repository': repo_full_name}, projection, limit=limit, after=after)
+
+    def upsert_contributor(self, username: str, repo_full_name: str, data: Dict) -> Dict:
+        """Create or update contributor"""
+        return self._upsert({**data, 'username': username, 'repository': repo_full_name})[0]
+
+    def upsert_if_unchanged(self, username: str, repo_full_name: str, data: Dict, version: int) -> bool:
+        """
+        Create or update contributor, only while their stored `sync_state` is
+        still at `version` (0 for none); False when another writer got there first
+        """
+        with self.collection.lock:
+            stored = self.get_by_username_and_repo(username, repo_full_name)
+            if ((stored or {}).get('sync_state') or {}).get('version', 0) != version:
+                return False
+            self.upsert_contributor(username, repo_full_name, data)
+            return True
+
+    def bulk_upsert(self, contributors: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """Bulk upsert contributors keyed by (repository, username)"""
+        return self._bulk_upsert(
+            {**contributor, 'username': contributor.get('username') or contributor.get('login')}
+            for contributor in contributors
+            if contributor.get('repository') and (contributor.get('username') or contributor.get('login'))
+        )
@@ -0,0 +1,182 @@
+# core/repositories/memory_repository.py
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bson import ObjectId
+from .base_repository import BaseRepository
+
+
+class InMemoryCollection:
+    """
+    Documents of one collection, indexed by `_id`, by a unique natural key
+    and by any number of secondary fields.
+    """
+
+    def __init__(self, key_fields: Tuple[str, ...], indexed_fields: Tuple[str, ...]):
+        self.key_fields = key_fields
+        self.indexed_fields = indexed_fields
+        self.documents: Dict[str, Dict] = {}
+        self.by_key: Dict[tuple, str] = {}
+        self.secondary: Dict[str, Dict[object, Set[str]]] = {field: {} for field in indexed_fields}
+        self.lock = threading.RLock()
+
+    def key_of(self, document: Dict) -> tuple:
+        return tuple(document.get(field) for field in self.key_fields)
+
+    def put(self, document: Dict) -> None:
+        """Insert or replace a document, keeping every index in step"""
+        previous = self.documents.get(document['_id'])
+        if previous is not None:
+            self._unindex(previous)
+        self.documents[document['_id']] = document
+        self.by_key[self.key_of(document)] = document['_id']
+        for field in self.indexed_fields:
+            self.secondary[field].setdefault(document.get(field), set()).add(document['_id'])
+
+    def remove(self, id: str) -> Optional[Dict]:
+        document = self.documents.pop(id, None)
+        if document is not None:
+            self._unindex(document)
+        return document
+
+    def candidates(self, filters: Dict) -> Iterable[str]:
+        """Ids worth checking against the filters, narrowed by an index when possible"""
+        for field in self.indexed_fields:
+            if field in filters:
+                return self.secondary[field].get(filters[field], set())
+        if self.key_fields and all(field in filters for field in self.key_fields):
+            id = self.by_key.get(tuple(filters[field] for field in self.key_fields))
+            return [id] if id else []
+        return self.documents.keys()
+
+    def clear(self) -> None:
+        self.documents.clear()
+        self.by_key.clear()
+        for index in self.secondary.values():
+            index.clear()
+
+    def _unindex(self, document: Dict) -> None:
+        self.by_key.pop(self.key_of(document), None)
+        for field in self.indexed_fields:
+            ids = self.secondary[field].get(document.get(field))
+            if ids:
+                ids.discard(document['_id'])
+
+
+class InMemoryRepository(BaseRepository):
+    """
+    In-memory Repository - thread-safe stand-in for the MongoDB repositories.
+    Implements the same interface, so tests, development and benchmarks can
+    swap backends. Collections are shared by every instance in the process.
+    """
+
+    # Natural key upserts are matched on, and fields with a secondary index
+    key_fields: Tuple[str, ...] = ()
+    indexed_fields: Tuple[str, ...] = ()
+
+    _collections: Dict[str, InMemoryCollection] = {}
+    _collections_lock = threading.Lock()
+
+    def __init__(self, collection_name: str):
+        # Deliberately skips BaseRepository.__init__: no MongoDB involved
+        with InMemoryRepository._collections_lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                collection = InMemoryCollection(self.key_fields, self.indexed_fields)
+                self._collections[collection_name] = collection
+        self.collection = collection
+
+    def get_by_id(self, id: str) -> Optional[Dict]:
+        with self.collection.lock:
+            document = self.collection.documents.get(id)
+            return dict(document) if document else None
+
+    def get_all(
+            self,
+            filters: Optional[Dict] = None,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            skip: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        filters = filters or {}
+        with self.collection.lock:
+            # ObjectId strings sort in creation order, like Mongo's `_id` index
+            ids = sorted(self.collection.candidates(filters))
+            matches = (
+                self.collection.documents[id] for id in ids
+                if (after is None or id > after) and self._matches(self.collection.documents[id], filters)
+            )
+            results = []
+            for position, document in enumerate(matches):
+                if position < skip:
+                    continue
+                if limit and len(results) >= limit:
+                    break
+                results.append(self._project(document, projection))
+            return results
+
+    def create(self, data: Dict) -> Dict:
+        now = datetime.utcnow()
+        document = {**data, 'created_at': now, 'updated_at': now, '_id': str(ObjectId())}
+        with self.collection.lock:
+            self.collection.put(document)
+        return dict(document)
+
+    def update(self, id: str, data: Dict) -> bool:
+        with self.collection.lock:
+            document = self.collection.documents.get(id)
+            if document is None:
+                return False
+            self.collection.put({**document, **data, 'updated_at': datetime.utcnow(), '_id': id})
+            return True
+
+    def delete(self, id: str) -> bool:
+        with self.collection.lock:
+            return self.collection.remove(id) is not None
+
+    def ensure_indexes(self) -> List[str]:
+        # Key and secondary indexes are maintained on every write
+        return []
+
+    def clear(self) -> None:
+        """Drop every document of this collection"""
+        with self.collection.lock:
+            self.collection.clear()
+
+    def _get_by_key(self, *values) -> Optional[Dict]:
+        with self.collection.lock:
+            id = self.collection.by_key.get(values)
+            return self.get_by_id(id) if id else None
+
+    def _upsert(self, data: Dict) -> Tuple[Dict, bool]:
+        """Merge data into the document with the same natural key; returns (document, created)"""
+        data = {k: v for k, v in data.items() if k != '_id'}
+        with self.collection.lock:
+            existing = self._get_by_key(*self.collection.key_of(data))
+            if existing:
+                self.update(existing['_id'], data)
+                return {**existing, **data}, False
+            return self.create(data), True
+
+    def _bulk_upsert(self, documents: Iterable[Dict]) -> Dict:
+        counts = {'matched': 0, 'modified': 0, 'upserted': 0, 'errors': 0}
+        with self.collection.lock:
+            for document in documents:
+                _, created = self._upsert(document)
+                if created:
+                    counts['upserted'] += 1
+                else:
+                    counts['matched'] += 1
+                    counts['modified'] += 1
+        return counts
+
+    @staticmethod
+    def _matches(document: Dict, filters: Dict) -> bool:
+        return all(document.get(field) == value for field, value in filters.items())
+
+    @staticmethod
+    def _project(document: Dict, projection: Optional[List[str]]) -> Dict:
+        if projection is None:
+            return dict(document)
+        return {field: document[field] for field in ['_id', *projection] if field in document}
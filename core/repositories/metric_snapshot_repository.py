@@ -0,0 +1,57 @@
+# core/repositories/metric_snapshot_repository.py
+# In-memory metric snapshot store, the development and test stand-in for MongoDB.
+from datetime import datetime
+from typing import Dict, List, Optional
+from .memory_repository import InMemoryRepository
+
+
+class MetricSnapshotRepository(InMemoryRepository):
+    """
+    Metric Snapshot Repository - Time series of contributor and repository metrics
+    One document per (repository, username, granularity, period), holding the
+    metrics as of the last snapshot taken in that period. Repository-wide
+    series have no username. Documents past their `expire_at` are dropped.
+    """
+
+    key_fields = ('repository', 'username', 'granularity', 'period')
+    indexed_fields = ('repository',)
+
+    def __init__(self):
+        super().__init__('metric_snapshots')
+
+    def record(self, snapshots: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """Upsert snapshots keyed by (repository, username, granularity, period)"""
+        return self._bulk_upsert(snapshots)
+
+    def get_series(
+            self,
+            repository: str,
+            username: Optional[str],
+            granularity: str,
+            metric: str,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+    ) -> List[Dict]:
+        """One metric's values over the periods from `start` to `end`, oldest first"""
+        now = datetime.utcnow()
+        documents = sorted(
+            (
+                d for d in self.get_all({'repository': repository, 'username': username, 'granularity': granularity})
+                if (start is None or d['period'] >= start) and (end is None or d['period'] <= end)
+                and (d.get('expire_at') is None or d['expire_at'] > now)
+            ),
+            key=lambda d: d['period'],
+        )
+        return [{'period': d['period'], 'value': (d.get('metrics') or {}).get(metric)} for d in documents]
+
+    def delete_expired(self, now: Optional[datetime] = None) -> int:
+        """Drop snapshots past their retention; returns how many"""
+        now = now or datetime.utcnow()
+        with self.collection.lock:
+            expired = [
+                id for id, d in self.collection.documents.items()
+                if d.get('expire_at') is not None and d['expire_at'] <= now
+            ]
+            for id in expired:
+                self.collection.remove(id)
+        return len(expired)
@@ -1,16 +1,39 @@
 # core/repositories/repo_repository.py
-# Minimal in-memory repository for repositories
-from typing import Dict
+# In-memory repository store, the development and test stand-in for MongoDB.
+from typing import Dict, List, Optional
+from .memory_repository import InMemoryRepository
 
 
-class RepositoryRepository:
-    _repos: Dict[str, Dict] = {}
+class RepositoryRepository(InMemoryRepository):
+    """
+    Repository Repository - Manages GitHub repository data in memory
+    Keyed by full name with a secondary index on owner.
+    """
+
+    key_fields = ('full_name',)
+    indexed_fields = ('owner',)
+
+    def __init__(self):
+        super().__init__('repositories')
+
+    def get_by_full_name(self, full_name: str) -> Optional[Dict]:
+        """Get repository by full name (owner/repo)"""
+        return self._get_by_key(full_name)
+
+    def get_by_owner(
+            self,
+            owner: str,
+            projection: Optional[List[str]] = None,
+            limit: int = 0,
+            after: Optional[str] = None,
+    ) -> List[Dict]:
+        """Get all repositories by owner"""
+        return self.get_all({'owner': owner}, projection, limit=limit, after=after)
 
     def upsert_repository(self, full_name: str, data: Dict) -> Dict:
-        existing = self._repos.get(full_name, {})
-        existing.update(data or {})
-        # Ensure full_name is set
-        if full_name:
-            existing["full_name"] = full_name
-        self._repos[full_name] = existing
-        return existing
+        """Create or update repository"""
+        return self._upsert({**(data or {}), 'full_name': full_name})[0]
+
+    def bulk_upsert(self, repositories: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """Bulk upsert repositories keyed by full name"""
+        return self._bulk_upsert(repository for repository in repositories if repository.get('full_name'))
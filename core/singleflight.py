@@ -0,0 +1,126 @@
+# core/singleflight.py
+# Coalesces concurrent identical work into a single execution.
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+from django.core.cache import caches
+from core.concurrency import offload
+
+
+class SingleFlight:
+    """
+    Runs `fn` once per key at a time; concurrent callers with the same key
+    wait for the in-flight call and share its result (or exception).
+
+    With `store_alias` naming a shared Django cache, the leader in each
+    worker also takes a lock in that cache. Workers that find the lock taken wait for it
+    to be released, then call `recheck` to pick up the result the other
+    worker published, and only run `fn` themselves if it returns nothing.
+    """
+
+    def __init__(self, store_alias: Optional[str] = None, lock_timeout: int = 120, poll_interval: float = 0.1):
+        self.store_alias = store_alias
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]] = None) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run(key, fn, recheck)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(
+            self, key: str, fn: Callable[[], Awaitable], recheck: Optional[Callable[[], Awaitable]] = None
+    ) -> Any:
+        """`do` for coroutine functions; shares in-flight calls with sync callers of the same key"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            # Shielded: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await self._run_async(key, fn, recheck)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _run(self, key: str, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]]) -> Any:
+        if self.store_alias is None:
+            return fn()
+
+        store = caches[self.store_alias]
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        while not store.add(lock_key, token, timeout=self.lock_timeout):
+            # Another worker is building; wait for it and reuse its result
+            while store.get(lock_key) is not None and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+            result = recheck() if recheck else None
+            if result is not None:
+                return result
+            if time.monotonic() >= deadline:
+                # The other worker looks stuck; do the work without the lock
+                return fn()
+        try:
+            return fn()
+        finally:
+            if store.get(lock_key) == token:
+                store.delete(lock_key)
+
+    async def _run_async(
+            self, key: str, fn: Callable[[], Awaitable], recheck: Optional[Callable[[], Awaitable]]
+    ) -> Any:
+        if self.store_alias is None:
+            return await fn()
+
+        store = caches[self.store_alias]
+        add, get, delete = offload(store.add), offload(store.get), offload(store.delete)
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        while not await add(lock_key, token, timeout=self.lock_timeout):
+            while await get(lock_key) is not None and time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+            result = await recheck() if recheck else None
+            if result is not None:
+                return result
+            if time.monotonic() >= deadline:
+                return await fn()
+        try:
+            return await fn()
+        finally:
+            if await get(lock_key) == token:
+                await delete(lock_key)
@@ -0,0 +1,12 @@
+import os
+
+import django
+
+# Settings read these from the environment; tests never touch the real services
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+for key in ('SECRET_KEY', 'POSTGRES_PASSWORD', 'GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET'):
+    os.environ.setdefault(key, 'test')
+os.environ.setdefault('SHARED_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+os.environ.setdefault('REPOSITORY_BACKEND', 'memory')
+
+django.setup()
@@ -0,0 +1,127 @@
+# tests/bench_async.py
+"""
+Load benchmark of dashboard generation, sync vs async, against the local
+fake GitHub.
+
+The sync side serves requests from a fixed pool of threads, the way a
+threaded WSGI worker does; the async side serves them all from one event
+loop, the way an ASGI worker does. Every request builds a different
+contributor's dashboard from a cold cache.
+
+    python -m tests.bench_async --requests 200 --threads 16 --latency 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from apps.dashboards.services.async_dashboard_service import AsyncDashboardService
+from apps.dashboards.services.dashboard_cache import clear_local_dashboard_cache
+from apps.dashboards.services.dashboard_service import DashboardService
+from core.integrations.async_github_client import close_async_sessions
+from core.integrations.response_cache import get_response_cache
+from core.repositories import get_repository
+from tests.fake_github import FakeGitHub, make_commit, make_issue, make_pull
+
+
+def seed(fake: FakeGitHub, contributors: int) -> List[str]:
+    logins = [f'user{i}' for i in range(contributors)]
+    fake.add_object('/repos/o/r', {'id': 1, 'name': 'r', 'full_name': 'o/r', 'owner': {'login': 'o'}})
+    fake.add_list('/repos/o/r/contributors', [
+        {'id': i, 'login': login, 'contributions': 3} for i, login in enumerate(logins)
+    ])
+    fake.add_list('/repos/o/r/commits', [
+        make_commit(f'{login}-{n}', login, f'2024-01-0{n + 1}T10:00:00Z') for login in logins for n in range(3)
+    ])
+    fake.add_list('/repos/o/r/issues', [make_issue(i, login) for i, login in enumerate(logins)])
+    fake.add_list('/repos/o/r/pulls', [make_pull(i, login) for i, login in enumerate(logins)])
+    for login in logins:
+        fake.add_object(f'/users/{login}/events', [{'type': 'PushEvent'}])
+    return logins
+
+
+def reset() -> None:
+    caches['shared'].clear()
+    clear_local_dashboard_cache()
+    get_response_cache().clear()
+    get_repository('contributors').clear()
+    get_repository('repositories').clear()
+    get_repository('commit_stats').clear()
+
+
+def timed(fn: Callable[[], None], latencies: List[float]) -> None:
+    started = time.monotonic()
+    fn()
+    latencies.append(time.monotonic() - started)
+
+
+def run_sync(logins: List[str], threads: int) -> Dict:
+    latencies: List[float] = []
+
+    def request(login: str) -> None:
+        timed(lambda: DashboardService('token').generate_contributor_dashboard('o', 'r', login), latencies)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(request, logins))
+    return summarize(latencies, time.monotonic() - started)
+
+
+def run_async(logins: List[str]) -> Dict:
+    latencies: List[float] = []
+
+    async def request(login: str) -> None:
+        started = time.monotonic()
+        await AsyncDashboardService('token').generate_contributor_dashboard('o', 'r', login)
+        latencies.append(time.monotonic() - started)
+
+    async def main() -> None:
+        try:
+            await asyncio.gather(*(request(login) for login in logins))
+        finally:
+            await close_async_sessions()
+
+    started = time.monotonic()
+    asyncio.run(main())
+    return summarize(latencies, time.monotonic() - started)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'seconds': round(elapsed, 2),
+        'per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=200, help='concurrent dashboard requests')
+    parser.add_argument('--threads', type=int, default=16, help='request threads of the sync worker')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per fake GitHub response')
+    args = parser.parse_args()
+
+    with FakeGitHub() as fake, override_settings(GITHUB_API_BASE_URL=fake.url):
+        fake.latency = args.latency
+        logins = seed(fake, args.requests)
+        results = {}
+        for name, run in (('sync', lambda: run_sync(logins, args.threads)), ('async', lambda: run_async(logins))):
+            reset()
+            results[name] = run()
+
+    print(f"{'':6}{'requests':>10}{'seconds':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, result in results.items():
+        print(f"{name:6}{result['requests']:>10}{result['seconds']:>10}{result['per_second']:>10}"
+              f"{result['p50_ms']:>10}{result['p95_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
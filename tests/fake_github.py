@@ -0,0 +1,295 @@
+# tests/fake_github.py
+# Local fake of the GitHub REST API used by the test-suite.
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+def _matches(item: Dict, query: Dict) -> bool:
+    """Apply the subset of GitHub list filters the client relies on"""
+    author = query.get('author')
+    if author and (item.get('author') or {}).get('login') != author:
+        return False
+    creator = query.get('creator')
+    if creator and (item.get('user') or {}).get('login') != creator:
+        return False
+    since = query.get('since')
+    if since and _updated_at(item) < since:
+        return False
+    return True
+
+
+def _updated_at(item: Dict) -> str:
+    """`updated_at` of issues and pulls; committer date of commits"""
+    if 'commit' in item:
+        return item['commit']['committer']['date']
+    return item.get('updated_at') or ''
+
+
+def make_commit(
+        sha: str, login: str = 'octocat', date: str = '2024-01-01T10:00:00Z', additions: int = 0, deletions: int = 0
+) -> dict:
+    return {
+        'sha': sha,
+        'author': {'login': login},
+        'commit': {
+            'message': f'commit {sha}',
+            'author': {'name': login, 'date': date},
+            'committer': {'name': login, 'date': date},
+        },
+        # Only served by the single-commit route, like GitHub's
+        'stats': {'additions': additions, 'deletions': deletions, 'total': additions + deletions},
+    }
+
+
+def make_issue(
+        number: int,
+        login: str = 'octocat',
+        state: str = 'open',
+        updated_at: str = '2024-01-03T00:00:00Z',
+        created_at: Optional[str] = None,
+) -> dict:
+    return {
+        'id': number,
+        'title': f'issue {number}',
+        'state': state,
+        'created_at': created_at,
+        'updated_at': updated_at,
+        'user': {'login': login},
+    }
+
+
+def make_pull(
+        number: int,
+        login: str = 'octocat',
+        state: str = 'closed',
+        merged: bool = True,
+        updated_at: str = '2024-01-03T00:00:00Z',
+        created_at: Optional[str] = None,
+) -> dict:
+    return {
+        'id': number,
+        'title': f'pr {number}',
+        'state': state,
+        'created_at': created_at,
+        'merged_at': '2024-01-03T00:00:00Z' if merged else None,
+        'updated_at': updated_at,
+        'user': {'login': login},
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    # Room for hundreds of simultaneous connects in load tests
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FakeGitHub:
+    """
+    Threaded HTTP server serving canned GitHub resources.
+    List routes are paginated with `per_page`/`page` and answer with
+    GitHub-style `Link` headers.
+    """
+
+    def __init__(self):
+        self.objects: Dict[str, object] = {}
+        self.lists: Dict[str, List[Dict]] = {}
+        self.requests: List[Dict] = []
+        self.connections = set()
+        # Headers added to every response, e.g. rate-limit budget
+        self.extra_headers: Dict[str, str] = {}
+        # (status, body, headers) answered before any route is looked up
+        self.queued_responses: List[tuple] = []
+        # Seconds each request takes, to simulate network round-trips
+        self.latency = 0.0
+        # Nodes per page of a GraphQL connection, whatever `first` asks for
+        self.graphql_page_size = 100
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def add_object(self, path: str, obj) -> None:
+        self.objects[path] = obj
+
+    def add_list(self, path: str, items: List[Dict]) -> None:
+        self.lists[path] = items
+
+    def requests_to(self, path: str) -> List[Dict]:
+        return [r for r in self.requests if r['path'] == path]
+
+    def start(self) -> 'FakeGitHub':
+        self._server = _Server(('127.0.0.1', 0), self._handler_class())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> 'FakeGitHub':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _record(self, handler: BaseHTTPRequestHandler, path: str, query: Dict) -> Dict:
+        entry = {'path': path, 'query': query, 'headers': dict(handler.headers)}
+        with self._lock:
+            self.connections.add(handler.client_address)
+            self.requests.append(entry)
+        return entry
+
+    def _page(self, path: str, query: Dict):
+        items = [item for item in self.lists[path] if _matches(item, query)]
+        if query.get('sort') == 'updated':
+            items.sort(key=_updated_at, reverse=query.get('direction', 'desc') == 'desc')
+        per_page = int(query.get('per_page', 30))
+        page = int(query.get('page', 1))
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        for rel, number in (('next', page + 1), ('last', last)):
+            if page < last:
+                link_query = urlencode({**query, 'page': number})
+                links.append(f'<{self.url}{path}?{link_query}>; rel="{rel}"')
+        headers = {'Link': ', '.join(links)} if links else {}
+        page_items = items[(page - 1) * per_page:page * per_page]
+        return [{k: v for k, v in item.items() if k != 'stats'} for item in page_items], headers
+
+    def _commit(self, path: str) -> Optional[Dict]:
+        """A single commit of a commits list, e.g. /repos/o/r/commits/{sha}"""
+        list_path, _, sha = path.rpartition('/')
+        if not list_path.endswith('/commits'):
+            return None
+        return next((item for item in self.lists.get(list_path, []) if item.get('sha') == sha), None)
+
+    def _graphql(self, body: Dict) -> Dict:
+        """Answer the client's GraphQL operations from the REST fixtures"""
+        operation = re.search(r'query (\w+)', body['query']).group(1)
+        return getattr(self, f'_graphql_{operation}')(body.get('variables') or {})
+
+    def _connection(self, nodes: List[Dict], after: Optional[str]) -> Dict:
+        start = int(after or 0)
+        end = start + self.graphql_page_size
+        return {'nodes': nodes[start:end], 'pageInfo': {'hasNextPage': end < len(nodes), 'endCursor': str(end)}}
+
+    def _graphql_ContributorActivity(self, variables: Dict) -> Dict:
+        path = f"/repos/{variables['owner']}/{variables['repo']}"
+        if path not in self.objects:
+            return {'data': {'user': None, 'repository': None},
+                    'errors': [{'type': 'NOT_FOUND', 'message': f'Could not resolve to a Repository {path}'}]}
+        login = variables['login']
+        repository = {'defaultBranchRef': {'target': {}}}
+        if variables['withCommits']:
+            commits = [
+                {
+                    'oid': c['sha'], 'message': c['commit']['message'], 'committedDate': c['commit']['committer']['date'],
+                    'additions': c['stats']['additions'], 'deletions': c['stats']['deletions'],
+                    'author': {**c['commit']['author'], 'user': c.get('author')},
+                }
+                for c in self.lists.get(f'{path}/commits', [])
+                if f"U_{(c.get('author') or {}).get('login')}" == variables['authorId']
+                and _matches(c, {'since': variables.get('commitsSince')})
+            ]
+            repository['defaultBranchRef']['target']['history'] = self._connection(commits, variables['commitsAfter'])
+        if variables['withIssues']:
+            issues = [
+                {'databaseId': i['id'], 'title': i['title'], 'state': i['state'].upper(), 'createdAt': i.get('created_at'),
+                 'updatedAt': i.get('updated_at'), 'closedAt': i.get('closed_at'), 'author': i.get('user')}
+                for i in self.lists.get(f'{path}/issues', [])
+                if 'pull_request' not in i and _matches(i, {'creator': login, 'since': variables.get('issuesSince')})
+            ]
+            repository['issues'] = self._connection(issues, variables['issuesAfter'])
+        data = {'user': {'id': f'U_{login}'}, 'repository': repository}
+        if variables['withPulls']:
+            # Only the qualifiers of the client's pull request search
+            terms = dict(term.split(':', 1) for term in variables['pullsQuery'].split() if ':' in term)
+            pulls = [
+                {'databaseId': pr['id'], 'title': pr['title'],
+                 'state': 'MERGED' if pr.get('merged_at') else pr['state'].upper(), 'merged': bool(pr.get('merged_at')),
+                 'createdAt': pr.get('created_at'), 'updatedAt': pr.get('updated_at'), 'mergedAt': pr.get('merged_at'),
+                 'author': pr.get('user')}
+                for pr in sorted(self.lists.get(f"/repos/{terms['repo']}/pulls", []), key=_updated_at, reverse=True)
+                if _matches(pr, {'creator': terms['author'], 'since': terms.get('updated', '>=')[2:]})
+            ]
+            data['search'] = self._connection(pulls, variables['pullsAfter'])
+        return {'data': data}
+
+    def _graphql_UserRepositories(self, variables: Dict) -> Dict:
+        repositories = [
+            {'databaseId': r.get('id'), 'name': r.get('name'), 'nameWithOwner': r.get('full_name'),
+             'description': r.get('description'), 'url': r.get('html_url'),
+             'primaryLanguage': {'name': r['language']} if r.get('language') else None,
+             'owner': r.get('owner'), 'isPrivate': r.get('private', False), 'stargazerCount': r.get('stargazers_count', 0),
+             'forkCount': r.get('forks_count', 0), 'pushedAt': r.get('pushed_at'),
+             'issues': {'totalCount': r.get('open_issues_count', 0)}}
+            for r in self.lists.get('/user/repos', [])
+        ]
+        return {'data': {'viewer': {'repositories': self._connection(repositories, variables.get('after'))}}}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                self.entry = fake._record(self, parts.path, query)
+                time.sleep(fake.latency)
+                if fake.queued_responses:
+                    self._send(*fake.queued_responses.pop(0))
+                elif parts.path in fake.lists:
+                    body, headers = fake._page(parts.path, query)
+                    self._send(200, body, headers)
+                elif parts.path in fake.objects:
+                    self._send(200, fake.objects[parts.path])
+                elif fake._commit(parts.path):
+                    self._send(200, fake._commit(parts.path))
+                else:
+                    self._send(404, {'message': 'Not Found'})
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                self.entry = fake._record(self, parts.path, body.get('variables') or {})
+                time.sleep(fake.latency)
+                if fake.queued_responses:
+                    self._send(*fake.queued_responses.pop(0))
+                elif parts.path == '/graphql':
+                    self._send(200, fake._graphql(body))
+                else:
+                    self._send(404, {'message': 'Not Found'})
+
+            def _send(self, status: int, body, headers: Optional[Dict] = None):
+                payload = json.dumps(body).encode()
+                if status == 200:
+                    etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+                    headers = {**(headers or {}), 'ETag': etag}
+                    if self.headers.get('If-None-Match') == etag:
+                        status, payload = 304, b''
+                self.entry['status'] = status
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in {**fake.extra_headers, **(headers or {})}.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
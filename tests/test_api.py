@@ -0,0 +1,434 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.cache import SessionStore
+from django.test import SimpleTestCase, override_settings
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.authentication.services.oauth_service import SESSION_TOKEN_KEY, clear_token_cache, resolve_access_token
+from apps.authentication.signals import forget_token_on_change, forget_token_on_login, forget_token_on_logout
+from apps.dashboards.views import AllContributorsDashboardView, JobStatusView, UserRepositoriesView
+from social_django.models import UserSocialAuth
+
+from core.exceptions import GitHubRateLimitException, GitHubStatsPendingException, RepositoryNotFoundException
+from core.integrations.async_github_client import AsyncGitHubClient, close_async_sessions
+from core.integrations.github_client import GitHubAPIAdapter, GitHubClient
+from core.integrations.graphql_client import GitHubGraphQLAdapter, GitHubGraphQLClient
+from core.integrations.rate_limiter import RateLimitScheduler, RequestPriority
+from core.jobs import enqueue, pending_jobs
+from tests.fake_github import FakeGitHub, make_commit, make_issue, make_pull
+
+
+class GitHubClientTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+
+    def client_for(self, token: str = 'token') -> GitHubClient:
+        return GitHubClient(token, base_url=self.fake.url)
+
+    def test_follows_link_header_pagination(self):
+        commits = [make_commit(str(i)) for i in range(250)]
+        self.fake.add_list('/repos/o/r/commits', commits)
+
+        result = list(self.client_for().get_commits('o', 'r'))
+
+        self.assertEqual([c['sha'] for c in result], [c['sha'] for c in commits])
+        pages = self.fake.requests_to('/repos/o/r/commits')
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0]['query']['per_page'], '100')
+
+    def test_pages_are_fetched_lazily(self):
+        self.fake.add_list('/repos/o/r/commits', [make_commit(str(i)) for i in range(250)])
+
+        stream = self.client_for().get_commits('o', 'r')
+        next(stream)
+
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/commits')), 1)
+
+    def test_clients_for_same_token_share_a_keep_alive_connection(self):
+        self.fake.add_object('/repos/o/r', {'full_name': 'o/r'})
+
+        for _ in range(5):
+            self.client_for('shared-token').get_repository('o', 'r')
+
+        self.assertEqual(len(self.fake.connections), 1)
+        self.assertIs(self.client_for('shared-token').session, self.client_for('shared-token').session)
+        self.assertIsNot(self.client_for('shared-token').session, self.client_for('other').session)
+
+    def test_filters_pull_requests_out_of_issues(self):
+        self.fake.add_list('/repos/o/r/issues', [
+            {'id': 1, 'user': {'login': 'octocat'}},
+            {'id': 2, 'user': {'login': 'octocat'}, 'pull_request': {}},
+        ])
+
+        issues = list(self.client_for().get_issues('o', 'r', creator='octocat'))
+
+        self.assertEqual([i['id'] for i in issues], [1])
+
+    def test_missing_repository_raises(self):
+        with self.assertRaises(RepositoryNotFoundException):
+            self.client_for().get_repository('o', 'missing')
+
+    def test_statistics_still_computing_raise_without_waiting(self):
+        self.fake.queued_responses = [(202, {})]
+
+        with self.assertRaises(GitHubStatsPendingException):
+            self.client_for().get_contributor_stats('o', 'r')
+
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/stats/contributors')), 1)
+
+
+class GraphQLClientTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+        self.fake.add_object('/repos/o/r', {'id': 1, 'name': 'r', 'full_name': 'o/r'})
+        self.fake.add_list('/repos/o/r/commits', [
+            make_commit(str(i), 'alice', f'2024-01-0{i + 1}T10:00:00Z', additions=i) for i in range(3)
+        ] + [make_commit('b', 'bob')])
+        self.fake.add_list('/repos/o/r/issues', [make_issue(i, 'alice', 'closed') for i in range(3)])
+        self.fake.add_list('/repos/o/r/pulls', [
+            make_pull(10, 'alice', updated_at='2024-01-05T00:00:00Z'),
+            make_pull(11, 'bob', updated_at='2024-01-04T00:00:00Z'),
+            make_pull(12, 'alice', 'open', merged=False, updated_at='2024-01-03T00:00:00Z'),
+        ])
+
+    def graphql_client(self) -> GitHubGraphQLClient:
+        return GitHubGraphQLClient('token', url=f'{self.fake.url}/graphql')
+
+    def test_connections_are_paged_together_in_batched_queries(self):
+        self.fake.graphql_page_size = 2
+
+        activity = self.graphql_client().get_contributor_activity('o', 'r', 'alice')
+
+        self.assertEqual([c['oid'] for c in activity['commits']], ['0', '1', '2'])
+        self.assertEqual([i['databaseId'] for i in activity['issues']], [0, 1, 2])
+        self.assertEqual([pr['databaseId'] for pr in activity['pull_requests']], [10, 12])
+        # Issues and pulls, then commits with the remaining pages, then the last commits
+        self.assertEqual(len(self.fake.requests_to('/graphql')), 3)
+
+    def test_pull_requests_stop_at_since(self):
+        activity = self.graphql_client().get_contributor_activity('o', 'r', 'alice', pulls_since='2024-01-04T00:00:00Z')
+
+        self.assertEqual([pr['databaseId'] for pr in activity['pull_requests']], [10])
+
+    def test_pull_requests_of_others_are_not_paged_through(self):
+        self.fake.graphql_page_size = 2
+        self.fake.lists['/repos/o/r/pulls'] += [make_pull(100 + i, 'bob') for i in range(10)]
+
+        activity = self.graphql_client().get_contributor_activity('o', 'r', 'alice')
+
+        self.assertEqual([pr['databaseId'] for pr in activity['pull_requests']], [10, 12])
+        self.assertEqual(len(self.fake.requests_to('/graphql')), 3)
+
+    def test_commit_dates_are_in_utc(self):
+        commit = GitHubGraphQLAdapter().adapt_commit({
+            'oid': 'x', 'committedDate': '2024-01-05T01:30:00+02:00',
+            'author': {'name': 'alice', 'date': '2024-01-05T01:00:00+02:00', 'user': {'login': 'alice'}},
+        })
+
+        self.assertEqual((commit['committed_at'], commit['author']['date']),
+                         ('2024-01-04T23:30:00Z', '2024-01-04T23:00:00Z'))
+
+    def test_nodes_adapt_to_the_rest_shapes(self):
+        activity = self.graphql_client().get_contributor_activity('o', 'r', 'alice')
+        rest, graphql = GitHubAPIAdapter(), GitHubGraphQLAdapter()
+
+        self.assertEqual(graphql.adapt_commit(activity['commits'][2]),
+                         rest.adapt_commit(self.fake.lists['/repos/o/r/commits'][2]))
+        self.assertEqual(graphql.adapt_issue(activity['issues'][0]),
+                         rest.adapt_issue(self.fake.lists['/repos/o/r/issues'][0]))
+        self.assertEqual([graphql.adapt_pull_request(pr) for pr in activity['pull_requests']],
+                         [rest.adapt_pull_request(self.fake.lists['/repos/o/r/pulls'][i]) for i in (0, 2)])
+
+    def test_missing_repository_raises(self):
+        with self.assertRaises(RepositoryNotFoundException):
+            self.graphql_client().get_contributor_activity('o', 'missing', 'alice')
+
+
+class ConditionalRequestTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+        self.client = GitHubClient('etag-token', base_url=self.fake.url)
+        self.client.response_cache.clear()
+
+    def test_unchanged_pages_are_served_from_cache_on_304(self):
+        commits = [make_commit(str(i)) for i in range(150)]
+        self.fake.add_list('/repos/o/r/commits', commits)
+
+        first = list(self.client.get_commits('o', 'r'))
+        second = list(self.client.get_commits('o', 'r'))
+
+        self.assertEqual(first, second)
+        pages = self.fake.requests_to('/repos/o/r/commits')
+        self.assertEqual([p['status'] for p in pages], [200, 200, 304, 304])
+        self.assertIn('If-None-Match', pages[2]['headers'])
+        stats = self.client.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['not_modified']), (2, 2, 2))
+
+    def test_changed_page_replaces_cached_body(self):
+        self.fake.add_list('/repos/o/r/commits', [make_commit('a')])
+        list(self.client.get_commits('o', 'r'))
+
+        self.fake.add_list('/repos/o/r/commits', [make_commit('b')])
+        result = list(self.client.get_commits('o', 'r'))
+
+        self.assertEqual([c['sha'] for c in result], ['b'])
+        self.assertEqual(self.client.cache_stats()['not_modified'], 0)
+
+    def test_cache_is_scoped_per_token(self):
+        self.fake.add_object('/repos/o/r', {'full_name': 'o/r'})
+        self.client.get_repository('o', 'r')
+
+        GitHubClient('another-token', base_url=self.fake.url).get_repository('o', 'r')
+
+        self.assertNotIn('If-None-Match', self.fake.requests_to('/repos/o/r')[1]['headers'])
+
+    def test_cache_is_shared_with_the_async_client(self):
+        self.fake.add_list('/repos/o/r/commits', [make_commit('a')])
+        list(self.client.get_commits('o', 'r', since='2024-01-01T00:00:00Z'))
+
+        async def fetch():
+            try:
+                client = AsyncGitHubClient('etag-token', base_url=self.fake.url)
+                return [c async for c in client.get_commits('o', 'r', since='2024-01-01T00:00:00Z')]
+            finally:
+                await close_async_sessions()
+
+        self.assertEqual([c['sha'] for c in asyncio.run(fetch())], ['a'])
+        self.assertEqual([p['status'] for p in self.fake.requests_to('/repos/o/r/commits')], [200, 304])
+
+
+def use_fake_clock(scheduler: RateLimitScheduler) -> list:
+    """Make the scheduler sleep instantly on a clock it advances itself"""
+    now = [time.time()]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    async def asleep(seconds):
+        sleep(seconds)
+
+    scheduler.clock = lambda: now[0]
+    scheduler.sleep = sleep
+    scheduler.asleep = asleep
+    return sleeps
+
+
+class RateLimitSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.scheduler = RateLimitScheduler('scope')
+        self.sleeps = use_fake_clock(self.scheduler)
+
+    def set_budget(self, remaining: int, reset_in: int = 600):
+        state = self.scheduler.state()
+        state.update(remaining=remaining, reset=int(time.time()) + reset_in)
+        self.scheduler._save(state)
+
+    def test_interactive_requests_may_spend_the_reserve(self):
+        self.set_budget(remaining=settings.GITHUB_RATE_LIMIT_RESERVE)
+
+        self.scheduler.acquire(RequestPriority.INTERACTIVE)
+
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(self.scheduler.state()['remaining'], settings.GITHUB_RATE_LIMIT_RESERVE - 1)
+
+    def test_bulk_requests_stop_at_the_reserve(self):
+        self.set_budget(remaining=settings.GITHUB_RATE_LIMIT_RESERVE)
+
+        with self.assertRaises(GitHubRateLimitException):
+            self.scheduler.acquire(RequestPriority.BULK)
+
+    def test_bulk_requests_are_paced_once_the_burst_is_spent(self):
+        self.set_budget(remaining=settings.GITHUB_RATE_LIMIT_RESERVE + 100, reset_in=100)
+
+        for _ in range(settings.GITHUB_RATE_LIMIT_BURST + 1):
+            self.scheduler.acquire(RequestPriority.BULK)
+
+        # 90 spendable requests left over the ~100s until reset
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], 100 / 90, delta=0.05)
+
+    def test_async_requests_wait_on_the_event_loop(self):
+        self.set_budget(remaining=settings.GITHUB_RATE_LIMIT_RESERVE + 100, reset_in=100)
+        self.scheduler.sleep = mock.Mock(side_effect=AssertionError('blocked a thread'))
+
+        async def acquire():
+            for _ in range(settings.GITHUB_RATE_LIMIT_BURST + 1):
+                await self.scheduler.aacquire(RequestPriority.BULK)
+
+        asyncio.run(acquire())
+
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_available_budget_leaves_the_reserve_to_interactive_requests(self):
+        self.assertIsNone(self.scheduler.available(RequestPriority.BULK))
+        self.set_budget(remaining=settings.GITHUB_RATE_LIMIT_RESERVE + 3)
+
+        self.assertEqual(self.scheduler.available(RequestPriority.BULK), 3)
+        self.assertEqual(self.scheduler.available(RequestPriority.INTERACTIVE), settings.GITHUB_RATE_LIMIT_RESERVE + 3)
+
+    def test_state_is_shared_between_schedulers_of_a_token(self):
+        self.set_budget(remaining=42)
+
+        self.assertEqual(RateLimitScheduler('scope').state()['remaining'], 42)
+        self.assertIsNone(RateLimitScheduler('other').state()['remaining'])
+
+
+class RateLimitedClientTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+        self.fake.add_object('/repos/o/r', {'full_name': 'o/r'})
+        self.client = GitHubClient('limited-token', base_url=self.fake.url)
+        self.sleeps = use_fake_clock(self.client.rate_limiter)
+
+    def test_tracks_budget_from_response_headers(self):
+        self.fake.extra_headers = {'X-RateLimit-Remaining': '4321', 'X-RateLimit-Reset': str(int(time.time()) + 60)}
+
+        self.client.get_repository('o', 'r')
+
+        self.assertEqual(self.client.rate_limiter.state()['remaining'], 4321)
+
+    def test_backs_off_and_retries_after_secondary_rate_limit(self):
+        self.fake.queued_responses = [(403, {'message': 'secondary rate limit'}, {'Retry-After': '2'})]
+
+        repo = self.client.get_repository('o', 'r')
+
+        self.assertEqual(repo['full_name'], 'o/r')
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], 2, delta=0.1)
+
+    def test_gives_up_when_limit_outlasts_max_wait(self):
+        reset = str(int(time.time()) + 3600)
+        self.fake.queued_responses = [
+            (403, {'message': 'API rate limit exceeded'}, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}),
+        ]
+
+        with self.assertRaises(GitHubRateLimitException):
+            self.client.get_repository('o', 'r')
+
+
+class ConcurrentPaginationTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+        self.client = GitHubClient('pages-token', base_url=self.fake.url)
+        self.client.response_cache.clear()
+
+    def test_remaining_pages_are_fetched_concurrently_in_order(self):
+        commits = [make_commit(str(i)) for i in range(500)]
+        self.fake.add_list('/repos/o/r/commits', commits)
+        self.fake.latency = 0.2
+
+        started = time.monotonic()
+        result = list(self.client.get_commits('o', 'r', author='octocat'))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual([c['sha'] for c in result], [c['sha'] for c in commits])
+        # First page, then pages 2-5 together, instead of five round-trips
+        self.assertLess(elapsed, 0.8)
+        pages = self.fake.requests_to('/repos/o/r/commits')
+        self.assertEqual(sorted(p['query']['page'] for p in pages[1:]), ['2', '3', '4', '5'])
+        self.assertTrue(all(p['query']['author'] == 'octocat' for p in pages))
+
+
+class JobEndpointTests(SimpleTestCase):
+    def get_job(self, job_id: str, user: User):
+        request = APIRequestFactory().get(f'/api/jobs/{job_id}/')
+        force_authenticate(request, user=user)
+        return JobStatusView.as_view()(request, job_id=job_id)
+
+    def test_generate_all_is_not_routed_as_a_username(self):
+        match = resolve('/api/dashboard/o/r/generate-all/')
+
+        self.assertIs(match.func.view_class, AllContributorsDashboardView)
+
+    def test_owner_can_poll_their_job(self):
+        job = enqueue('noop', lambda job: {'count': 0}, user_id=1)
+        for future in pending_jobs():
+            future.result(timeout=5)
+
+        response = self.get_job(job.id, User(id=1, username='alice'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['status'], response.data['result']), ('succeeded', {'count': 0}))
+        self.assertNotIn('user_id', response.data)
+
+    def test_other_users_jobs_are_hidden(self):
+        job = enqueue('noop', lambda job: None, user_id=1)
+
+        response = self.get_job(job.id, User(id=2, username='bob'))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class AccessTokenResolutionTests(SimpleTestCase):
+    def setUp(self):
+        clear_token_cache()
+        caches['shared'].clear()
+        self.user = User(id=1, username='alice')
+        self.session = SessionStore()
+        self.session.save()
+        self.lookup = mock.patch(
+            'apps.authentication.services.oauth_service.UserSocialAuth.objects.get',
+            return_value=SimpleNamespace(extra_data={'access_token': 'token'}),
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_token_is_looked_up_once_per_session(self):
+        tokens = [resolve_access_token(self.user, self.session) for _ in range(3)]
+        # Another worker process: nothing cached in-process, but the session has it
+        clear_token_cache()
+        tokens.append(resolve_access_token(self.user, self.session))
+
+        self.assertEqual(tokens, ['token'] * 4)
+        self.assertEqual(self.lookup.call_count, 1)
+
+    def test_logout_and_login_forget_the_token(self):
+        for receiver in (forget_token_on_logout, forget_token_on_login):
+            resolve_access_token(self.user, self.session)
+            receiver(sender=User, request=SimpleNamespace(session=self.session), user=self.user)
+
+            self.assertNotIn(SESSION_TOKEN_KEY, self.session)
+
+        resolve_access_token(self.user, self.session)
+        self.assertEqual(self.lookup.call_count, 3)
+
+    def test_oauth_changes_reach_every_session(self):
+        other_session = SessionStore()
+        other_session.save()
+        resolve_access_token(self.user, self.session)
+        resolve_access_token(self.user, other_session)
+        self.lookup.return_value = SimpleNamespace(extra_data={'access_token': 'reconnected'})
+
+        # Changed in another worker: this one's in-process cache is not told
+        with mock.patch('apps.authentication.services.oauth_service._tokens.invalidate'):
+            forget_token_on_change(sender=UserSocialAuth, instance=SimpleNamespace(user_id=self.user.id))
+
+        self.assertEqual(resolve_access_token(self.user, self.session), 'reconnected')
+        self.assertEqual(resolve_access_token(self.user, other_session), 'reconnected')
+        self.assertEqual(self.session[SESSION_TOKEN_KEY]['token'], 'reconnected')
+
+    def test_views_get_the_token_from_authentication(self):
+        self.lookup.side_effect = UserSocialAuth.DoesNotExist
+        request = APIRequestFactory().get('/api/repositories/')
+        request.user = self.user
+        request.session = self.session
+
+        response = UserRepositoriesView.as_view()(request)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data, {'error': 'GitHub account not connected'})
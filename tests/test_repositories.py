@@ -0,0 +1,340 @@
+import threading
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from bson import ObjectId
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from apps.dashboards.serializers import ContributorSerializer
+from core import database
+from core.repositories import get_repository
+from core.repositories.activity_repository import IssueRepository
+from core.repositories.commit_stats_repository import CommitStatsRepository
+from core.repositories.contributor_repository import ContributorRepository
+from core.repositories.repo_repository import RepositoryRepository
+from core.repositories.base_repository import (
+    ActivityRepository as MongoActivityRepository,
+    CommitRepository as MongoCommitRepository,
+    CommitStatsRepository as MongoCommitStatsRepository,
+    MetricSnapshotRepository as MongoMetricSnapshotRepository,
+    ContributorRepository as MongoContributorRepository,
+    RepositoryRepository as MongoRepositoryRepository,
+)
+
+
+class MongoClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        database.close_mongo_client()
+        self.addCleanup(database.close_mongo_client)
+
+    def test_repositories_share_one_client(self):
+        contributors = MongoContributorRepository()
+        repositories = MongoRepositoryRepository()
+
+        self.assertIs(contributors.client, repositories.client)
+        self.assertIs(contributors.client, database.get_mongo_client())
+        self.assertEqual(contributors.collection.name, 'contributors')
+        self.assertEqual(contributors.db.name, settings.MONGODB_SETTINGS['NAME'])
+
+    @override_settings(MONGODB_SETTINGS={
+        **settings.MONGODB_SETTINGS, 'MAX_POOL_SIZE': 7, 'READ_PREFERENCE': 'secondaryPreferred',
+    })
+    def test_client_options_come_from_settings(self):
+        client = database.get_mongo_client()
+
+        self.assertEqual(client.options.pool_options.max_pool_size, 7)
+        self.assertEqual(client.read_preference.mongos_mode, 'secondaryPreferred')
+
+    def test_client_is_recreated_after_fork(self):
+        parent = database.get_mongo_client()
+        self.addCleanup(parent.close)
+
+        database._reset_after_fork()
+
+        self.assertIsNot(database.get_mongo_client(), parent)
+
+
+class MongoBulkUpsertTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(database.close_mongo_client)
+        self.repository = MongoContributorRepository()
+        self.repository.collection = mock.Mock()
+        self.repository.collection.bulk_write.side_effect = lambda ops, ordered: mock.Mock(
+            bulk_api_result={'nMatched': 1, 'nModified': 1, 'nUpserted': len(ops) - 1}
+        )
+
+    def test_sends_unordered_upsert_batches(self):
+        contributors = [{'login': f'user{i}', 'repository': 'o/r', 'contributions': i} for i in range(5)]
+
+        counts = self.repository.bulk_upsert(contributors, batch_size=2)
+
+        calls = self.repository.collection.bulk_write.call_args_list
+        self.assertEqual([len(c.args[0]) for c in calls], [2, 2, 1])
+        self.assertTrue(all(c.kwargs['ordered'] is False for c in calls))
+        first = calls[0].args[0][0]
+        self.assertIsInstance(first, UpdateOne)
+        self.assertEqual(first._filter, {'repository': 'o/r', 'username': 'user0'})
+        self.assertTrue(first._upsert)
+        self.assertEqual(counts, {'matched': 3, 'modified': 3, 'upserted': 2, 'errors': 0})
+
+    def test_counts_partial_failures(self):
+        self.repository.collection.bulk_write.side_effect = BulkWriteError({
+            'nMatched': 0, 'nModified': 0, 'nUpserted': 1, 'writeErrors': [{'index': 1}],
+        })
+
+        counts = self.repository.bulk_upsert([
+            {'username': 'a', 'repository': 'o/r'},
+            {'username': 'b', 'repository': 'o/r'},
+        ])
+
+        self.assertEqual(counts, {'matched': 0, 'modified': 0, 'upserted': 1, 'errors': 1})
+
+    def test_repositories_are_keyed_by_full_name(self):
+        repositories = MongoRepositoryRepository()
+        repositories.collection = self.repository.collection
+
+        repositories.bulk_upsert([{'full_name': 'o/a'}, {'full_name': 'o/b'}, {'name': 'no-full-name'}])
+
+        operations = repositories.collection.bulk_write.call_args.args[0]
+        self.assertEqual([op._filter for op in operations], [{'full_name': 'o/a'}, {'full_name': 'o/b'}])
+
+    def test_commit_stats_are_only_written_on_insert(self):
+        commit_stats = MongoCommitStatsRepository()
+        commit_stats.collection = self.repository.collection
+
+        commit_stats.bulk_insert({'abc': {'additions': 3, 'deletions': 1}})
+
+        operation = commit_stats.collection.bulk_write.call_args.args[0][0]
+        self.assertEqual(operation._filter, {'sha': 'abc'})
+        self.assertEqual(list(operation._doc), ['$setOnInsert'])
+        self.assertTrue(operation._upsert)
+
+
+    def test_metric_series_is_one_range_query_on_the_compound_index(self):
+        snapshots = MongoMetricSnapshotRepository()
+        snapshots.collection = mock.MagicMock()
+        cursor = snapshots.collection.find.return_value.sort.return_value
+        cursor.__iter__.return_value = iter([{'period': '2024-01-01', 'metrics': {'stars': 4}}])
+
+        series = snapshots.get_series('o/r', None, 'month', 'stars', '2024-01-01', '2024-06-30')
+
+        snapshots.collection.find.assert_called_once_with(
+            {'repository': 'o/r', 'username': None, 'granularity': 'month',
+             'period': {'$gte': '2024-01-01', '$lte': '2024-06-30'}},
+            {'_id': 0, 'period': 1, 'metrics.stars': 1},
+        )
+        self.assertEqual(series, [{'period': '2024-01-01', 'value': 4}])
+
+    def test_contributor_activity_is_grouped_by_day_server_side(self):
+        activity = MongoActivityRepository()
+        activity.collection = mock.MagicMock()
+        activity.collection.aggregate.return_value = iter([
+            {'_id': {'day': '2024-01-01', 'kind': 'commit'}, 'count': 2, 'additions': 15, 'deletions': 2},
+            {'_id': {'day': '2024-01-01', 'kind': 'issue', 'status': 'open'}, 'count': 1, 'additions': 0,
+             'deletions': 0},
+            {'_id': {'day': None, 'kind': 'pull_request', 'status': 'merged'}, 'count': 2, 'additions': 0,
+             'deletions': 0},
+        ])
+
+        days = activity.aggregate_daily_activity('o/r', 'alice')
+
+        pipeline = activity.collection.aggregate.call_args.args[0]
+        self.assertEqual(pipeline[0], {'$match': {'repository': 'o/r', 'author': 'alice'}})
+        self.assertEqual([stage['$unionWith']['coll'] for stage in pipeline[2:4]], ['issues', 'pull_requests'])
+        self.assertEqual(pipeline[-1]['$group']['_id'], {'day': '$day', 'kind': '$kind', 'status': '$status'})
+        self.assertEqual((days['2024-01-01']['commits_total'], days['2024-01-01']['additions']), (2, 15))
+        self.assertEqual((days['2024-01-01']['issues_total'], days['2024-01-01']['issues_open']), (1, 1))
+        self.assertEqual((days[None]['prs_total'], days[None]['prs_merged']), (2, 2))
+
+    def test_raw_activity_is_upserted_by_repository_and_sha(self):
+        commits = MongoCommitRepository()
+        commits.collection = self.repository.collection
+
+        commits.bulk_upsert([{'repository': 'o/r', 'sha': 'abc', 'author': 'alice'}, {'repository': 'o/r'}])
+
+        operations = commits.collection.bulk_write.call_args.args[0]
+        self.assertEqual([op._filter for op in operations], [{'repository': 'o/r', 'sha': 'abc'}])
+        self.assertTrue(operations[0]._upsert)
+
+
+class MongoQueryTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(database.close_mongo_client)
+        self.repository = MongoContributorRepository()
+        self.repository.collection = mock.MagicMock()
+        self.cursor = self.repository.collection.find.return_value
+        self.cursor.sort.return_value = self.cursor
+        self.cursor.limit.return_value = self.cursor
+        self.cursor.__iter__.return_value = iter([{'_id': ObjectId('0' * 24), 'username': 'alice'}])
+
+    def test_repository_listing_uses_summary_projection(self):
+        result = self.repository.get_by_repository('o/r')
+
+        self.repository.collection.find.assert_called_once_with(
+            {'repository': 'o/r'}, MongoContributorRepository.SUMMARY_FIELDS
+        )
+        self.assertEqual(result, [{'_id': '0' * 24, 'username': 'alice'}])
+
+    def test_cursor_pagination_continues_after_last_id(self):
+        last_id = str(ObjectId())
+
+        self.repository.get_all({'repository': 'o/r'}, ['username'], limit=50, after=last_id)
+
+        query = self.repository.collection.find.call_args.args[0]
+        self.assertEqual(query, {'repository': 'o/r', '_id': {'$gt': ObjectId(last_id)}})
+        self.cursor.sort.assert_called_once_with('_id', 1)
+        self.cursor.limit.assert_called_once_with(50)
+
+    def test_ensure_indexes_command_creates_declared_indexes(self):
+        with mock.patch('pymongo.collection.Collection.create_indexes', return_value=['idx']) as create:
+            call_command('ensure_indexes', stdout=StringIO())
+
+        created = [index.document['name'] for call in create.call_args_list for index in call.args[0]]
+        self.assertEqual(created, [
+            'repository_username', 'full_name', 'owner', 'sha', 'repository_username_granularity_period', 'expire_at',
+            'repository_sha', 'repository_author_date', 'repository_id', 'repository_author_date',
+            'repository_id', 'repository_author_date',
+        ])
+        unique = MongoContributorRepository.indexes[0].document
+        self.assertEqual((unique['key'], unique['unique']), ({'repository': 1, 'username': 1}, True))
+
+
+class InMemoryContributorRepositoryTests(SimpleTestCase):
+    def setUp(self):
+        self.repository = ContributorRepository()
+        self.repository.clear()
+        self.addCleanup(self.repository.clear)
+
+    def test_bulk_upsert_keeps_previously_stored_contributors(self):
+        self.repository.bulk_upsert([{'login': 'alice', 'repository': 'o/r', 'contributions': 1}])
+
+        counts = self.repository.bulk_upsert([
+            {'login': 'alice', 'repository': 'o/r', 'contributions': 5},
+            {'login': 'bob', 'repository': 'o/r', 'contributions': 2},
+        ])
+
+        self.assertEqual((counts['matched'], counts['upserted']), (1, 1))
+        stored = {c['username']: c['contributions'] for c in self.repository.get_by_repository('o/r')}
+        self.assertEqual(stored, {'alice': 5, 'bob': 2})
+
+    def test_upsert_merges_into_the_stored_contributor(self):
+        self.repository.bulk_upsert([{'login': 'alice', 'repository': 'o/r', 'contributions': 1}])
+
+        self.repository.upsert_contributor('alice', 'o/r', {'metrics': {'commits': {'total': 3}}})
+
+        stored = self.repository.get_by_username_and_repo('alice', 'o/r')
+        self.assertEqual((stored['contributions'], stored['metrics']), (1, {'commits': {'total': 3}}))
+        self.assertEqual(self.repository.get_by_id(stored['_id'])['username'], 'alice')
+
+    def test_conditional_upsert_only_writes_over_the_expected_state(self):
+        self.assertTrue(self.repository.upsert_if_unchanged('alice', 'o/r', {'sync_state': {'version': 1}}, 0))
+
+        self.assertFalse(self.repository.upsert_if_unchanged('alice', 'o/r', {'sync_state': {'version': 2}}, 0))
+        self.assertTrue(self.repository.upsert_if_unchanged('alice', 'o/r', {'sync_state': {'version': 2}}, 1))
+        self.assertEqual(self.repository.get_by_username_and_repo('alice', 'o/r')['sync_state'], {'version': 2})
+
+    def test_summary_projection_serializes(self):
+        self.repository.bulk_upsert([{
+            'login': 'alice', 'repository': 'o/r', 'avatar_url': 'https://avatars.example.com/alice',
+            'profile_url': 'https://github.com/alice', 'contributions': 3, 'sync_state': {'version': 1},
+        }])
+
+        summary = self.repository.get_by_repository('o/r')[0]
+
+        for fields in (ContributorRepository.SUMMARY_FIELDS, MongoContributorRepository.SUMMARY_FIELDS):
+            self.assertEqual(set(fields), set(ContributorSerializer().fields))
+        self.assertEqual(ContributorSerializer(summary).data['profile_url'], 'https://github.com/alice')
+        self.assertNotIn('sync_state', summary)
+
+    def test_repository_listing_uses_the_secondary_index_and_projection(self):
+        self.repository.bulk_upsert([
+            {'login': f'user{i}', 'repository': 'o/a' if i % 2 else 'o/b', 'dashboard': {}} for i in range(6)
+        ])
+
+        first_page = self.repository.get_by_repository('o/a', limit=2)
+        second_page = self.repository.get_by_repository('o/a', limit=2, after=first_page[-1]['_id'])
+
+        self.assertEqual([c['username'] for c in first_page + second_page], ['user1', 'user3', 'user5'])
+        self.assertNotIn('dashboard', first_page[0])
+        self.assertEqual(len(self.repository.get_all({'repository': 'o/b'}, skip=1)), 2)
+
+    def test_concurrent_upserts_do_not_duplicate_contributors(self):
+        def upsert(worker):
+            for i in range(50):
+                self.repository.upsert_contributor(f'user{i}', 'o/r', {'worker': worker})
+
+        threads = [threading.Thread(target=upsert, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.repository.get_by_repository('o/r')), 50)
+
+    def test_instances_share_the_collection(self):
+        self.repository.upsert_contributor('alice', 'o/r', {})
+
+        self.assertIsNotNone(ContributorRepository().get_by_username_and_repo('alice', 'o/r'))
+        self.assertIsInstance(get_repository('contributors', 'memory'), ContributorRepository)
+
+
+class InMemoryRepositoryRepositoryTests(SimpleTestCase):
+    def setUp(self):
+        self.repository = RepositoryRepository()
+        self.repository.clear()
+        self.addCleanup(self.repository.clear)
+
+    def test_upsert_and_owner_index(self):
+        self.repository.bulk_upsert([{'full_name': 'o/a', 'owner': 'o'}, {'full_name': 'p/b', 'owner': 'p'}])
+        self.repository.upsert_repository('o/a', {'owner': 'q', 'stars': 3})
+
+        self.assertEqual(self.repository.get_by_full_name('o/a')['stars'], 3)
+        self.assertEqual([r['full_name'] for r in self.repository.get_by_owner('q')], ['o/a'])
+        self.assertEqual(self.repository.get_by_owner('o'), [])
+
+
+class InMemoryCommitStatsRepositoryTests(SimpleTestCase):
+    def setUp(self):
+        self.repository = CommitStatsRepository()
+        self.repository.clear()
+
+    def test_known_stats_are_never_overwritten(self):
+        self.repository.bulk_insert({'a': {'additions': 3, 'deletions': 1}})
+
+        counts = self.repository.bulk_insert({'a': {'additions': 0, 'deletions': 0},
+                                              'b': {'additions': 2, 'deletions': 2}})
+
+        self.assertEqual((counts['matched'], counts['upserted']), (1, 1))
+        self.assertEqual(self.repository.get_by_shas(['a', 'b', 'unknown']), {
+            'a': {'additions': 3, 'deletions': 1},
+            'b': {'additions': 2, 'deletions': 2},
+        })
+
+
+class InMemoryRawActivityRepositoryTests(SimpleTestCase):
+    def setUp(self):
+        self.repository = IssueRepository()
+        self.repository.clear()
+        self.addCleanup(self.repository.clear)
+
+    def test_refetched_items_replace_the_stored_ones(self):
+        self.repository.bulk_upsert([
+            {'repository': 'o/r', 'id': 1, 'author': 'alice', 'date': datetime(2024, 1, 2), 'state': 'open'},
+            {'repository': 'o/r', 'id': 2, 'author': 'alice', 'date': datetime(2024, 1, 1), 'state': 'open'},
+            {'repository': 'o/s', 'id': 1, 'author': 'alice', 'date': datetime(2024, 1, 3), 'state': 'open'},
+        ])
+
+        counts = self.repository.bulk_upsert([
+            {'repository': 'o/r', 'id': 1, 'author': 'alice', 'date': datetime(2024, 1, 2), 'state': 'closed'},
+        ])
+
+        self.assertEqual((counts['matched'], counts['upserted']), (1, 0))
+        stored = self.repository.get_by_author('o/r', 'alice')
+        self.assertEqual([(i['id'], i['state']) for i in stored], [(2, 'open'), (1, 'closed')])
+        self.assertEqual([i['id'] for i in self.repository.get_by_author('o/r', 'alice', start=datetime(2024, 1, 2))],
+                         [1])
@@ -0,0 +1,1025 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.dashboards.services.activity_store import ActivityStore
+from apps.dashboards.services.activity_windows import clear_activity_windows
+from apps.dashboards.services.dashboard_cache import (
+    DashboardCache,
+    clear_local_dashboard_cache,
+    dashboard_cache_stats,
+    invalidate_dashboards,
+)
+from apps.dashboards.services.dashboard_service import DashboardService
+from apps.dashboards.services.metric_snapshots import MetricSnapshots
+from apps.dashboards.services.metrics_aggregator import MetricsAccumulator
+from apps.dashboards.async_views import ContributorDashboardAsyncView, RepositoryContributorsAsyncView
+from apps.dashboards.services.async_dashboard_service import AsyncDashboardService
+from apps.dashboards.views import (
+    AllContributorsDashboardStreamView,
+    ContributorDashboardView,
+    GitHubWebhookView,
+    MetricHistoryView,
+    RepositoryContributorsView,
+    RepositoryStatsView,
+    UserRepositoriesView,
+)
+from core.integrations.async_github_client import close_async_sessions
+from core.integrations.github_client import GitHubAPIAdapter
+from core.jobs import JobStatus, enqueue, get_job, pending_jobs
+from core.repositories import get_repository
+from core.singleflight import SingleFlight
+from tests.fake_github import FakeGitHub, make_commit, make_issue, make_pull
+
+
+class FakeGitHubTestCase(SimpleTestCase):
+    """Runs services against a fake GitHub serving a small repository"""
+
+    def setUp(self):
+        caches['shared'].clear()
+        clear_local_dashboard_cache()
+        clear_activity_windows()
+        get_repository('contributors').clear()
+        get_repository('repositories').clear()
+        get_repository('commit_stats').clear()
+        get_repository('metric_snapshots').clear()
+        get_repository('activity').clear()
+        self.fake = FakeGitHub().start()
+        self.addCleanup(self.fake.stop)
+        settings_override = override_settings(GITHUB_API_BASE_URL=self.fake.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.fake.add_object('/repos/o/r', {'id': 1, 'name': 'r', 'full_name': 'o/r', 'owner': {'login': 'o'}})
+        self.fake.add_list('/repos/o/r/contributors', [
+            {'id': 1, 'login': 'alice', 'contributions': 3},
+            {'id': 2, 'login': 'bob', 'contributions': 1},
+        ])
+        self.fake.add_list('/repos/o/r/commits', [
+            make_commit('a1', 'alice', '2024-01-01T10:00:00Z', additions=10, deletions=2),
+            make_commit('a2', 'alice', '2024-01-01T12:00:00Z', additions=5),
+            make_commit('a3', 'alice', '2024-01-02T09:00:00Z', additions=1, deletions=1),
+            make_commit('b1', 'bob', '2024-01-02T11:00:00Z', additions=7, deletions=3),
+        ])
+        self.fake.add_list('/repos/o/r/issues', [
+            make_issue(10, 'alice', 'open'),
+            make_issue(11, 'alice', 'closed'),
+            make_issue(12, 'bob', 'closed'),
+        ])
+        self.fake.add_list('/repos/o/r/pulls', [
+            make_pull(20, 'alice', 'closed', merged=True),
+            make_pull(21, 'alice', 'open', merged=False),
+            make_pull(22, 'bob', 'closed', merged=False),
+        ])
+        for login in ('alice', 'bob'):
+            self.fake.add_object(f'/users/{login}/events', [{'type': 'PushEvent'}])
+
+
+class GenerateContributorDashboardTests(FakeGitHubTestCase):
+    def test_builds_metrics_and_charts(self):
+        dashboard = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        metrics = dashboard['metrics']
+        self.assertEqual(metrics['commits']['total'], 3)
+        self.assertEqual((metrics['issues']['opened'], metrics['issues']['closed']), (1, 1))
+        self.assertEqual((metrics['pull_requests']['merged'], metrics['pull_requests']['open']), (1, 1))
+        self.assertEqual(dashboard['charts']['commits_timeline'], [
+            {'date': '2024-01-01', 'count': 2},
+            {'date': '2024-01-02', 'count': 1},
+        ])
+        self.assertEqual(dashboard['recent_activity'], [{'type': 'PushEvent'}])
+
+    def test_endpoints_are_fetched_concurrently(self):
+        self.fake.latency = 0.3
+
+        started = time.monotonic()
+        DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        # Four sequential fetches would take 1.2s
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+class GenerateAllContributorsDashboardsTests(FakeGitHubTestCase):
+    def test_fetches_history_once_for_all_contributors(self):
+        dashboards = DashboardService('token').generate_all_contributors_dashboards('o', 'r')
+
+        self.assertEqual([d['username'] for d in dashboards], ['alice', 'bob'])
+        for path in ('/repos/o/r/commits', '/repos/o/r/issues', '/repos/o/r/pulls'):
+            requests = self.fake.requests_to(path)
+            self.assertEqual(len(requests), 1)
+            self.assertNotIn('author', requests[0]['query'])
+
+    def test_matches_per_contributor_dashboards(self):
+        service = DashboardService('token')
+        bulk = {d['username']: d for d in service.generate_all_contributors_dashboards('o', 'r')}
+
+        for username in ('alice', 'bob'):
+            single = service.generate_contributor_dashboard('o', 'r', username)
+            self.assertEqual(bulk[username]['metrics'], single['metrics'])
+            self.assertEqual(bulk[username]['charts'], single['charts'])
+
+
+class IncrementalSyncTests(FakeGitHubTestCase):
+    def test_regeneration_fetches_only_newer_activity(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        self.fake.lists['/repos/o/r/commits'].append(make_commit('a4', 'alice', '2024-01-05T10:00:00Z'))
+        self.fake.lists['/repos/o/r/issues'][0] = make_issue(
+            10, 'alice', 'closed', updated_at='2024-01-06T00:00:00Z', created_at='2024-01-01T00:00:00Z'
+        )
+        self.fake.lists['/repos/o/r/pulls'].append(make_pull(
+            23, 'alice', updated_at='2024-01-06T00:00:00Z', created_at='2024-01-06T00:00:00Z'
+        ))
+
+        dashboard = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        commits_query = self.fake.requests_to('/repos/o/r/commits')[-1]['query']
+        self.assertEqual(commits_query['since'], '2024-01-01T09:00:00Z')
+        self.assertEqual(self.fake.requests_to('/repos/o/r/issues')[-1]['query']['since'], '2024-01-03T00:00:00Z')
+        self.assertEqual(self.fake.requests_to('/repos/o/r/pulls')[-1]['query']['sort'], 'updated')
+        metrics = dashboard['metrics']
+        self.assertEqual(metrics['commits']['total'], 4)
+        self.assertEqual((metrics['issues']['total'], metrics['issues']['opened'], metrics['issues']['closed']),
+                         (2, 0, 2))
+        self.assertEqual((metrics['pull_requests']['total'], metrics['pull_requests']['merged']), (3, 2))
+
+    @override_settings(DASHBOARD_SYNC_COMMIT_OVERLAP=0)
+    def test_bulk_generation_resumes_from_repository_marks(self):
+        service = DashboardService('token')
+        service.generate_all_contributors_dashboards('o', 'r')
+        self.fake.lists['/repos/o/r/commits'].append(make_commit('b2', 'bob', '2024-01-04T10:00:00Z'))
+
+        dashboards = {d['username']: d for d in service.generate_all_contributors_dashboards('o', 'r')}
+
+        self.assertEqual(self.fake.requests_to('/repos/o/r/commits')[-1]['query']['since'], '2024-01-02T11:00:00Z')
+        self.assertEqual(dashboards['alice']['metrics']['commits']['total'], 3)
+        self.assertEqual(dashboards['bob']['metrics']['commits']['total'], 2)
+        cursor = service.repo_repository.get_by_full_name('o/r')['sync_cursor']
+        self.assertEqual(cursor['commits'], '2024-01-04T10:00:00Z')
+        self.assertEqual(cursor['commit_shas'], {'b2': '2024-01-04T10:00:00Z'})
+
+    def test_new_contributor_catches_up_on_full_history(self):
+        service = DashboardService('token')
+        service.generate_all_contributors_dashboards('o', 'r')
+        self.fake.lists['/repos/o/r/contributors'].append({'id': 3, 'login': 'carol', 'contributions': 1})
+        self.fake.add_object('/users/carol/events', [])
+        self.fake.lists['/repos/o/r/commits'].insert(0, make_commit('c1', 'carol', '2023-12-01T10:00:00Z'))
+
+        dashboards = {d['username']: d for d in service.generate_all_contributors_dashboards('o', 'r')}
+
+        self.assertEqual(dashboards['carol']['metrics']['commits']['total'], 1)
+        self.assertEqual(dashboards['alice']['metrics']['commits']['total'], 3)
+
+    def test_sync_skips_contributors_when_nothing_was_pushed(self):
+        self.fake.objects['/repos/o/r'] = {**self.fake.objects['/repos/o/r'], 'pushed_at': '2024-01-02T11:00:00Z'}
+        service = DashboardService('token')
+        service.sync_repository_data('o', 'r')
+
+        service.sync_repository_data('o', 'r')
+
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/contributors')), 1)
+
+
+class CommitStatsTests(FakeGitHubTestCase):
+    def commit_requests(self) -> list:
+        return [r for r in self.fake.requests if r['path'].startswith('/repos/o/r/commits/')]
+
+    def test_line_changes_come_from_single_commit_requests(self):
+        dashboard = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics']['commits'], {'total': 3, 'additions': 16, 'deletions': 3,
+                                                           'net_change': 13, 'pending_line_stats': 0})
+        self.assertEqual(sorted(r['path'] for r in self.commit_requests()),
+                         ['/repos/o/r/commits/a1', '/repos/o/r/commits/a2', '/repos/o/r/commits/a3'])
+
+    def test_each_commit_is_fetched_once(self):
+        DashboardService('token').generate_all_contributors_dashboards('o', 'r')
+        # A full rebuild, e.g. by another user: stats still come from the store
+        get_repository('contributors').clear()
+        get_repository('repositories').clear()
+
+        dashboards = {d['username']: d for d in
+                      DashboardService('other-token').generate_all_contributors_dashboards('o', 'r')}
+
+        self.assertEqual(len(self.commit_requests()), 4)
+        self.assertEqual(dashboards['bob']['metrics']['commits']['additions'], 7)
+
+    def test_commits_beyond_the_budget_are_resolved_by_later_builds(self):
+        service = DashboardService('token')
+        with mock.patch.object(service.commit_stats, 'budget', return_value=1):
+            partial = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        dashboard = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        commits = partial['metrics']['commits']
+        self.assertEqual((commits['total'], commits['pending_line_stats']), (3, 1))
+        self.assertEqual(len(self.commit_requests()), 3)
+        self.assertEqual(dashboard['metrics']['commits'], {'total': 3, 'additions': 16, 'deletions': 3,
+                                                           'net_change': 13, 'pending_line_stats': 0})
+        self.assertEqual(service.get_contributor_dashboard_window('o', 'r', 'alice')['metrics']['commits']['additions'],
+                         16)
+
+
+class RepositoryStatsTests(FakeGitHubTestCase):
+    def add_statistics(self):
+        # Week of Sunday 2023-12-31
+        week = 1703980800
+        self.fake.add_object('/repos/o/r/stats/contributors', [
+            {'author': {'login': 'bob'}, 'total': 1, 'weeks': [{'w': week, 'a': 7, 'd': 3, 'c': 1}]},
+            {'author': {'login': 'alice'}, 'total': 3,
+             'weeks': [{'w': week - 604800, 'a': 0, 'd': 0, 'c': 0}, {'w': week, 'a': 16, 'd': 3, 'c': 3}]},
+        ])
+        self.fake.add_object('/repos/o/r/stats/commit_activity', [
+            {'week': week, 'total': 4, 'days': [0, 2, 2, 0, 0, 0, 0]},
+        ])
+        self.fake.add_object('/repos/o/r/stats/code_frequency', [[week, 23, -6]])
+
+    def test_weekly_numbers_come_from_statistics(self):
+        self.add_statistics()
+
+        stats = DashboardService('token').get_repository_stats('o', 'r')
+
+        self.assertEqual(stats['source'], 'statistics')
+        self.assertEqual([c['login'] for c in stats['contributors']], ['alice', 'bob'])
+        self.assertEqual(stats['contributors'][0]['timeline'], [
+            {'date': '2023-12-31', 'commits': 3, 'additions': 16, 'deletions': 3},
+        ])
+        self.assertEqual(stats['code_frequency'], [{'date': '2023-12-31', 'additions': 23, 'deletions': 6}])
+        self.assertEqual(self.fake.requests_to('/repos/o/r/commits'), [])
+
+    def test_daily_numbers_are_counted_from_history(self):
+        self.add_statistics()
+
+        stats = DashboardService('token').get_repository_stats('o', 'r', granularity='day')
+
+        self.assertEqual(stats['source'], 'history')
+        alice = stats['contributors'][0]
+        self.assertEqual((alice['login'], alice['commits'], alice['additions']), ('alice', 3, 16))
+        self.assertEqual(alice['timeline'], [
+            {'date': '2024-01-01', 'commits': 2, 'additions': 15, 'deletions': 2},
+            {'date': '2024-01-02', 'commits': 1, 'additions': 1, 'deletions': 1},
+        ])
+        self.assertEqual(self.fake.requests_to('/repos/o/r/stats/contributors'), [])
+
+    @override_settings(GITHUB_STATS_RETRY_AFTER=7)
+    def test_statistics_still_computing_are_retried_later(self):
+        self.add_statistics()
+        self.fake.queued_responses = [(202, {})]
+        request = APIRequestFactory().get('/api/repositories/o/r/stats/')
+        force_authenticate(request, user=User(id=1, username='alice'), token='token')
+
+        response = RepositoryStatsView.as_view()(request, owner='o', repo='r')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((response.data['status'], response['Retry-After']), ('pending', '7'))
+        # Each statistic was asked for once, so GitHub computes all three meanwhile
+        self.assertEqual(len([r for r in self.fake.requests if '/stats/' in r['path']]), 3)
+        self.assertEqual(self.fake.requests_to('/repos/o/r/commits'), [])
+
+
+class GraphQLFetchModeTests(FakeGitHubTestCase):
+    def setUp(self):
+        super().setUp()
+        graphql = override_settings(GITHUB_FETCH_MODE='graphql', GITHUB_GRAPHQL_URL=f'{self.fake.url}/graphql')
+        graphql.enable()
+        self.addCleanup(graphql.disable)
+
+    def test_dashboard_matches_rest_fetch(self):
+        self.fake.graphql_page_size = 2
+        dashboard = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+        get_repository('contributors').clear()
+
+        with override_settings(GITHUB_FETCH_MODE='rest'):
+            expected = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics'], expected['metrics'])
+        self.assertEqual(dashboard['charts'], expected['charts'])
+        self.assertEqual(len(self.fake.requests_to('/graphql')), 3)
+        # Line changes came with the GraphQL commits, so REST needed no single-commit requests
+        self.assertFalse([r for r in self.fake.requests if r['path'].startswith('/repos/o/r/commits/')])
+
+    def test_async_dashboard_matches_rest_fetch(self):
+        async def generate():
+            try:
+                return await AsyncDashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+            finally:
+                await close_async_sessions()
+
+        dashboard = asyncio.run(generate())
+        get_repository('contributors').clear()
+
+        with override_settings(GITHUB_FETCH_MODE='rest'):
+            expected = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics'], expected['metrics'])
+        self.assertEqual(len(self.fake.requests_to('/graphql')), 2)
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/commits')), 1)
+
+    def test_user_repositories(self):
+        self.fake.add_list('/user/repos', [
+            {'id': 1, 'name': 'r', 'full_name': 'o/r', 'owner': {'login': 'o'}, 'stargazers_count': 5},
+        ])
+
+        repositories = DashboardService('token').sync_user_repositories()
+
+        self.assertEqual(repositories, [GitHubAPIAdapter().adapt_repository(self.fake.lists['/user/repos'][0])])
+        self.assertEqual(self.fake.requests_to('/user/repos'), [])
+
+
+class ListEndpointTests(FakeGitHubTestCase):
+    def get(self, view, path: str, **kwargs):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=User(id=1, username='alice'), token='token')
+        return view.as_view()(request, **kwargs)
+
+    def test_user_repositories(self):
+        self.fake.add_list('/user/repos', [{
+            'id': 1, 'name': 'r', 'full_name': 'o/r', 'owner': {'login': 'o'}, 'description': None,
+            'html_url': 'https://github.com/o/r', 'language': 'Python', 'stargazers_count': 5,
+        }])
+
+        response = self.get(UserRepositoriesView, '/api/repositories/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{
+            'name': 'r', 'full_name': 'o/r', 'owner': 'o', 'description': None,
+            'url': 'https://github.com/o/r', 'stars': 5, 'forks': 0, 'language': 'Python',
+        }])
+
+    def test_repository_contributors(self):
+        for contributor in self.fake.lists['/repos/o/r/contributors']:
+            contributor['avatar_url'] = f"https://avatars.example.com/{contributor['login']}"
+            contributor['html_url'] = f"https://github.com/{contributor['login']}"
+
+        response = self.get(RepositoryContributorsView, '/api/repositories/o/r/contributors/', owner='o', repo='r')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0], {
+            'username': 'alice', 'avatar_url': 'https://avatars.example.com/alice',
+            'profile_url': 'https://github.com/alice', 'contributions': 3,
+        })
+
+
+class StreamingGenerateAllTests(FakeGitHubTestCase):
+    def stream(self, query: str = ''):
+        request = APIRequestFactory().get(f'/api/dashboard/o/r/generate-all/stream/{query}')
+        force_authenticate(request, user=User(id=1, username='alice'), token='token')
+        response = AllContributorsDashboardStreamView.as_view()(request, owner='o', repo='r')
+        body = b''.join(response.streaming_content).decode()
+        return response, body
+
+    def test_dashboards_are_yielded_as_they_are_built(self):
+        service = DashboardService('token')
+        stream = service.iter_contributors_dashboards('o', 'r')
+
+        first = next(stream)
+
+        self.assertEqual(first['username'], 'alice')
+        self.assertIsNone(service.contributor_repo.get_by_username_and_repo('bob', 'o/r'))
+
+    def test_ndjson_stream(self):
+        del self.fake.objects['/users/bob/events']
+
+        response, body = self.stream()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        messages = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([m['type'] for m in messages], ['dashboard', 'error', 'done'])
+        self.assertEqual(messages[0]['data']['metrics']['commits']['total'], 3)
+        self.assertEqual(messages[1]['username'], 'bob')
+        self.assertEqual(messages[2], {'type': 'done', 'count': 1, 'failed': 1})
+
+    def test_server_sent_events_stream(self):
+        response, body = self.stream('?output=sse')
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = [event.split('\n')[0] for event in body.strip().split('\n\n')]
+        self.assertEqual(events, ['event: dashboard', 'event: dashboard', 'event: done'])
+
+
+class AsyncDashboardServiceTests(FakeGitHubTestCase):
+    def run_async(self, coroutine_fn):
+        async def run():
+            try:
+                return await coroutine_fn()
+            finally:
+                await close_async_sessions()
+
+        return asyncio.run(run())
+
+    def test_matches_sync_dashboard(self):
+        dashboard = self.run_async(
+            lambda: AsyncDashboardService('token').generate_contributor_dashboard('o', 'r', 'alice'))
+        get_repository('contributors').clear()
+
+        expected = DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics'], expected['metrics'])
+        self.assertEqual(dashboard['charts'], expected['charts'])
+        self.assertEqual(dashboard['recent_activity'], expected['recent_activity'])
+
+    def test_concurrent_requests_share_one_build(self):
+        self.fake.latency = 0.1
+
+        async def requests():
+            service = AsyncDashboardService('token')
+            return await asyncio.gather(*(
+                service.get_contributor_dashboard('o', 'r', 'alice') for _ in range(50)
+            ))
+
+        dashboards = self.run_async(requests)
+
+        self.assertEqual(len({d['generated_at'] for d in dashboards}), 1)
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/commits')), 1)
+
+    def test_sync_repository_data(self):
+        self.run_async(lambda: AsyncDashboardService('token').sync_repository_data('o', 'r'))
+
+        stored = get_repository('contributors').get_by_repository('o/r')
+        self.assertEqual(sorted(c['username'] for c in stored), ['alice', 'bob'])
+
+    def test_async_dashboard_view(self):
+        request = RequestFactory().get('/api/async/dashboard/o/r/alice/')
+
+        async def auser():
+            return User(id=1, username='alice')
+
+        request.auser = auser
+        with mock.patch('apps.dashboards.async_views.resolve_access_token', return_value='token'):
+            response = self.run_async(
+                lambda: ContributorDashboardAsyncView.as_view()(request, owner='o', repo='r', username='alice'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['metrics']['commits']['total'], 3)
+
+    def test_async_contributors_view(self):
+        request = RequestFactory().get('/api/async/repositories/o/r/contributors/')
+
+        async def auser():
+            return User(id=1, username='alice')
+
+        request.auser = auser
+        with mock.patch('apps.dashboards.async_views.resolve_access_token', return_value='token'):
+            response = self.run_async(
+                lambda: RepositoryContributorsAsyncView.as_view()(request, owner='o', repo='r'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['username'] for c in json.loads(response.content)], ['alice', 'bob'])
+
+
+class BackgroundJobTests(FakeGitHubTestCase):
+    def wait_for_jobs(self):
+        for future in pending_jobs():
+            future.result(timeout=5)
+
+    def test_generate_all_job_reports_progress_and_failures(self):
+        del self.fake.objects['/users/bob/events']
+
+        job = enqueue('generate-all-dashboards', lambda job: {
+            'count': len(DashboardService('token').generate_all_contributors_dashboards('o', 'r', progress=job))
+        })
+        self.wait_for_jobs()
+
+        record = get_job(job.id)
+        self.assertEqual(record['status'], JobStatus.SUCCEEDED)
+        self.assertEqual(record['result'], {'count': 1})
+        self.assertEqual(record['progress'], {'total': 2, 'completed': 1, 'failed': 1})
+        self.assertEqual([f['item'] for f in record['failures']], ['bob'])
+        self.assertTrue({'queued', 'fetch', 'build', 'running'} <= set(record['timings']))
+
+    def test_failed_job_records_the_error(self):
+        def fail(job):
+            raise ValueError('boom')
+
+        job = enqueue('failing', fail)
+        self.wait_for_jobs()
+
+        record = get_job(job.id)
+        self.assertEqual((record['status'], record['error']), (JobStatus.FAILED, 'boom'))
+        self.assertIsNotNone(record['finished_at'])
+
+
+class MetricsAccumulatorTests(SimpleTestCase):
+    def test_consumes_streams_in_a_single_pass(self):
+        adapter = GitHubAPIAdapter()
+        commits = (adapter.adapt_commit({**make_commit(str(i), date=f'2024-01-0{i % 3 + 1}T23:30:00+02:00'),
+                                         'stats': {'additions': 2, 'deletions': 1}}) for i in range(6))
+        issues = (adapter.adapt_issue(make_issue(i, state=state)) for i, state in enumerate(['open', 'closed', 'closed']))
+        prs = (adapter.adapt_pull_request(pr) for pr in [make_pull(1), make_pull(2, state='open', merged=False),
+                                                          make_pull(3, merged=False)])
+
+        accumulator = MetricsAccumulator().consume_commits(commits).consume_issues(issues).consume_pull_requests(prs)
+
+        metrics = accumulator.metrics()
+        self.assertEqual(metrics['commits'], {'total': 6, 'additions': 12, 'deletions': 6, 'net_change': 6,
+                                              'pending_line_stats': 0})
+        self.assertEqual(metrics['issues']['close_rate'], 2 / 3 * 100)
+        self.assertEqual(metrics['pull_requests']['merged'], 1)
+        charts = accumulator.charts()
+        self.assertEqual(charts['commits_timeline'], [
+            {'date': '2024-01-01', 'count': 2},
+            {'date': '2024-01-02', 'count': 2},
+            {'date': '2024-01-03', 'count': 2},
+        ])
+        self.assertEqual([s['value'] for s in charts['prs_status']], [1, 1, 1])
+
+    def test_resumed_state_replaces_updated_items(self):
+        adapter = GitHubAPIAdapter()
+        first = MetricsAccumulator()
+        first.consume_commits([adapter.adapt_commit(make_commit('a1', date='2024-01-01T10:00:00Z'))])
+        first.consume_pull_requests([adapter.adapt_pull_request(make_pull(1, state='open', merged=False))])
+
+        resumed = MetricsAccumulator.from_state(first.state())
+        resumed.consume_commits([adapter.adapt_commit(make_commit('a1', date='2024-01-01T10:00:00Z')),
+                                 adapter.adapt_commit(make_commit('a2', date='2024-01-02T10:00:00Z'))])
+        resumed.consume_pull_requests([adapter.adapt_pull_request(make_pull(1))])
+
+        metrics = resumed.metrics()
+        self.assertEqual(metrics['commits']['total'], 2)
+        self.assertEqual((metrics['pull_requests']['total'], metrics['pull_requests']['merged'],
+                          metrics['pull_requests']['open']), (1, 1, 0))
+        self.assertEqual(resumed.cursor().commits, '2024-01-02T10:00:00Z')
+
+    def test_saved_state_keeps_only_open_items(self):
+        adapter = GitHubAPIAdapter()
+        created = '2024-01-01T00:00:00Z'
+        first = MetricsAccumulator()
+        first.consume_issues([adapter.adapt_issue(make_issue(1, state='closed', created_at=created)),
+                              adapter.adapt_issue(make_issue(2, created_at=created))])
+        first.consume_pull_requests([adapter.adapt_pull_request(make_pull(1, created_at=created)),
+                                     adapter.adapt_pull_request(make_pull(2, merged=False, created_at=created))])
+        state = first.state()
+        self.assertEqual((state['open_issues'], state['open_pull_requests']), (['2'], []))
+
+        resumed = MetricsAccumulator.from_state(state)
+        updated = '2024-01-05T00:00:00Z'
+        resumed.consume_issues([
+            # Reopened, and closed, since the last sync
+            adapter.adapt_issue(make_issue(1, updated_at=updated, created_at=created)),
+            adapter.adapt_issue(make_issue(2, state='closed', updated_at=updated, created_at=created)),
+            # Opened and closed since the last sync
+            adapter.adapt_issue(make_issue(3, state='closed', updated_at=updated, created_at='2024-01-04T00:00:00Z')),
+        ])
+        resumed.consume_pull_requests([
+            adapter.adapt_pull_request(make_pull(1, updated_at=updated, created_at=created)),
+            adapter.adapt_pull_request(make_pull(2, state='open', merged=False, updated_at=updated, created_at=created)),
+        ])
+
+        metrics = resumed.metrics()
+        self.assertEqual((metrics['issues']['total'], metrics['issues']['opened'], metrics['issues']['closed']),
+                         (3, 1, 2))
+        self.assertEqual((metrics['pull_requests']['total'], metrics['pull_requests']['merged'],
+                          metrics['pull_requests']['open']), (2, 1, 1))
+        self.assertEqual((resumed.state()['open_issues'], resumed.state()['open_pull_requests']), (['1'], ['2']))
+
+    def test_empty_history(self):
+        metrics = MetricsAccumulator().metrics()
+
+        self.assertEqual(metrics['issues']['close_rate'], 0)
+        self.assertEqual(metrics['pull_requests']['merge_rate'], 0)
+
+
+class DashboardCacheTests(FakeGitHubTestCase):
+    def commit_fetches(self) -> int:
+        return len(self.fake.requests_to('/repos/o/r/commits'))
+
+    def wait_for_refreshes(self):
+        for future in DashboardCache.pending_refreshes():
+            future.result(timeout=5)
+
+    def test_fresh_dashboard_is_served_without_github_calls(self):
+        service = DashboardService('token')
+        first = service.get_contributor_dashboard('o', 'r', 'alice')
+
+        second = service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(second, first)
+        self.assertEqual(self.commit_fetches(), 1)
+        stats = dashboard_cache_stats()
+        self.assertEqual((stats['miss'], stats['local']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_stored_dashboard_is_used_when_caches_are_cold(self):
+        DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+        caches['shared'].clear()
+        clear_local_dashboard_cache()
+
+        dashboard = DashboardService('token').get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics']['commits']['total'], 3)
+        self.assertEqual(self.commit_fetches(), 1)
+        self.assertEqual(dashboard_cache_stats()['stored'], 1)
+
+    @override_settings(DASHBOARD_CACHE_TTL=0)
+    def test_stale_dashboard_is_served_while_refreshing(self):
+        service = DashboardService('token')
+        first = service.get_contributor_dashboard('o', 'r', 'alice')
+        self.fake.lists['/repos/o/r/commits'].append(make_commit('a4', 'alice', '2024-01-05T10:00:00Z'))
+
+        stale = service.get_contributor_dashboard('o', 'r', 'alice')
+        self.wait_for_refreshes()
+
+        self.assertEqual(stale['generated_at'], first['generated_at'])
+        self.assertEqual(dashboard_cache_stats()['stale'], 1)
+        stored = service.contributor_repo.get_by_username_and_repo('alice', 'o/r')
+        self.assertEqual(stored['metrics']['commits']['total'], 4)
+
+    @override_settings(DASHBOARD_CACHE_STALE_TTL=0)
+    def test_invalidated_dashboard_is_regenerated(self):
+        service = DashboardService('token')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+
+        invalidate_dashboards('o/r')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(self.commit_fetches(), 2)
+
+    def test_sync_invalidates_on_new_pushes(self):
+        service = DashboardService('token')
+        service.sync_repository_data('o', 'r')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.fake.objects['/repos/o/r'] = {**self.fake.objects['/repos/o/r'], 'pushed_at': '2024-02-01T00:00:00Z'}
+        service.sync_repository_data('o', 'r')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+        self.wait_for_refreshes()
+
+        self.assertEqual(dashboard_cache_stats()['stale'], 1)
+        self.assertEqual(self.commit_fetches(), 2)
+
+    def test_concurrent_misses_share_one_build(self):
+        self.fake.latency = 0.2
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            dashboards = list(pool.map(
+                lambda _: DashboardService('token').get_contributor_dashboard('o', 'r', 'alice'), range(5)
+            ))
+
+        self.assertEqual(self.commit_fetches(), 1)
+        self.assertEqual(len({dashboard['generated_at'] for dashboard in dashboards}), 1)
+
+
+@override_settings(GITHUB_WEBHOOK_SECRET='webhook-secret')
+class GitHubWebhookTests(FakeGitHubTestCase):
+    def deliver(self, event: str, payload: dict, delivery: str = 'delivery-1', secret: str = 'webhook-secret'):
+        body = json.dumps({'repository': {'full_name': 'o/r', 'default_branch': 'main'}, **payload}).encode()
+        signature = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        request = APIRequestFactory().post(
+            '/api/webhooks/github/', body, content_type='application/json',
+            HTTP_X_GITHUB_EVENT=event, HTTP_X_GITHUB_DELIVERY=delivery, HTTP_X_HUB_SIGNATURE_256=signature,
+        )
+        return GitHubWebhookView.as_view()(request)
+
+    def push(self, *commits: dict) -> dict:
+        return {'ref': 'refs/heads/main', 'commits': list(commits)}
+
+    def pushed_commit(self, sha: str, login: str, timestamp: str) -> dict:
+        return {'id': sha, 'timestamp': timestamp, 'distinct': True, 'author': {'name': login, 'username': login}}
+
+    def stored(self, username: str = 'alice') -> dict:
+        return get_repository('contributors').get_by_username_and_repo(username, 'o/r')
+
+    def known_stats(self, sha: str, additions: int = 0, deletions: int = 0) -> None:
+        get_repository('commit_stats').bulk_insert({sha: {'additions': additions, 'deletions': deletions}})
+
+    def test_rejects_unsigned_deliveries(self):
+        response = self.deliver('push', {}, secret='wrong')
+
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(DASHBOARD_CACHE_TTL=0)
+    def test_push_updates_stored_dashboard_without_github_calls(self):
+        service = DashboardService('token')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+        self.known_stats('a4')
+
+        response = self.deliver('push', self.push(
+            self.pushed_commit('a4', 'alice', '2024-01-05T12:00:00+02:00'),
+        ))
+        dashboard = service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(response.data['updated'], ['alice'])
+        self.assertEqual(dashboard['metrics']['commits']['total'], 4)
+        self.assertEqual(dashboard['charts']['commits_timeline'][-1], {'date': '2024-01-05', 'count': 1})
+        self.assertEqual(dashboard['recent_activity'], [{'type': 'PushEvent'}])
+        self.assertEqual(len(self.fake.requests_to('/repos/o/r/commits')), 1)
+        self.assertEqual(dashboard_cache_stats()['stale'], 0)
+
+    def test_redelivery_is_applied_once(self):
+        DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+        self.known_stats('a4')
+        push = self.push(self.pushed_commit('a4', 'alice', '2024-01-05T10:00:00Z'))
+
+        self.deliver('push', push)
+        response = self.deliver('push', push)
+
+        self.assertEqual(response.data['status'], 'duplicate')
+        self.assertEqual(self.stored()['metrics']['commits']['total'], 4)
+
+    def test_synced_commits_are_not_counted_again(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        self.deliver('push', self.push(self.pushed_commit('a4', 'alice', '2024-01-05T10:00:00Z')))
+        self.fake.lists['/repos/o/r/commits'].append(make_commit('a4', 'alice', '2024-01-05T10:00:00Z'))
+
+        dashboard = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(dashboard['metrics']['commits']['total'], 4)
+
+    @override_settings(DASHBOARD_CACHE_STALE_TTL=0)
+    def test_pushes_without_known_line_changes_are_left_to_the_next_sync(self):
+        service = DashboardService('token')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+        response = self.deliver('push', self.push(self.pushed_commit('a4', 'alice', '2024-01-05T10:00:00Z')))
+        self.fake.lists['/repos/o/r/commits'].append(
+            make_commit('a4', 'alice', '2024-01-05T10:00:00Z', additions=100, deletions=50)
+        )
+
+        dashboard = service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(response.data['updated'], [])
+        commits = dashboard['metrics']['commits']
+        self.assertEqual((commits['total'], commits['additions'], commits['deletions']), (4, 116, 53))
+
+    @override_settings(DASHBOARD_CACHE_STALE_TTL=0)
+    def test_deliveries_match_logins_whatever_their_casing(self):
+        service = DashboardService('token')
+        service.get_contributor_dashboard('o', 'r', 'alice')
+
+        response = self.deliver('issues', {
+            'action': 'opened', 'issue': make_issue(13, 'Alice', 'open', created_at='2024-01-07T00:00:00Z'),
+        })
+        self.deliver('push', self.push(self.pushed_commit('a4', 'ALICE', '2024-01-05T10:00:00Z')), delivery='delivery-2')
+        self.fake.lists['/repos/o/r/commits'].append(make_commit('a4', 'alice', '2024-01-05T10:00:00Z'))
+        dashboard = service.get_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(response.data['updated'], ['alice'])
+        self.assertEqual(dashboard['metrics']['issues']['total'], 3)
+        self.assertEqual(dashboard['metrics']['commits']['total'], 4)
+
+    def test_deliveries_applied_during_a_sync_are_kept(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        resume = service._resume_accumulator
+
+        def resume_then_deliver(*args):
+            accumulator = resume(*args)
+            issue = make_issue(13, 'alice', 'open', created_at='2024-01-07T00:00:00Z')
+            self.deliver('issues', {'action': 'opened', 'issue': issue})
+            return accumulator
+
+        with mock.patch.object(service, '_resume_accumulator', side_effect=resume_then_deliver):
+            service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.assertEqual(self.stored()['metrics']['issues']['total'], 3)
+
+    def test_pushes_to_other_branches_are_ignored(self):
+        DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        response = self.deliver('push', {
+            'ref': 'refs/heads/feature',
+            'commits': [self.pushed_commit('f1', 'alice', '2024-01-05T10:00:00Z')],
+        })
+
+        self.assertEqual(response.data['updated'], [])
+        self.assertEqual(self.stored()['metrics']['commits']['total'], 3)
+
+    def test_issue_and_pull_request_events_replace_previous_states(self):
+        DashboardService('token').generate_contributor_dashboard('o', 'r', 'alice')
+
+        self.deliver('issues', {'action': 'closed', 'issue': make_issue(10, 'alice', 'closed')}, delivery='d1')
+        self.deliver('pull_request', {'action': 'closed', 'pull_request': make_pull(21, 'alice', 'closed', merged=True)},
+                     delivery='d2')
+
+        metrics = self.stored()['metrics']
+        self.assertEqual((metrics['issues']['total'], metrics['issues']['opened'], metrics['issues']['closed']),
+                         (2, 0, 2))
+        self.assertEqual((metrics['pull_requests']['total'], metrics['pull_requests']['merged']), (2, 2))
+
+    def test_contributors_without_a_dashboard_are_left_alone(self):
+        response = self.deliver('issues', {'action': 'opened', 'issue': make_issue(13, 'carol', 'open')})
+
+        self.assertEqual(response.data['updated'], [])
+        self.assertIsNone(self.stored('carol'))
+
+
+class StoredActivityTests(FakeGitHubTestCase):
+    def test_fetched_activity_is_stored(self):
+        DashboardService('token').generate_all_contributors_dashboards('o', 'r')
+
+        store = ActivityStore()
+        commits = store.get('o/r', 'commits', 'alice', start=datetime(2024, 1, 1, 11))
+        self.assertEqual([(c['sha'], c['stats']['additions']) for c in commits], [('a2', 5), ('a3', 1)])
+        self.assertEqual([i['id'] for i in store.get('o/r', 'issues', 'bob')], [12])
+        self.assertEqual([pr['id'] for pr in store.get('o/r', 'pull_requests', 'alice')], [20, 21])
+
+    def test_stored_metrics_match_a_generated_dashboard(self):
+        service = DashboardService('token')
+        dashboard = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        stored = service.get_contributor_dashboard_window('o', 'r', 'alice')
+
+        self.assertEqual(stored['metrics'], dashboard['metrics'])
+        self.assertEqual(stored['charts'], dashboard['charts'])
+
+    def test_refetched_activity_replaces_stored_activity(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        self.fake.lists['/repos/o/r/issues'][0] = make_issue(
+            10, 'alice', 'closed', updated_at='2024-01-06T00:00:00Z', created_at='2024-01-01T00:00:00Z'
+        )
+
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        issues = service.get_contributor_dashboard_window('o', 'r', 'alice')['metrics']['issues']
+        self.assertEqual((issues['total'], issues['closed']), (2, 2))
+
+
+class DashboardWindowTests(FakeGitHubTestCase):
+    def dashboard(self, query: str):
+        request = APIRequestFactory().get(f'/api/dashboard/o/r/alice/{query}')
+        force_authenticate(request, user=User(id=1, username='alice'), token='token')
+        return ContributorDashboardView.as_view()(request, owner='o', repo='r', username='alice')
+
+    def test_windows_count_only_their_days(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        window = service.get_contributor_dashboard_window('o', 'r', 'alice', start='2024-01-02')
+        everything = service.get_contributor_dashboard_window('o', 'r', 'alice')
+
+        self.assertEqual(window['metrics']['commits'], {'total': 1, 'additions': 1, 'deletions': 1, 'net_change': 0,
+                                                        'pending_line_stats': 0})
+        self.assertEqual(window['charts']['commits_timeline'], [{'date': '2024-01-02', 'count': 1}])
+        # Undated issues only count when the window is unbounded
+        self.assertEqual(window['metrics']['issues']['total'], 0)
+        self.assertEqual(everything['metrics']['issues']['total'], 2)
+        self.assertEqual(window['window'], {'from': '2024-01-02', 'to': None, 'granularity': 'day'})
+
+    def test_commits_are_bucketed_by_granularity(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        weekly = service.get_contributor_dashboard_window('o', 'r', 'alice', granularity='week')
+        monthly = service.get_contributor_dashboard_window('o', 'r', 'alice', end='2024-01-01', granularity='month')
+
+        self.assertEqual(weekly['charts']['commits_timeline'], [{'date': '2023-12-31', 'count': 3}])
+        self.assertEqual(monthly['charts']['commits_timeline'], [{'date': '2024-01-01', 'count': 2}])
+
+    def test_switching_windows_reads_nothing(self):
+        service = DashboardService('token')
+        service.get_contributor_dashboard_window('o', 'r', 'alice')
+        requests = len(self.fake.requests)
+
+        with mock.patch.object(service.activity_repo, 'aggregate_daily_activity') as stored:
+            for start, end in (('2024-01-01', '2024-01-01'), ('2024-01-02', None), (None, '2023-12-31')):
+                service.get_contributor_dashboard_window('o', 'r', 'alice', start, end, 'week')
+
+        stored.assert_not_called()
+        self.assertEqual(len(self.fake.requests), requests)
+
+    def test_activity_missing_from_storage_is_backfilled(self):
+        service = DashboardService('token')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        get_repository('activity').clear()
+
+        window = service.get_contributor_dashboard_window('o', 'r', 'alice', start='2024-01-01')
+
+        self.assertEqual(window['metrics']['commits']['total'], 3)
+        self.assertEqual(len(ActivityStore().get('o/r', 'commits', 'alice')), 3)
+
+    def test_activity_is_backfilled_once(self):
+        # Issues without an id are stored over each other, so storage never matches the dashboard
+        for issue in self.fake.lists['/repos/o/r/issues']:
+            issue.pop('id')
+        service = DashboardService('token')
+        service.get_contributor_dashboard_window('o', 'r', 'alice')
+        service.get_contributor_dashboard_window('o', 'r', 'alice', start='2024-01-01')
+        requests = len(self.fake.requests)
+
+        service.get_contributor_dashboard_window('o', 'r', 'alice', start='2024-01-02')
+
+        self.assertEqual(len(self.fake.requests), requests)
+
+    def test_logins_match_whatever_their_case(self):
+        service = DashboardService('token')
+        dashboard = service.generate_contributor_dashboard('o', 'r', 'alice')
+
+        window = service.activity_windows.get('o/r', 'Alice', dashboard['generated_at'])
+
+        self.assertEqual(window.totals()['commits_total'], 3)
+        self.assertEqual(len(ActivityStore().get('o/r', 'commits', 'ALICE')), 3)
+
+    def test_view_serves_windows_and_rejects_bad_parameters(self):
+        response = self.dashboard('?from=2024-01-02&granularity=week')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['metrics']['commits']['total'], 1)
+        self.assertEqual(response.data['window']['granularity'], 'week')
+        self.assertEqual(self.dashboard('?granularity=year').status_code, 400)
+        self.assertEqual(self.dashboard('?to=yesterday').status_code, 400)
+        self.assertNotIn('window', self.dashboard('').data)
+
+
+class MetricSnapshotTests(FakeGitHubTestCase):
+    def snapshot(self, day: str, commits: int):
+        MetricSnapshots().record_contributor({
+            'repository': 'o/r',
+            'username': 'alice',
+            'generated_at': f'{day}T12:00:00',
+            'metrics': {'commits': {'total': commits}, 'issues': {'total': 0}},
+        })
+
+    def history(self, query: str, username: str = 'alice'):
+        request = APIRequestFactory().get(f'/api/dashboard/o/r/{username}/history/{query}')
+        force_authenticate(request, user=User(id=1, username='alice'))
+        return MetricHistoryView.as_view()(request, owner='o', repo='r', username=username)
+
+    def test_dashboards_and_repository_syncs_are_snapshotted(self):
+        service = DashboardService('token')
+        service.sync_repository_data('o', 'r')
+        service.generate_contributor_dashboard('o', 'r', 'alice')
+        today = datetime.utcnow().date().isoformat()
+
+        contributor = MetricSnapshots().series('o/r', 'alice', 'commits_total', 'day', today)
+        repository = MetricSnapshots().series('o/r', None, 'stars', 'month', today)
+
+        self.assertEqual(contributor['series'], [{'date': today, 'value': 3}])
+        self.assertEqual(repository['series'], [{'date': today[:8] + '01', 'value': 0}])
+
+    @override_settings(METRIC_SNAPSHOT_DAY_RETENTION=0, METRIC_SNAPSHOT_WEEK_RETENTION=0)
+    def test_rollups_keep_the_latest_snapshot_of_each_period(self):
+        for day, commits in (('2024-01-02', 1), ('2024-01-05', 4), ('2024-01-08', 6), ('2024-02-01', 9)):
+            self.snapshot(day, commits)
+
+        weeks = MetricSnapshots().series('o/r', 'alice', 'commits_total', 'week', '2024-01-03', '2024-01-20')
+        months = MetricSnapshots().series('o/r', 'alice', 'commits_total', 'month')
+
+        self.assertEqual(weeks['series'], [{'date': '2023-12-31', 'value': 4}, {'date': '2024-01-07', 'value': 6}])
+        self.assertEqual(months['series'], [{'date': '2024-01-01', 'value': 6}, {'date': '2024-02-01', 'value': 9}])
+
+    @override_settings(METRIC_SNAPSHOT_DAY_RETENTION=30, METRIC_SNAPSHOT_WEEK_RETENTION=60)
+    def test_finer_periods_are_downsampled_after_their_retention(self):
+        old = (datetime.utcnow().date() - timedelta(days=45)).isoformat()
+        self.snapshot(old, 2)
+
+        snapshots = MetricSnapshots()
+        self.assertEqual(snapshots.series('o/r', 'alice', 'commits_total', 'day', old)['series'], [])
+        self.assertEqual(snapshots.series('o/r', 'alice', 'commits_total', start=old)['granularity'], 'week')
+        self.assertEqual(get_repository('metric_snapshots').delete_expired(), 1)
+
+    def test_history_endpoint(self):
+        self.snapshot('2024-01-02', 1)
+
+        response = self.history('?metric=commits_total&granularity=month&from=2024-01-01&to=2024-12-31')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['series'], [{'date': '2024-01-01', 'value': 1}])
+        self.assertEqual((response.data['from'], response.data['to']), ('2024-01-01', '2024-12-31'))
+        self.assertEqual(self.history('?metric=stars').status_code, 400)
+        self.assertEqual(self.history('?from=January').status_code, 400)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+
+    def test_waiters_share_the_leaders_exception(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flights.do, 'k', fail)
+            started.wait(timeout=5)
+            follower = pool.submit(flights.do, 'k', lambda: 'not called')
+            for future in (leader, follower):
+                with self.assertRaises(ValueError):
+                    future.result(timeout=5)
+
+    def test_result_published_by_another_worker_is_reused(self):
+        flights = SingleFlight(store_alias='shared', poll_interval=0.01)
+        caches['shared'].add('singleflight:k', 'other-worker')
+        threading.Timer(0.1, caches['shared'].delete, args=['singleflight:k']).start()
+        calls = []
+
+        result = flights.do('k', lambda: calls.append(1) or 'built', recheck=lambda: 'published')
+
+        self.assertEqual(result, 'published')
+        self.assertEqual(calls, [])
+        self.assertIsNone(caches['shared'].get('singleflight:k'))